@@ -1,25 +1,187 @@
+from collections import deque
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from typing import Dict, List, Optional
+import threading
+import time
+
+from core.metrics import observe_stage
 from .claude_agent import ClaudeAgent
 from .grok_agent import GrokAgent
 from .openai_agent import OpenAIAgent
 
+
+def _placeholder(status: str, rationale: str) -> dict:
+    return {"answer": None, "confidence": 0.0, "rationale": rationale, "metadata": {"status": status}}
+
+
 class AgentManager:
     """
     Wraps multiple AI agents and aggregates their outputs.
+
+    evaluate_all queries every agent concurrently. It returns early once
+    `quorum_size` agents answered with confidence >= quorum_confidence;
+    agents still running are cancelled and reported as such. A slow agent
+    can be hedged: after `hedge_after` seconds, or once it runs past the
+    `hedge_percentile` of its own recent latencies, a duplicate request is
+    sent and whichever copy answers first is used.
+
+    Each call runs on its own daemon thread. A call that never returns
+    only ties up its own agent: at most `max_in_flight` calls per agent
+    may be unfinished, and further requests to that agent are reported
+    as overloaded instead of queueing behind the stuck ones.
+
+    Agent calls are not admitted through the model-call scheduler
+    themselves: the model requests an agent makes (Branch, OpenAIOracle)
+    each take their own slot, so an agent holding a slot while it waits
+    for a nested request cannot deadlock the scheduler.
     """
 
-    def __init__(self, claude=None, grok=None, openai=None):
+    def __init__(self, claude=None, grok=None, openai=None, quorum_confidence: Optional[float] = None,
+                 quorum_size: int = 1, hedge_after: Optional[float] = None,
+                 hedge_percentile: Optional[float] = None, max_in_flight: int = 4):
         self.agents = [
             claude or ClaudeAgent(),
             grok or GrokAgent(),
             openai or OpenAIAgent()
         ]
+        self.quorum_confidence = quorum_confidence  # None = always wait for every agent
+        self.quorum_size = quorum_size
+        self.hedge_after = hedge_after
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = 10
+        self.max_in_flight = max_in_flight  # per agent: a primary, a hedge and a few stragglers
+        self._lock = threading.Lock()
+        self._in_flight = [0] * len(self.agents)
+        self._latencies: List[deque] = [deque(maxlen=200) for _ in self.agents]
+        self.stats = {"hedges_sent": 0, "hedges_won": 0, "cancelled": 0, "early_exits": 0, "overloaded": 0}
+
+    def evaluate_all(self, prompt: str, timeout: Optional[float] = None) -> list:
+        """
+        Evaluate prompt on all agents in parallel; results are in agent order.
+        """
+        start = time.monotonic()
+        deadline = start + timeout if timeout is not None else None
+        owner: Dict = {}  # future -> (agent index, is_hedge)
+        results: Dict[int, dict] = {}
+        hedge_at = {i: self._hedge_delay(i) for i in range(len(self.agents))}
+        hedged = set()
+
+        for i in range(len(self.agents)):
+            future = self._submit(i, prompt)
+            if future is None:
+                results[i] = _placeholder("overloaded", "Agent has too many unfinished calls")
+                self._count("overloaded")
+            else:
+                owner[future] = (i, False)
+
+        pending = set(owner)
+        while pending and not self._quorum_reached(results):
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                break
+            for i, delay in hedge_at.items():
+                if delay is not None and i not in results and i not in hedged and now - start >= delay:
+                    hedged.add(i)
+                    future = self._submit(i, prompt)
+                    if future is None:
+                        self._count("overloaded")
+                        continue
+                    owner[future] = (i, True)
+                    pending.add(future)
+                    self._count("hedges_sent")
+
+            wake_times = [start + d for i, d in hedge_at.items()
+                          if d is not None and i not in results and i not in hedged]
+            if deadline is not None:
+                wake_times.append(deadline)
+            wait_for = max(0.0, min(wake_times) - now) if wake_times else None
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                i, is_hedge = owner[future]
+                if i in results:
+                    continue
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    if not any(owner[f][0] == i for f in pending):  # a hedge may still succeed
+                        results[i] = _placeholder("error", f"Agent failed: {e}")
+                    continue
+                self._latencies[i].append(time.monotonic() - start)
+                if is_hedge:
+                    self._count("hedges_won")
+
+            # the losing copy of a hedged request is no longer waited for
+            for future in [f for f in pending if owner[f][0] in results]:
+                future.cancel()
+                pending.discard(future)
+
+        if pending and self._quorum_reached(results):
+            self._count("early_exits")
+        for future in pending:
+            future.cancel()  # running calls cannot be interrupted; their results are dropped
+
+        out = []
+        for i in range(len(self.agents)):
+            if i in results:
+                out.append(results[i])
+            elif self._quorum_reached(results):
+                self._count("cancelled")
+                out.append(_placeholder("cancelled", "Cancelled after quorum was reached"))
+            else:
+                out.append(_placeholder("timeout", "Agent did not answer before the deadline"))
+        return out
+
+    def _submit(self, i: int, prompt: str) -> Optional[Future]:
+        """
+        Start agent i on its own thread, or return None if it already has
+        max_in_flight unfinished calls
+        """
+        with self._lock:
+            if self._in_flight[i] >= self.max_in_flight:
+                return None
+            self._in_flight[i] += 1
+        future = Future()
+
+        def run():
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(self._call_agent(self.agents[i], prompt))
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._in_flight[i] -= 1
+
+        threading.Thread(target=run, name=f"agent-{i}", daemon=True).start()
+        return future
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _call_agent(self, agent, prompt: str) -> dict:
+        start = time.perf_counter()
+        try:
+            return agent.evaluate(prompt)
+        finally:
+            observe_stage("agent_evaluate", time.perf_counter() - start, agent=type(agent).__name__)
+
+    def _quorum_reached(self, results: Dict[int, dict]) -> bool:
+        if self.quorum_confidence is None:
+            return False
+        confident = sum(1 for r in results.values()
+                        if r.get("answer") is not None and r.get("confidence", 0.0) >= self.quorum_confidence)
+        return confident >= self.quorum_size
 
-    def evaluate_all(self, prompt: str) -> list:
-        results = []
-        for agent in self.agents:
-            res = agent.evaluate(prompt)
-            results.append(res)
-        return results
+    def _hedge_delay(self, i: int) -> Optional[float]:
+        """Seconds after which agent i gets a duplicate request, or None."""
+        history = self._latencies[i]
+        if self.hedge_percentile is not None and len(history) >= self.hedge_min_samples:
+            ordered = sorted(history)
+            return ordered[min(len(ordered) - 1, int(self.hedge_percentile * len(ordered)))]
+        return self.hedge_after
 
     def aggregate(self, results: list) -> dict:
         """
@@ -1,11 +1,15 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from core.evidence import Evidence
 from core.truth_engine import TruthEngine
-import openai
-import os
+from core.metrics import timed
+from core.rate_limiter import PRIORITY_INTERACTIVE, ModelCallScheduler, get_scheduler
+from core.response_cache import ResponseCache
+from core.single_flight import SingleFlight, get_single_flight
+import time
 
-# Make sure your API key is set as an environment variable
+# The API key is read by openai itself from OPENAI_API_KEY
 # e.g., export OPENAI_API_KEY="your_key_here"
-openai.api_key = os.getenv("OPENAI_API_KEY")
 
 
 class Branch:
@@ -13,22 +17,57 @@ class Branch:
     A single "branch" of reasoning using the same OpenAI model.
     Each branch has a prompt modifier and a weight.
     """
-    def __init__(self, name: str, weight: float, prompt_modifier: str):
+    def __init__(self, name: str, weight: float, prompt_modifier: str,
+                 model: str = "gpt-4", timeout: Optional[float] = None,
+                 queue_timeout: Optional[float] = None,
+                 completion_fn: Optional[Callable[..., Any]] = None,
+                 cache: Optional[ResponseCache] = None, priority: int = PRIORITY_INTERACTIVE,
+                 scheduler: Optional[ModelCallScheduler] = None,
+                 single_flight: Optional[SingleFlight] = None):
         self.name = name
         self.weight = weight
         self.prompt_modifier = prompt_modifier
+        self.model = model  # adjust to your preferred model
+        self.timeout = timeout  # per-branch deadline in seconds (None = wait forever), also the request_timeout
+        self.queue_timeout = queue_timeout  # max wait for a scheduler slot (None = wait forever)
+        # Defaults to openai.ChatCompletion.create; override to point at a stub/local model
+        self.completion_fn = completion_fn
+        self.cache = cache  # optional ResponseCache for repeated prompts
+        self.priority = priority  # scheduling class; PRIORITY_BACKGROUND for re-verification
+        self.scheduler = scheduler  # None = the process-wide scheduler
+        self.single_flight = single_flight  # None = the process-wide group
 
+    @timed("branch_query")
     def query(self, main_prompt: str, max_tokens=512) -> str:
         """
         Queries OpenAI API with branch-specific instructions
         """
         prompt = f"{self.prompt_modifier}\n{main_prompt}"
-        response = openai.ChatCompletion.create(
-            model="gpt-4",  # adjust to your preferred model
-            messages=[{"role": "system", "content": prompt}],
-            max_tokens=max_tokens,
-            temperature=0.0
-        )
+        params = {
+            "model": self.model,
+            "messages": [{"role": "system", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": 0.0
+        }
+        if self.timeout is not None:
+            params["request_timeout"] = self.timeout
+        if self.cache is not None:
+            return self.cache.get_or_compute(params, lambda: self._fetch(params))
+        return self._fetch(params)
+
+    def _fetch(self, params: Dict[str, Any]) -> str:
+        """Identical requests already in flight share one upstream call."""
+        flight = self.single_flight or get_single_flight()
+        return flight.do_request(params, lambda: self._complete(params), timeout=self.timeout)
+
+    @timed("model_call")
+    def _complete(self, params: Dict[str, Any]) -> str:
+        create = self.completion_fn
+        if create is None:
+            import openai  # imported on first real call so importing this module stays cheap
+            create = openai.ChatCompletion.create
+        scheduler = self.scheduler or get_scheduler()
+        response = scheduler.complete(create, params, priority=self.priority, timeout=self.queue_timeout)
         return response['choices'][0]['message']['content'].strip()
 
 
@@ -36,10 +75,16 @@ class Aggregator:
     """
     Multi-branch aggregator using a single OpenAI agent.
     Weighted aggregation of branch outputs feeds TruthEngine.
+
+    With concurrent=True all branches are queried at once and each one is
+    given up to its own `timeout`; branches that miss their deadline or fail
+    are still listed in branch_outputs but left out of the aggregate.
     """
-    def __init__(self, truth_engine: TruthEngine):
+    def __init__(self, truth_engine: TruthEngine, concurrent: bool = False, max_workers: Optional[int] = None):
         self.truth_engine = truth_engine
         self.branches: List[Branch] = []
+        self.concurrent = concurrent
+        self.max_workers = max_workers  # None = one worker per branch
 
     def add_branch(self, branch: Branch):
         self.branches.append(branch)
@@ -48,26 +93,86 @@ class Aggregator:
         """
         Query all branches, aggregate, and feed TruthEngine
         """
+        if self.concurrent:
+            outputs = self._query_concurrent(main_prompt)
+        else:
+            outputs = self._query_sequential(main_prompt)
+
+        # Simple weighted aggregation example: concatenate with weights
+        finished = [o for o in outputs if o["status"] == "ok"]
+        aggregated_response = "\n".join([f"[{o['name']}] {o['response']}" for o in finished])
+
+        # Feed to TruthEngine for evaluation (e.g., capacity/quality metrics)
+        self.truth_engine.add_evidence(evidence_id=main_prompt[:30], evidence=Evidence(
+            id=main_prompt[:30],
+            description=main_prompt,
+            content=aggregated_response,
+            source="aggregator",
+            branch_outputs=outputs
+        ))
+
+        return {
+            "aggregated_response": aggregated_response,
+            "branch_outputs": outputs
+        }
+
+    def _query_sequential(self, main_prompt: str) -> List[Dict[str, Any]]:
         outputs = []
         for branch in self.branches:
             result = branch.query(main_prompt)
             outputs.append({
                 "name": branch.name,
                 "weight": branch.weight,
-                "response": result
+                "response": result,
+                "status": "ok"
             })
+        return outputs
 
-        # Simple weighted aggregation example: concatenate with weights
-        aggregated_response = "\n".join([f"[{o['name']}] {o['response']}" for o in outputs])
-
-        # Feed to TruthEngine for evaluation (e.g., capacity/quality metrics)
-        self.truth_engine.add_evidence(evidence_id=main_prompt[:30], evidence={
-            "prompt": main_prompt,
-            "aggregated_response": aggregated_response,
-            "branch_outputs": outputs
-        })
+    def _query_concurrent(self, main_prompt: str) -> List[Dict[str, Any]]:
+        """
+        Fan out to every branch and wait until each has answered or passed
+        its deadline. Wall-clock cost is that of the slowest branch.
+        """
+        branches = list(self.branches)
+        if not branches:
+            return []
 
-        return {
-            "aggregated_response": aggregated_response,
-            "branch_outputs": outputs
+        start = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers or len(branches),
+                                      thread_name_prefix="branch")
+        futures = [executor.submit(branch.query, main_prompt) for branch in branches]
+        deadlines = {
+            f: (start + b.timeout if b.timeout is not None else None)
+            for f, b in zip(futures, branches)
         }
+        pending = set(futures)
+        timed_out = set()
+        try:
+            while pending:
+                now = time.monotonic()
+                expired = {f for f in pending if deadlines[f] is not None and deadlines[f] <= now}
+                timed_out |= expired
+                pending -= expired
+                if not pending:
+                    break
+                bounded = [deadlines[f] for f in pending if deadlines[f] is not None]
+                wait_for = max(0.0, min(bounded) - now) if bounded else None
+                done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+                pending -= done
+        finally:
+            # Stragglers are abandoned, not joined; their request_timeout bounds them
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        outputs = []
+        for future, branch in zip(futures, branches):
+            output = {"name": branch.name, "weight": branch.weight, "response": None}
+            if future in timed_out:
+                output["status"] = "timeout"
+            elif future.exception() is not None:
+                output["status"] = "error"
+                output["error"] = str(future.exception())
+            else:
+                output["response"] = future.result()
+                output["status"] = "ok"
+            outputs.append(output)
+        return outputs
@@ -1,5 +1,6 @@
 import uuid
-from typing import Dict
+
+from core.evidence import Evidence
 
 class ClaudeAgent:
     """
@@ -9,15 +10,16 @@ class ClaudeAgent:
         # Initialize your connection to Claude here (API, local endpoint, etc.)
         pass
 
-    def generate_evidence(self, prompt: str) -> Dict:
+    def generate_evidence(self, prompt: str) -> Evidence:
         """
         Generates evidence in the correct format for TruthEngine
         """
         # Placeholder: replace with actual Claude API call
         claude_response = f"[Claude simulated response to prompt: {prompt}]"
 
-        return {
-            "id": f"claude-{uuid.uuid4()}",
-            "content": claude_response,
-            "affected_agents": 500_000  # example number, tune per scenario
-        }
+        return Evidence(
+            id=f"claude-{uuid.uuid4()}",
+            content=claude_response,
+            source="claude",
+            affected_agents=500_000  # example number, tune per scenario
+        )
@@ -1,5 +1,6 @@
 import uuid
-from typing import Dict
+
+from core.evidence import Evidence
 
 class GrokAgent:
     """
@@ -9,15 +10,16 @@ class GrokAgent:
         # Initialize your connection to Grok here (API, local endpoint, etc.)
         pass
 
-    def generate_evidence(self, prompt: str) -> Dict:
+    def generate_evidence(self, prompt: str) -> Evidence:
         """
         Generates evidence in the correct format for TruthEngine
         """
         # Placeholder: replace with actual Grok API call
         grok_response = f"[Grok simulated response to prompt: {prompt}]"
 
-        return {
-            "id": f"grok-{uuid.uuid4()}",
-            "content": grok_response,
-            "affected_agents": 400_000  # example number
-        }
+        return Evidence(
+            id=f"grok-{uuid.uuid4()}",
+            content=grok_response,
+            source="grok",
+            affected_agents=400_000  # example number
+        )
@@ -1,5 +1,6 @@
 import uuid
-from typing import Dict
+
+from core.evidence import Evidence
 
 class OpenAIAgent:
     """
@@ -9,15 +10,16 @@ class OpenAIAgent:
         # Initialize OpenAI API key / client
         pass
 
-    def generate_evidence(self, prompt: str) -> Dict:
+    def generate_evidence(self, prompt: str) -> Evidence:
         """
         Generates evidence in the correct format for TruthEngine
         """
         # Placeholder: replace with actual OpenAI API call
         openai_response = f"[OpenAI simulated response to prompt: {prompt}]"
 
-        return {
-            "id": f"openai-{uuid.uuid4()}",
-            "content": openai_response,
-            "affected_agents": 600_000  # example number
-        }
+        return Evidence(
+            id=f"openai-{uuid.uuid4()}",
+            content=openai_response,
+            source="openai",
+            affected_agents=600_000  # example number
+        )
@@ -0,0 +1,51 @@
+# benchmarks/aggregator_fanout.py
+"""
+Sequential vs concurrent Aggregator.evaluate against a latency-injecting stub.
+
+    python -m benchmarks.aggregator_fanout --branches 5 --latency 0.2
+"""
+import argparse
+import json
+import time
+
+from agents.aggregator import Aggregator, Branch
+from core.truth_engine import TruthEngine
+from benchmarks.stub_model import StubChatCompletion
+
+
+def run(branches: int, latency: float, jitter: float, rounds: int, timeout=None) -> dict:
+    stub = StubChatCompletion(latency=latency, jitter=jitter)
+    results = {}
+    for mode in ("sequential", "concurrent"):
+        aggregator = Aggregator(TruthEngine(), concurrent=(mode == "concurrent"))
+        for i in range(branches):
+            aggregator.add_branch(Branch(f"branch_{i}", 1.0, f"Branch {i} instructions",
+                                         timeout=timeout, completion_fn=stub))
+        timings = []
+        for r in range(rounds):
+            start = time.perf_counter()
+            aggregator.evaluate(f"Evaluate claim #{r}")
+            timings.append(time.perf_counter() - start)
+        results[mode] = {
+            "mean_s": sum(timings) / len(timings),
+            "max_s": max(timings),
+            "min_s": min(timings)
+        }
+    results["speedup"] = results["sequential"]["mean_s"] / results["concurrent"]["mean_s"]
+    results["params"] = {"branches": branches, "latency": latency, "jitter": jitter, "rounds": rounds}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--branches", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=None)
+    args = parser.parse_args()
+    print(json.dumps(run(args.branches, args.latency, args.jitter, args.rounds, args.timeout), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/audit_query.py
+"""
+Incident lookups over the audit trail: indexed query() vs scanning segments.
+
+    python -m benchmarks.audit_query
+    python -m benchmarks.audit_query --days 365 --per-day 10000
+
+Writes `days` x `per_day` entries spread over many evidence ids, then
+times one evidence id's full history, a one-hour window and one day's
+errors, each through the index and by streaming every segment.
+"""
+import argparse
+import json
+import random
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+
+from core.audit_index import date_start
+from core.audit_log import SegmentedAuditLog, audit_dates, iter_audit_entries
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, len(result)
+
+
+def _scan(audit_dir, match):
+    return [e for d in audit_dates(audit_dir) for e in iter_audit_entries(d, audit_dir) if match(e)]
+
+
+def run(days: int, per_day: int, evidence_ids: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    audit_dir = tempfile.mkdtemp(prefix="audit_query_bench_")
+    try:
+        log = SegmentedAuditLog(audit_dir, max_segment_bytes=8 * 1024 * 1024, commit_every=10_000)
+        first = date(2024, 1, 1)
+        start = time.perf_counter()
+        for d in range(days):
+            date_str = (first + timedelta(days=d)).isoformat()
+            base = date_start(date_str)
+            for i in range(per_day):
+                log.append({"evidence_id": f"ev-{rng.randrange(evidence_ids)}",
+                            "status": "error" if rng.random() < 0.01 else "success",
+                            "timestamp": base + i * 86_400 / per_day,
+                            "state": {"truth_quality": round(rng.random(), 3)}}, date_str=date_str)
+        log.sync()
+        write_s = time.perf_counter() - start
+
+        mid = (first + timedelta(days=days // 2)).isoformat()
+        hour = date_start(mid) + 12 * 3600
+        queries = {
+            "by_id": (lambda: log.query(evidence_id="ev-7"),
+                      lambda: _scan(audit_dir, lambda e: e["evidence_id"] == "ev-7")),
+            "one_hour": (lambda: log.query(start=hour, end=hour + 3600),
+                         lambda: _scan(audit_dir, lambda e: hour <= e["timestamp"] < hour + 3600)),
+            "day_errors": (lambda: log.query(status="error", start=date_start(mid), end=date_start(mid) + 86_400),
+                           lambda: _scan(audit_dir, lambda e: e["status"] == "error"
+                                         and date_start(mid) <= e["timestamp"] < date_start(mid) + 86_400)),
+        }
+        results = {"entries": days * per_day, "append_per_entry_us": write_s / (days * per_day) * 1e6}
+        for name, (indexed, scan) in queries.items():
+            indexed_s, matches = _timed(indexed)
+            scan_s, scanned_matches = _timed(scan)
+            assert matches == scanned_matches
+            results[name] = {"matches": matches, "indexed_s": indexed_s, "scan_s": scan_s,
+                             "speedup": scan_s / indexed_s}
+        log.close()
+        return results
+    finally:
+        shutil.rmtree(audit_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--per-day", type=int, default=5_000)
+    parser.add_argument("--evidence-ids", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.days, args.per_day, args.evidence_ids, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/evidence_memory.py
+"""
+Memory held by TruthEngine.material_evidence_store: plain dicts vs Evidence records.
+
+    python -m benchmarks.evidence_memory
+    python -m benchmarks.evidence_memory --sizes 100000 1000000
+
+Evidence is generated as JSONL lines and parsed one line at a time, as
+main.py / core.ingest do, so per-item key strings are not shared between
+dicts. Memory is measured with tracemalloc (bytes still allocated after
+the store is built, excluding the source lines).
+"""
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+from typing import Dict, List
+
+from core.evidence import Evidence
+
+DEFAULT_SIZES = [10_000, 100_000]
+
+
+def evidence_lines(n: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    return [json.dumps({
+        "id": f"ev-{i}",
+        "content": f"claim {i}",
+        "affected_agents": rng.randint(0, 2_000_000),
+        "irreversibility": round(rng.random(), 3),
+        "scope": round(rng.random(), 3),
+        "source": f"src-{i % 8}",
+        "metadata": {"source": f"src-{i % 8}", "lang": "en"}
+    }) for i in range(n)]
+
+
+def measure_store(lines: List[str], as_records: bool) -> int:
+    gc.collect()
+    tracemalloc.start()
+    store = {}
+    for line in lines:
+        item = json.loads(line)
+        store[item["id"]] = Evidence.from_dict(item) if as_records else item
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return size
+
+
+def run(sizes: List[int], seed: int = 0) -> Dict[str, dict]:
+    results = {}
+    for n in sizes:
+        lines = evidence_lines(n, seed)
+        dict_bytes = measure_store(lines, as_records=False)
+        record_bytes = measure_store(lines, as_records=True)
+        results[str(n)] = {
+            "dict_bytes": dict_bytes,
+            "record_bytes": record_bytes,
+            "dict_bytes_per_item": dict_bytes / n,
+            "record_bytes_per_item": record_bytes / n,
+            "ratio": record_bytes / dict_bytes
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
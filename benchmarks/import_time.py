@@ -0,0 +1,94 @@
+# benchmarks/import_time.py
+"""
+Cold import cost of the core and agent modules, measured with -X importtime.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --budget-ms 150 --output imports.json
+
+Each module is imported in a fresh interpreter `--repeats` times; the best
+cumulative time is reported together with any heavy dependencies (openai,
+numpy, ...) the import dragged in. Exits 1 if a module is over budget.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+# Entry points used by the CLI, batch workers and tests
+MODULES = [
+    "core.truth_engine",
+    "core.triage",
+    "core.ingest",
+    "core.oracle",
+    "core.data_manager",
+    "core.metrics",
+    "agents.aggregator",
+    "agents.agent_manager",
+    "human_interface.review_queue",
+    "main",
+]
+
+# Should only be imported when they are actually used
+HEAVY_MODULES = ("openai", "numpy", "requests", "aiohttp", "http.server")
+
+DEFAULT_BUDGET_MS = 150.0
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """
+    {module: cumulative microseconds} from -X importtime output
+    """
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cum_us, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cum_us)
+    return cumulative
+
+
+def measure(module: str, repeats: int = 5) -> Dict[str, object]:
+    probe = (f"import sys; import {module}; "
+             f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    best: Optional[int] = None
+    heavy: List[str] = []
+    for _ in range(repeats):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", probe], cwd=_ROOT,
+                              capture_output=True, text=True, check=True)
+        total = parse_importtime(proc.stderr).get(module)
+        if total is not None and (best is None or total < best):
+            best = total
+        heavy = [m for m in proc.stdout.strip().split(",") if m]
+    return {"cumulative_ms": best / 1000.0 if best is not None else None, "heavy_imports": heavy}
+
+
+def run(modules: List[str], repeats: int, budget_ms: float) -> dict:
+    results = {module: measure(module, repeats) for module in modules}
+    over = [m for m, r in results.items() if r["cumulative_ms"] is not None and r["cumulative_ms"] > budget_ms]
+    return {"budget_ms": budget_ms, "results": results, "over_budget": over}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    report = run(args.modules, args.repeats, args.budget_ms)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    sys.exit(1 if report["over_budget"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/merkle_log.py
+"""
+Append throughput, single-entry verification latency and bulk
+verification throughput for TamperEvidentLog.
+
+    python -m benchmarks.merkle_log --entries 1000000
+    python -m benchmarks.merkle_log --entries 1000000 --workers 1 2 4 8
+
+Bulk verification (verify_all) is timed inline and with a process pool
+of each --workers size; entries are small, so hashing them on threads
+would serialize on the GIL.
+"""
+import argparse
+import json
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from core.merkle import TamperEvidentLog
+
+
+def run(entries: int, samples: int, workers: List[int] = ()) -> dict:
+    storage_dir = tempfile.mkdtemp(prefix="merkle_bench_")
+    try:
+        log = TamperEvidentLog(storage_dir, checkpoint_every=100_000)
+        start = time.perf_counter()
+        for i in range(entries):
+            log.append({"evidence_id": f"ev-{i}", "status": "success"})
+        append_s = time.perf_counter() - start
+
+        rng = random.Random(0)
+        timings = []
+        for _ in range(samples):
+            index = rng.randrange(entries)
+            t = time.perf_counter()
+            assert log.verify_entry(index)
+            timings.append(time.perf_counter() - t)
+        timings.sort()
+
+        verify_all_s = {}
+        for n in [0, *workers]:
+            start = time.perf_counter()
+            if n:
+                with ProcessPoolExecutor(max_workers=n) as pool:
+                    result = log.verify_all(executor=pool)
+            else:
+                result = log.verify_all()
+            assert result["valid"]
+            verify_all_s["inline" if not n else f"processes_{n}"] = time.perf_counter() - start
+        log.close()
+        return {
+            "entries": entries,
+            "append_per_entry_us": append_s / entries * 1e6,
+            "verify_entry_ms": {
+                "p50": timings[len(timings) // 2] * 1e3,
+                "p99": timings[int(len(timings) * 0.99)] * 1e3,
+                "max": timings[-1] * 1e3
+            },
+            "verify_all_s": verify_all_s,
+            "verify_all_entries_per_s": {k: entries / v for k, v in verify_all_s.items()}
+        }
+    finally:
+        shutil.rmtree(storage_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="*", default=[])
+    args = parser.parse_args()
+    print(json.dumps(run(args.entries, args.samples, args.workers), indent=2))
+
+
+if __name__ == "__main__":
+    main()
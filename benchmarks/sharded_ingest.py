@@ -0,0 +1,62 @@
+# benchmarks/sharded_ingest.py
+"""
+Ingest throughput of TruthEngine vs ShardedTruthEngine by worker count.
+
+    python -m benchmarks.sharded_ingest
+    python -m benchmarks.sharded_ingest --items 1000000 --shards 1 2 4 8
+
+Each run adds the same evidence and ends with get_system_state(), so the
+time includes every shard having stored its share. Scaling is bounded by
+the CPU count and by the router, which only hashes ids and pickles
+batches.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from typing import Dict, List
+
+from core.sharded_engine import ShardedTruthEngine
+from core.truth_engine import TruthEngine
+
+
+def evidence(n: int, seed: int = 0) -> List[dict]:
+    rng = random.Random(seed)
+    return [{"id": f"ev-{i}", "content": f"claim {i}", "affected_agents": rng.randint(0, 2_000_000),
+             "irreversibility": rng.random(), "scope": rng.random(), "source": f"src-{i % 8}",
+             "branch_outputs": [{"name": f"b{j}", "weight": rng.uniform(0.5, 2.0)} for j in range(3)]}
+            for i in range(n)]
+
+
+def _ingest(engine, items: List[dict]) -> float:
+    start = time.perf_counter()
+    for item in items:
+        engine.add_evidence(item["id"], item)
+    engine.get_system_state()
+    return time.perf_counter() - start
+
+
+def run(items: int, shards: List[int], seed: int = 0) -> Dict[str, dict]:
+    data = evidence(items, seed)
+    baseline = _ingest(TruthEngine(), data)
+    results = {"cpus": os.cpu_count(), "in_process": {"seconds": baseline, "items_per_sec": items / baseline}}
+    for n in shards:
+        with ShardedTruthEngine(shards=n) as engine:
+            elapsed = _ingest(engine, data)
+        results[f"shards_{n}"] = {"seconds": elapsed, "items_per_sec": items / elapsed,
+                                  "speedup": baseline / elapsed}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.items, args.shards, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
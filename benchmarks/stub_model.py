@@ -0,0 +1,76 @@
+# benchmarks/stub_model.py
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class StubResponse(dict):
+    """
+    Dict that also allows attribute access, like openai's OpenAIObject,
+    so both response['choices'] and response.choices work.
+    """
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+class StubChatCompletion:
+    """
+    Local stand-in for openai.ChatCompletion.create that injects latency.
+
+    latency: base seconds per call; jitter: extra uniform random seconds.
+    `latencies` maps a substring of the system prompt to a fixed latency, which
+    lets a benchmark make one branch deliberately slow.
+    """
+    def __init__(self, latency: float = 0.1, jitter: float = 0.0,
+                 latencies: Optional[Dict[str, float]] = None, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.latencies = latencies or {}
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _latency_for(self, content: str) -> float:
+        for marker, latency in self.latencies.items():
+            if marker in content:
+                return latency
+        with self._lock:
+            return self.latency + self._rng.uniform(0.0, self.jitter)
+
+    def __call__(self, model: str = "stub", messages=None, **params) -> StubResponse:
+        messages = messages or []
+        content = messages[-1]["content"] if messages else ""
+        with self._lock:
+            self.calls += 1
+        time.sleep(self._latency_for(messages[0]["content"] if messages else ""))
+        message = StubResponse(role="assistant", content=f"[{model} stub] {content[:60]}")
+        return StubResponse(choices=[StubResponse(index=0, message=message, finish_reason="stop")])
+
+    # Mirror the openai.ChatCompletion.create entry point
+    create = __call__
+
+
+class FakeAgent:
+    """
+    Stand-in for ClaudeAgent/GrokAgent/OpenAIAgent with a fixed latency.
+    Implements both AgentBase.evaluate and generate_evidence.
+    """
+    def __init__(self, name: str = "fake", latency: float = 0.0, confidence: float = 0.9):
+        self.name = name
+        self.latency = latency
+        self.confidence = confidence
+        self._ids = 0
+
+    def evaluate(self, prompt: str) -> dict:
+        if self.latency:
+            time.sleep(self.latency)
+        return {"answer": f"[{self.name}] {prompt[:60]}", "confidence": self.confidence,
+                "rationale": "fake agent", "metadata": {"agent": self.name}}
+
+    def generate_evidence(self, prompt: str) -> dict:
+        self._ids += 1
+        return {"id": f"{self.name}-{self._ids}", "content": f"[{self.name}] {prompt}", "affected_agents": 1000}
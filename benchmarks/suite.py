@@ -0,0 +1,251 @@
+# benchmarks/suite.py
+"""
+Reproducible benchmarks for the engine, triage, logging and aggregation hot paths.
+
+    python -m benchmarks.suite --output bench.json
+    python -m benchmarks.suite --only triage_prioritize --sizes 1000 100000
+    python -m benchmarks.suite --compare before.json after.json
+
+Every benchmark builds its inputs from a fixed seed, runs `--repeats` times
+per size and reports min/median seconds and per-operation cost as JSON.
+Nothing touches the network: model calls go to benchmarks.stub_model.
+"""
+import argparse
+import json
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from agents.aggregator import Aggregator, Branch
+from agents.agent_manager import AgentManager
+from core.audit_log import SegmentedAuditLog
+from core.merkle import TamperEvidentLog
+from core.triage import Triage
+from core.truth_engine import TruthEngine
+from core.verification import MultiAgentVerification
+from benchmarks.stub_model import FakeAgent, StubChatCompletion
+
+DEFAULT_SIZES = [100, 1_000, 10_000]
+
+# name -> setup(n, rng) returning (zero-arg callable, number of operations it performs)
+BENCHMARKS: Dict[str, Callable] = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _evidence(n: int, rng: random.Random, branches: bool = False) -> List[dict]:
+    items = []
+    for i in range(n):
+        ev = {"id": f"ev-{i}", "content": f"claim {i}", "affected_agents": rng.randint(0, 2_000_000),
+              "irreversibility": rng.random(), "scope": rng.random(), "source": f"src-{i % 8}"}
+        if branches:
+            ev["branch_outputs"] = [{"name": f"b{j}", "weight": rng.uniform(0.5, 2.0)} for j in range(3)]
+        items.append(ev)
+    return items
+
+
+@benchmark("truth_engine_add_evidence")
+def bench_add_evidence(n, rng):
+    evidence = _evidence(n, rng, branches=True)
+
+    def run():
+        engine = TruthEngine()
+        for ev in evidence:
+            engine.add_evidence(ev["id"], ev)
+    return run, n
+
+
+@benchmark("triage_prioritize")
+def bench_triage_prioritize(n, rng):
+    triage = Triage(max_concurrent=50)
+    for ev in _evidence(n, rng):
+        triage.add_to_queue(ev)
+
+    def run():
+        for _ in range(100):
+            triage.prioritize()
+    return run, 100
+
+
+@benchmark("triage_process_batch")
+def bench_triage_process_batch(n, rng):
+    evidence = _evidence(n, rng)
+
+    class NullEngine:
+        def add_evidence(self, evidence_id, evidence):
+            pass
+
+    def run():
+        triage = Triage(max_concurrent=50)
+        for ev in evidence:
+            triage.add_to_queue(ev)
+        engine = NullEngine()
+        while len(triage):
+            triage.process_batch(engine)
+    return run, n
+
+
+@benchmark("tamper_evident_log_append")
+def bench_log_append(n, rng):
+    entries = [{"question": f"q{i}", "response": {"status": "success"}, "read_only": True} for i in range(n)]
+
+    def run():
+        log = TamperEvidentLog(checkpoint_every=0)
+        for entry in entries:
+            log.append(entry)
+    return run, n
+
+
+@benchmark("append_audit_log")
+def bench_audit_log(n, rng):
+    entries = [{"evidence_id": f"ev-{i}", "status": "success", "state": {"truth_quality": 1.0}} for i in range(n)]
+
+    def run():
+        audit_dir = tempfile.mkdtemp(prefix="audit_bench_")
+        try:
+            log = SegmentedAuditLog(audit_dir)
+            for entry in entries:
+                log.append(entry)
+            log.close()
+        finally:
+            shutil.rmtree(audit_dir, ignore_errors=True)
+    return run, n
+
+
+@benchmark("verification_evaluate_evidence")
+def bench_verification(n, rng):
+    evidence = _evidence(n, rng, branches=True)
+
+    def run():
+        verifier = MultiAgentVerification(seed=0)
+        for ev in evidence:
+            verifier.evaluate_evidence(ev, high_impact=True)
+    return run, n
+
+
+@benchmark("aggregator_evaluate")
+def bench_aggregator(n, rng):
+    # the stub answers instantly, so this measures aggregation overhead, not model latency
+    stub = StubChatCompletion(latency=0.0)
+    aggregator = Aggregator(TruthEngine(), concurrent=True)
+    for i in range(3):
+        aggregator.add_branch(Branch(f"branch_{i}", 1.0, f"Branch {i}", completion_fn=stub))
+    prompts = [f"Evaluate claim #{i}" for i in range(n)]
+
+    def run():
+        for prompt in prompts:
+            aggregator.evaluate(prompt)
+    return run, n
+
+
+@benchmark("agent_manager_evaluate_all")
+def bench_agent_manager(n, rng):
+    manager = AgentManager(FakeAgent("claude"), FakeAgent("grok"), FakeAgent("openai"))
+
+    def run():
+        for i in range(n):
+            manager.aggregate(manager.evaluate_all(f"prompt {i}"))
+    return run, n
+
+
+def run_benchmark(name: str, sizes: List[int], repeats: int, seed: int) -> Dict[str, dict]:
+    results = {}
+    for n in sizes:
+        fn, ops = BENCHMARKS[name](n, random.Random(seed))
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        results[str(n)] = {
+            "ops": ops,
+            "min_s": best,
+            "median_s": statistics.median(timings),
+            "per_op_us": best / ops * 1e6,
+            "ops_per_sec": ops / best if best > 0 else None
+        }
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_suite(names: List[str], sizes: List[int], repeats: int, seed: int) -> dict:
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "repeats": repeats,
+            "seed": seed
+        },
+        "results": {name: run_benchmark(name, sizes, repeats, seed) for name in names}
+    }
+
+
+def compare(before: dict, after: dict, threshold: float = 0.10) -> dict:
+    """
+    Per benchmark/size ratio of after/before per-op cost; ratios above
+    1 + threshold are flagged as regressions.
+    """
+    report = {"regressions": [], "changes": {}}
+    for name, sizes in after["results"].items():
+        for size, stats in sizes.items():
+            old = before["results"].get(name, {}).get(size)
+            if not old:
+                continue
+            ratio = stats["per_op_us"] / old["per_op_us"] if old["per_op_us"] else None
+            report["changes"][f"{name}[{size}]"] = ratio
+            if ratio is not None and ratio > 1 + threshold:
+                report["regressions"].append(f"{name}[{size}]")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run (default: all)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two result files")
+    parser.add_argument("--threshold", type=float, default=0.10, help="regression threshold for --compare")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0], encoding="utf-8") as f:
+            before = json.load(f)
+        with open(args.compare[1], encoding="utf-8") as f:
+            after = json.load(f)
+        report = compare(before, after, args.threshold)
+        print(json.dumps(report, indent=2))
+        sys.exit(1 if report["regressions"] else 0)
+
+    results = run_suite(args.only or sorted(BENCHMARKS), args.sizes, args.repeats, args.seed)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
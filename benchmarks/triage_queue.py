@@ -0,0 +1,82 @@
+# benchmarks/triage_queue.py
+"""
+Heap-backed Triage vs the previous sort-and-filter implementation.
+
+    python -m benchmarks.triage_queue --sizes 1000 10000 100000
+"""
+import argparse
+import json
+import random
+import time
+
+from core.triage import Triage, priority_score
+
+
+class SortedListTriage:
+    """
+    The original list-based Triage: re-sort on every prioritize() and
+    filter the processed batch out with `e not in batch`.
+    """
+    def __init__(self, max_concurrent: int = 5):
+        self.max_concurrent = max_concurrent
+        self.queue = []
+
+    def add_to_queue(self, evidence):
+        self.queue.append(evidence)
+
+    def prioritize(self):
+        return sorted(self.queue, key=priority_score, reverse=True)[:self.max_concurrent]
+
+    def process_batch(self, truth_engine):
+        batch = self.prioritize()
+        for ev in batch:
+            truth_engine.add_evidence(ev["id"], ev)
+        self.queue = [e for e in self.queue if e not in batch]
+
+
+class NullEngine:
+    def add_evidence(self, evidence_id, evidence):
+        pass
+
+
+def make_evidence(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [{"id": f"ev-{i}", "irreversibility": rng.random(), "scope": rng.random()} for i in range(n)]
+
+
+def time_impl(cls, evidence, batches: int) -> dict:
+    triage = cls(max_concurrent=50)
+    start = time.perf_counter()
+    for ev in evidence:
+        triage.add_to_queue(ev)
+    insert_s = time.perf_counter() - start
+
+    engine = NullEngine()
+    start = time.perf_counter()
+    for _ in range(batches):
+        triage.process_batch(engine)
+    batch_s = time.perf_counter() - start
+    return {"insert_total_s": insert_s, "process_batch_mean_ms": batch_s / batches * 1e3}
+
+
+def run(sizes, batches: int) -> dict:
+    results = {}
+    for n in sizes:
+        evidence = make_evidence(n)
+        results[str(n)] = {
+            "heap": time_impl(Triage, evidence, batches),
+            "sorted_list": time_impl(SortedListTriage, evidence, batches)
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--batches", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes, args.batches), indent=2))
+
+
+if __name__ == "__main__":
+    main()
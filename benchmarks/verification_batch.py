@@ -0,0 +1,49 @@
+# benchmarks/verification_batch.py
+"""
+Per-item MultiAgentVerification.evaluate_evidence vs evaluate_batch.
+
+    python -m benchmarks.verification_batch --items 100000
+"""
+import argparse
+import json
+import random
+import time
+
+from core.verification import MultiAgentVerification
+
+
+def make_evidence(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        {"id": f"ev-{i}", "branch_outputs": [{"name": f"b{j}", "weight": rng.uniform(0.5, 2.0)}
+                                             for j in range(rng.randint(1, 5))]}
+        for i in range(n)
+    ]
+
+
+def run(items: int) -> dict:
+    evidence = make_evidence(items)
+
+    verifier = MultiAgentVerification(seed=0)
+    start = time.perf_counter()
+    for ev in evidence:
+        verifier.evaluate_evidence(ev, high_impact=True)
+    loop_s = time.perf_counter() - start
+
+    verifier = MultiAgentVerification(seed=0)
+    start = time.perf_counter()
+    verifier.evaluate_batch(evidence, high_impact=True)
+    batch_s = time.perf_counter() - start
+
+    return {"items": items, "loop_s": loop_s, "batch_s": batch_s, "speedup": loop_s / batch_s}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100_000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.items), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+# core/audit_index.py
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+INDEX_NAME = "audit_index.db"
+
+# Fields lifted out of each entry into the index
+ID_FIELD = "evidence_id"
+STATUS_FIELD = "status"
+TIME_FIELD = "timestamp"
+
+TimeBound = Union[None, float, int, datetime]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    id            INTEGER PRIMARY KEY,
+    name          TEXT UNIQUE NOT NULL,
+    date          TEXT NOT NULL,
+    min_ts        REAL,
+    max_ts        REAL,
+    indexed_bytes INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS entries (
+    segment_id  INTEGER NOT NULL,
+    offset      INTEGER NOT NULL,
+    length      INTEGER NOT NULL,
+    ts          REAL NOT NULL,
+    evidence_id TEXT,
+    status      TEXT,
+    PRIMARY KEY (segment_id, offset)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_by_id ON entries (evidence_id, ts) WHERE evidence_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS entries_by_time ON entries (ts);
+CREATE INDEX IF NOT EXISTS entries_by_status ON entries (status, ts);
+"""
+
+
+def _epoch(value: TimeBound) -> Optional[float]:
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if value.tzinfo is None:  # audit dates are UTC (see audit_log._today)
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def date_start(date_str: str) -> float:
+    """UTC midnight of a YYYY-MM-DD day, as epoch seconds."""
+    return datetime.strptime(date_str, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+
+
+def entry_time(entry: Dict[str, Any], fallback: float) -> float:
+    """
+    The entry's own timestamp (epoch seconds or ISO-8601) when it has one,
+    otherwise `fallback`.
+    """
+    value = entry.get(TIME_FIELD) if isinstance(entry, dict) else None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return _epoch(datetime.fromisoformat(value))
+        except ValueError:
+            pass
+    return fallback
+
+
+def _text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+class AuditIndex:
+    """
+    Secondary indexes over the segmented audit trail.
+
+    For every entry the index keeps (segment, byte offset, length,
+    timestamp, evidence_id, status) in SQLite next to the segments, and
+    per segment its time range and how many bytes are indexed. Lookups by
+    evidence id, time range or status find the matching rows through the
+    index and read only those lines, grouped per segment.
+
+    Rows are added by SegmentedAuditLog as it writes and flushed with its
+    group commit. Bytes a crash left unindexed, and segments written
+    before the index existed, are picked up by catch_up(), which resumes
+    each segment at its indexed_bytes.
+    """
+    def __init__(self, audit_dir: str, db_path: Optional[str] = None):
+        self.audit_dir = audit_dir
+        self.db_path = db_path or os.path.join(audit_dir, INDEX_NAME)
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._segments: Dict[str, List] = {}  # name -> [id, min_ts, max_ts, indexed_bytes]
+        self._pending: List[Tuple] = []
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            for seg_id, name, min_ts, max_ts, indexed in self._conn.execute(
+                    "SELECT id, name, min_ts, max_ts, indexed_bytes FROM segments"):
+                self._segments[name] = [seg_id, min_ts, max_ts, indexed]
+
+    # ----------------------
+    # Maintenance
+    # ----------------------
+
+    def add(self, segment: str, offset: int, length: int, entry: Dict[str, Any], ts: float):
+        """
+        Buffer the index row for one line of `segment` (a file name in
+        audit_dir); rows reach the database on flush().
+        """
+        with self._lock:
+            state = self._segment_state(segment)
+            if state[3] > offset:  # already indexed (catch_up got there first)
+                return
+            get = entry.get if isinstance(entry, dict) else (lambda _: None)
+            self._pending.append((state[0], offset, length, ts, _text(get(ID_FIELD)), _text(get(STATUS_FIELD))))
+            state[1] = ts if state[1] is None else min(state[1], ts)
+            state[2] = ts if state[2] is None else max(state[2], ts)
+            state[3] = offset + length
+
+    def flush(self):
+        """
+        Write buffered rows and segment stats in one transaction.
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            rows, self._pending = self._pending, []
+            touched = {row[0] for row in rows}
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?, ?)", rows)
+                self._conn.executemany(
+                    "UPDATE segments SET min_ts = ?, max_ts = ?, indexed_bytes = ? WHERE id = ?",
+                    [(min_ts, max_ts, indexed, seg_id) for seg_id, min_ts, max_ts, indexed in self._segments.values()
+                     if seg_id in touched])
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def catch_up(self) -> int:
+        """
+        Index whatever segment bytes are not indexed yet; returns the
+        number of entries added. A torn final line is left for later;
+        lines that do not parse are not indexed.
+        """
+        from .audit_log import SEGMENT_SUFFIX  # audit_log imports this module
+
+        added = 0
+        names = sorted(n for n in os.listdir(self.audit_dir) if n.endswith(SEGMENT_SUFFIX) and "_audit." in n) \
+            if os.path.isdir(self.audit_dir) else []
+        for name in names:
+            path = os.path.join(self.audit_dir, name)
+            with self._lock:
+                state = self._segment_state(name)
+                start = state[3]
+                fallback = state[2] if state[2] is not None else date_start(name.split("_audit.", 1)[0])
+            if os.path.getsize(path) <= start:
+                continue
+            with open(path, "rb") as f:
+                f.seek(start)
+                offset = start
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        entry = json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        offset += len(line)
+                        continue
+                    fallback = entry_time(entry, fallback)
+                    self.add(name, offset, len(line), entry, fallback)
+                    offset += len(line)
+                    added += 1
+            self.flush()
+        return added
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    # ----------------------
+    # Queries
+    # ----------------------
+
+    def locate(self, evidence_id: Optional[str] = None, start: TimeBound = None, end: TimeBound = None,
+               status: Optional[str] = None, limit: Optional[int] = None,
+               newest_first: bool = False) -> List[Tuple[str, int, int]]:
+        """
+        (segment name, offset, length) of matching entries in time order.
+        start is inclusive, end exclusive; naive datetimes are UTC.
+        """
+        clauses, params = [], []
+        if evidence_id is not None:
+            clauses.append("e.evidence_id = ?")
+            params.append(str(evidence_id))
+        if status is not None:
+            clauses.append("e.status = ?")
+            params.append(str(status))
+        if start is not None:
+            clauses.append("e.ts >= ?")
+            params.append(_epoch(start))
+        if end is not None:
+            clauses.append("e.ts < ?")
+            params.append(_epoch(end))
+        order = "DESC" if newest_first else "ASC"
+        sql = ("SELECT s.name, e.offset, e.length FROM entries e JOIN segments s ON s.id = e.segment_id"
+               + (" WHERE " + " AND ".join(clauses) if clauses else "")
+               + f" ORDER BY e.ts {order}, e.segment_id {order}, e.offset {order}")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def query(self, evidence_id: Optional[str] = None, start: TimeBound = None, end: TimeBound = None,
+              status: Optional[str] = None, limit: Optional[int] = None,
+              newest_first: bool = False) -> List[Dict[str, Any]]:
+        """
+        Matching entries, reading only their lines from the segments.
+        Lines that no longer decode are skipped.
+        """
+        locations = self.locate(evidence_id, start, end, status, limit, newest_first)
+        by_segment: Dict[str, List[Tuple[int, int, int]]] = {}
+        for position, (name, offset, length) in enumerate(locations):
+            by_segment.setdefault(name, []).append((offset, length, position))
+        results: List[Optional[Dict[str, Any]]] = [None] * len(locations)
+        for name, spans in by_segment.items():
+            fd = os.open(os.path.join(self.audit_dir, name), os.O_RDONLY)
+            try:
+                for offset, length, position in sorted(spans):
+                    try:
+                        results[position] = json.loads(os.pread(fd, length, offset))
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue
+            finally:
+                os.close(fd)
+        return [entry for entry in results if entry is not None]
+
+    def segments_between(self, start: TimeBound = None, end: TimeBound = None) -> List[str]:
+        """
+        Segment names whose entries overlap [start, end).
+        """
+        sql, params = "SELECT name FROM segments WHERE min_ts IS NOT NULL", []
+        if start is not None:
+            sql += " AND max_ts >= ?"
+            params.append(_epoch(start))
+        if end is not None:
+            sql += " AND min_ts < ?"
+            params.append(_epoch(end))
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql + " ORDER BY name", params)]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            return {"segments": len(self._segments), "entries": entries + len(self._pending)}
+
+    def _segment_state(self, name: str) -> List:
+        """Caller holds the lock."""
+        state = self._segments.get(name)
+        if state is None:
+            cur = self._conn.execute("INSERT OR IGNORE INTO segments (name, date) VALUES (?, ?)",
+                                     (name, name.split("_audit.", 1)[0]))
+            seg_id = cur.lastrowid if cur.rowcount else \
+                self._conn.execute("SELECT id FROM segments WHERE name = ?", (name,)).fetchone()[0]
+            state = self._segments[name] = [seg_id, None, None, 0]
+        return state
+
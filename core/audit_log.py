@@ -0,0 +1,298 @@
+# core/audit_log.py
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+from .audit_index import AuditIndex, TimeBound, date_start, entry_time
+
+# Paths
+AUDIT_DIR = "data/audit_trails"
+
+SEGMENT_SUFFIX = ".jsonl"
+LEGACY_SUFFIX = "_audit.json"
+MIGRATING_SUFFIX = "_audit.migrating"
+
+
+def _today() -> str:
+    return datetime.utcnow().strftime("%Y-%m-%d")
+
+
+def segment_name(date_str: str, seq: int) -> str:
+    """e.g. 2024-05-01_audit.00003.jsonl"""
+    return f"{date_str}_audit.{seq:05d}{SEGMENT_SUFFIX}"
+
+
+def list_segments(audit_dir: str, date_str: str) -> list:
+    """
+    Segment paths for one day, oldest first.
+    """
+    return sorted(glob.glob(os.path.join(audit_dir, f"{date_str}_audit.*{SEGMENT_SUFFIX}")))
+
+
+def _segment_seq(path: str) -> int:
+    return int(os.path.basename(path).rsplit(".", 2)[1])
+
+
+class SegmentedAuditLog:
+    """
+    Append-only, line-delimited audit log.
+
+    Each UTC day is split into numbered JSONL segments; a new segment is
+    started once the current one reaches max_segment_bytes. Every append is
+    handed to the OS immediately, while fsyncs are batched (group commit):
+    the file is synced once `commit_every` entries are pending or
+    `commit_interval` seconds have passed since the last sync.
+
+    With index=True (the default) an AuditIndex is kept up to date as
+    entries are written (its rows are flushed with each group commit), so
+    query() can look entries up by evidence id, time range or status
+    without scanning segments.
+    """
+    def __init__(self, audit_dir: str = AUDIT_DIR, max_segment_bytes: int = 64 * 1024 * 1024,
+                 commit_every: int = 256, commit_interval: float = 1.0, index: bool = True):
+        self.audit_dir = audit_dir
+        self.max_segment_bytes = max_segment_bytes
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self._lock = threading.Lock()
+        self._file: Optional[TextIO] = None
+        self._date: Optional[str] = None
+        self._seq = 0
+        self._size = 0
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self.index: Optional[AuditIndex] = None
+        if index:
+            self.index = AuditIndex(audit_dir)
+            self.index.catch_up()
+
+    def append(self, entry: Dict[str, Any], date_str: Optional[str] = None) -> str:
+        """
+        Append one entry and return the segment path it was written to.
+        """
+        line = json.dumps(entry, separators=(",", ":"), default=str) + "\n"
+        encoded_len = len(line.encode("utf-8"))
+        with self._lock:
+            today = _today()
+            self._ensure_segment(date_str or today, encoded_len)
+            if self.index is not None:
+                now = time.time() if date_str in (None, today) else date_start(date_str)
+                self.index.add(os.path.basename(self._file.name), self._size, encoded_len,
+                               entry, entry_time(entry, now))
+            self._file.write(line)
+            self._file.flush()
+            self._size += encoded_len
+            self._pending += 1
+            if (self._pending >= self.commit_every
+                    or time.monotonic() - self._last_commit >= self.commit_interval):
+                self._commit()
+            return self._file.name
+
+    def sync(self) -> None:
+        """
+        Force pending entries to stable storage.
+        """
+        with self._lock:
+            if self._file is not None and self._pending:
+                self._commit()
+
+    def query(self, evidence_id: Optional[str] = None, start: TimeBound = None, end: TimeBound = None,
+              status: Optional[str] = None, limit: Optional[int] = None,
+              newest_first: bool = False) -> List[Dict[str, Any]]:
+        """
+        Entries matching every given filter, in time order (see AuditIndex.query).
+        """
+        if self.index is None:
+            raise RuntimeError("Audit log was opened with index=False")
+        with self._lock:
+            self.index.flush()
+        return self.index.query(evidence_id, start, end, status, limit, newest_first)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                if self._pending:
+                    self._commit()
+                self._file.close()
+                self._file = None
+                self._date = None
+            if self.index is not None:
+                self.index.flush()
+
+    def _commit(self) -> None:
+        os.fsync(self._file.fileno())
+        if self.index is not None:
+            self.index.flush()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+
+    def _ensure_segment(self, date_str: str, incoming: int) -> None:
+        """Open (or rotate to) the segment the next line belongs in; caller holds the lock."""
+        if self._file is not None and date_str == self._date:
+            if self._size == 0 or self._size + incoming <= self.max_segment_bytes:
+                return
+            self._open(date_str, self._seq + 1)
+            return
+
+        segments = list_segments(self.audit_dir, date_str)
+        seq = _segment_seq(segments[-1]) if segments else 0
+        self._open(date_str, seq)
+        if self._size and self._size + incoming > self.max_segment_bytes:
+            self._open(date_str, seq + 1)
+
+    def _adopt_segment(self, tmp_path: str, date_str: str) -> str:
+        """
+        Atomically install a fully written, fsynced file as the day's newest
+        segment and index it. Returns the segment path.
+        """
+        with self._lock:
+            if self._date == date_str:  # next append re-resolves the day's newest segment
+                if self._pending:
+                    self._commit()
+                self._file.close()
+                self._file = None
+                self._date = None
+            segments = list_segments(self.audit_dir, date_str)
+            seq = _segment_seq(segments[-1]) + 1 if segments else 0
+            path = os.path.join(self.audit_dir, segment_name(date_str, seq))
+            os.replace(tmp_path, path)
+            if self.index is not None:
+                self.index.catch_up()
+            return path
+
+    def _open(self, date_str: str, seq: int) -> None:
+        if self._file is not None:
+            if self._pending:
+                self._commit()
+            self._file.close()
+        os.makedirs(self.audit_dir, exist_ok=True)
+        path = os.path.join(self.audit_dir, segment_name(date_str, seq))
+        if os.path.exists(path):
+            _trim_torn_tail(path)
+        self._file = open(path, "a", encoding="utf-8")
+        self._date = date_str
+        self._seq = seq
+        self._size = self._file.tell()
+
+
+def _trim_torn_tail(path: str) -> None:
+    """
+    Cut a segment back to its last complete line, so an append after an
+    interrupted write does not land on the end of the fragment.
+    """
+    with open(path, "r+b") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - 4096)
+            f.seek(start)
+            newline = f.read(pos - start).rfind(b"\n")
+            if newline >= 0:
+                pos = start + newline + 1
+                break
+            pos = start
+        if pos != end:
+            f.truncate(pos)
+            os.fsync(f.fileno())
+
+
+def iter_audit_entries(date_str: Optional[str] = None, audit_dir: str = AUDIT_DIR) -> Iterator[Dict[str, Any]]:
+    """
+    Stream a day's audit entries (today by default) one line at a time.
+    A torn final line from an interrupted write is skipped.
+    """
+    for path in list_segments(audit_dir, date_str or _today()):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def audit_dates(audit_dir: str = AUDIT_DIR) -> list:
+    """
+    Days that have at least one segment, oldest first.
+    """
+    pattern = os.path.join(audit_dir, f"*_audit.*{SEGMENT_SUFFIX}")
+    return sorted({os.path.basename(p).split("_audit.", 1)[0] for p in glob.glob(pattern)})
+
+
+def migrate_legacy_audit_files(log: "SegmentedAuditLog", remove: bool = False,
+                               errors: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+    """
+    One-shot conversion of old `<date>_audit.json` arrays into segments.
+    Returns entries migrated per day.
+
+    Each file becomes one new segment, committed in three steps: its lines
+    are written and fsynced to `<date>_audit.migrating`, the legacy file is
+    renamed to `.migrated`, and the temporary file is renamed into place.
+    A run interrupted before the second step starts that file over; one
+    interrupted after it finishes the rename. Either way no entry is lost
+    or written twice, and running the migrator again is harmless.
+    With remove=True the `.migrated` file is deleted at the end.
+
+    Files that are not a JSON array are left in place, skipped and
+    reported in `errors` (path -> reason).
+    """
+    migrated = {}
+    for tmp_path in sorted(glob.glob(os.path.join(log.audit_dir, f"*{MIGRATING_SUFFIX}"))):
+        date_str = os.path.basename(tmp_path)[:-len(MIGRATING_SUFFIX)]
+        legacy = os.path.join(log.audit_dir, date_str + LEGACY_SUFFIX)
+        if os.path.exists(legacy):
+            os.remove(tmp_path)  # interrupted before the commit point: redo from the legacy file
+        else:
+            log._adopt_segment(tmp_path, date_str)
+            if remove and os.path.exists(legacy + ".migrated"):
+                os.remove(legacy + ".migrated")
+
+    for path in sorted(glob.glob(os.path.join(log.audit_dir, f"*{LEGACY_SUFFIX}"))):
+        date_str = os.path.basename(path)[:-len(LEGACY_SUFFIX)]
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                entries = json.load(f)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                entries, reason = None, f"not valid JSON: {e}"
+            else:
+                reason = None if isinstance(entries, list) else f"expected a JSON array, got {type(entries).__name__}"
+        if reason is not None:
+            print(f"[AUDIT] Skipping legacy audit file {path}: {reason}")
+            if errors is not None:
+                errors[path] = reason
+            continue
+
+        tmp_path = os.path.join(log.audit_dir, date_str + MIGRATING_SUFFIX)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(",", ":"), default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path, path + ".migrated")  # commit point
+        log._adopt_segment(tmp_path, date_str)
+        if remove:
+            os.remove(path + ".migrated")
+        migrated[date_str] = len(entries)
+    return migrated
+
+
+_default_log: Optional[SegmentedAuditLog] = None
+_default_log_lock = threading.Lock()
+
+
+def get_audit_log() -> SegmentedAuditLog:
+    """
+    Process-wide writer behind data_manager.append_audit_log.
+    """
+    global _default_log
+    with _default_log_lock:
+        if _default_log is None:
+            _default_log = SegmentedAuditLog()
+            atexit.register(_default_log.close)
+        return _default_log
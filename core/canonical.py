@@ -0,0 +1,253 @@
+# core/canonical.py
+"""
+Canonical binary encoding and batch hashing.
+
+encode() maps a value to exactly one byte string, independent of dict
+insertion order, process or platform: every value carries a one-byte type
+tag, lengths and counts are unsigned varints, ints are zigzag varints,
+floats are IEEE-754 big-endian doubles (all NaNs collapse to one), and
+dict items / set members are ordered by their encoded bytes. decode()
+reverses it: tuples come back as lists and frozensets as sets, except in
+dict keys and set members, which decode as tuples and frozensets so they
+stay hashable.
+
+    None  N      str    s <len> <utf-8>      list  l <count> <items>
+    bool  T / F  bytes  b <len> <bytes>      dict  m <count> <key value ...>
+    int   i <zz> float  d <8 bytes>          set   e <count> <items>
+
+hash_many() hashes many payloads on a thread pool. hashlib only releases
+the GIL for buffers of 2 KiB or more, so small payloads are hashed inline
+unless a process pool is passed as `executor`.
+"""
+import hashlib
+import math
+import os
+import struct
+import threading
+from collections.abc import Mapping
+from concurrent.futures import Executor, ThreadPoolExecutor
+from operator import itemgetter
+from typing import Any, Callable, Iterator, List, Optional, Sequence
+
+_DOUBLE = struct.Struct(">d")
+_NAN = _DOUBLE.pack(math.nan)
+
+# hashlib hashes buffers below this size without releasing the GIL
+GIL_RELEASE_BYTES = 2048
+
+DEFAULT_BATCH = 1024
+
+_first = itemgetter(0)
+
+
+# ----------------------
+# Encoding
+# ----------------------
+
+_SMALL = [bytes((n,)) for n in range(0x80)]
+
+
+def _uvarint(n: int) -> bytes:
+    if n < 0x80:
+        return _SMALL[n]
+    out = bytearray()
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+
+def _encode_into(value: Any, out: list, default: Optional[Callable[[Any], Any]]):
+    kind = type(value)
+    if kind is str:
+        data = value.encode("utf-8")
+        out.append(b"s" + _uvarint(len(data)) + data)
+    elif value is None:
+        out.append(b"N")
+    elif kind is bool:
+        out.append(b"T" if value else b"F")
+    elif kind is int:
+        out.append(b"i" + _uvarint(value << 1 if value >= 0 else ((-value) << 1) - 1))
+    elif kind is float:
+        out.append(b"d" + (_NAN if value != value else _DOUBLE.pack(value)))
+    elif kind is dict or isinstance(value, Mapping):
+        items = []
+        for k, v in value.items():
+            if type(k) is str:
+                k = k.encode("utf-8")
+                items.append((b"s" + _uvarint(len(k)) + k, v))
+            else:
+                items.append((encode(k, default), v))
+        items.sort(key=_first)  # encoded keys are unique, values never compared
+        out.append(b"m" + _uvarint(len(items)))
+        for k, v in items:
+            out.append(k)
+            _encode_into(v, out, default)
+    elif kind is list or kind is tuple:
+        out.append(b"l" + _uvarint(len(value)))
+        for item in value:
+            _encode_into(item, out, default)
+    elif kind is bytes or kind is bytearray or kind is memoryview:
+        data = bytes(value)
+        out.append(b"b" + _uvarint(len(data)) + data)
+    elif kind is set or kind is frozenset:
+        members = sorted(encode(item, default) for item in value)
+        out.append(b"e" + _uvarint(len(members)))
+        out.extend(members)
+    elif isinstance(value, str):  # subclasses (str enums) encode as their plain value
+        _encode_into(str.__str__(value), out, default)
+    elif isinstance(value, int):
+        _encode_into(int(value), out, default)
+    elif isinstance(value, float):
+        _encode_into(float(value), out, default)
+    elif default is not None:
+        _encode_into(default(value), out, None)
+    else:
+        raise TypeError(f"Object of type {kind.__name__} has no canonical encoding")
+
+
+def encode(value: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Canonical bytes for value. `default` converts unsupported objects
+    (like json.dumps's default=); without it they raise TypeError.
+    """
+    out: list = []
+    _encode_into(value, out, default)
+    return b"".join(out)
+
+
+# ----------------------
+# Decoding
+# ----------------------
+
+def _read_uvarint(data: bytes, pos: int):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _decode_at(data: bytes, pos: int, hashable: bool = False):
+    """hashable=True (dict keys, set members) decodes lists and sets as tuples and frozensets."""
+    tag = data[pos]
+    pos += 1
+    if tag == 0x73:  # s
+        n, pos = _read_uvarint(data, pos)
+        return data[pos:pos + n].decode("utf-8"), pos + n
+    if tag == 0x4E:  # N
+        return None, pos
+    if tag == 0x54:  # T
+        return True, pos
+    if tag == 0x46:  # F
+        return False, pos
+    if tag == 0x69:  # i
+        z, pos = _read_uvarint(data, pos)
+        return (z >> 1) if not z & 1 else -((z + 1) >> 1), pos
+    if tag == 0x64:  # d
+        return _DOUBLE.unpack_from(data, pos)[0], pos + 8
+    if tag == 0x6D:  # m
+        n, pos = _read_uvarint(data, pos)
+        result = {}
+        for _ in range(n):
+            key, pos = _decode_at(data, pos, True)
+            result[key], pos = _decode_at(data, pos)
+        return result, pos
+    if tag == 0x6C:  # l
+        n, pos = _read_uvarint(data, pos)
+        items = []
+        for _ in range(n):
+            item, pos = _decode_at(data, pos, hashable)
+            items.append(item)
+        return (tuple(items) if hashable else items), pos
+    if tag == 0x62:  # b
+        n, pos = _read_uvarint(data, pos)
+        return bytes(data[pos:pos + n]), pos + n
+    if tag == 0x65:  # e
+        n, pos = _read_uvarint(data, pos)
+        members = set()
+        for _ in range(n):
+            item, pos = _decode_at(data, pos, True)
+            members.add(item)
+        return (frozenset(members) if hashable else members), pos
+    raise ValueError(f"Unknown type tag {tag:#04x} at offset {pos - 1}")
+
+
+def decode(data: bytes) -> Any:
+    value, pos = _decode_at(data, 0)
+    if pos != len(data):
+        raise ValueError(f"Trailing bytes after canonical value ({len(data) - pos})")
+    return value
+
+
+def iter_decode(data: bytes) -> Iterator[Any]:
+    """
+    Values of a concatenation of encodings; each encoding is self-delimiting.
+    """
+    pos = 0
+    while pos < len(data):
+        value, pos = _decode_at(data, pos)
+        yield value
+
+
+# ----------------------
+# Hashing
+# ----------------------
+
+def digest(value: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """
+    SHA-256 (hex) of the canonical encoding.
+    """
+    return hashlib.sha256(encode(value, default)).hexdigest()
+
+
+def _hash_batch(payloads: Sequence[bytes], prefix: bytes = b"") -> List[bytes]:
+    sha256 = hashlib.sha256
+    if prefix:
+        return [sha256(prefix + p).digest() for p in payloads]
+    return [sha256(p).digest() for p in payloads]
+
+
+_POOL: Optional[ThreadPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_hash_pool() -> ThreadPoolExecutor:
+    """
+    Process-wide thread pool for hashing, sized to the CPU count.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="hash")
+        return _POOL
+
+
+def hash_many(payloads: Sequence[bytes], prefix: bytes = b"", executor: Optional[Executor] = None,
+              batch_size: int = DEFAULT_BATCH) -> List[bytes]:
+    """
+    SHA-256 digests of prefix + payload for every payload, in order.
+
+    Payloads are split into batches and hashed on `executor` (the shared
+    hash pool by default). With the thread pool, inputs averaging under
+    GIL_RELEASE_BYTES are hashed inline: threads would only contend for
+    the GIL. A ProcessPoolExecutor parallelises those too.
+    """
+    payloads = payloads if isinstance(payloads, list) else list(payloads)
+    if len(payloads) <= batch_size:
+        return _hash_batch(payloads, prefix)
+    if executor is None:
+        total = sum(len(p) for p in payloads) + len(prefix) * len(payloads)
+        if total < GIL_RELEASE_BYTES * len(payloads):
+            return _hash_batch(payloads, prefix)
+        executor = get_hash_pool()
+    futures = [executor.submit(_hash_batch, payloads[i:i + batch_size], prefix)
+               for i in range(0, len(payloads), batch_size)]
+    digests: List[bytes] = []
+    for future in futures:
+        digests.extend(future.result())
+    return digests
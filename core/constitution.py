@@ -1,5 +1,6 @@
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union
+import numpy as np
 
 class Constitution:
     """
@@ -11,6 +12,7 @@ class Constitution:
         # Article I: Core principles
         self.truth_domains = ["physics", "biology", "math_logic", "history_sociology", "cs_info"]
         self.materiality_threshold = 0.1  # 10% Bayesian belief change
+        self.materiality_quorum = 10  # 10 out of 100 evaluators default
         self.catastrophic_risk_threshold = 0.3  # 30% irreversible loss
         self.high_impact_agents = 1_000_000
         self.provisional_delay_threshold = 72 * 3600  # 72 hours in seconds
@@ -47,7 +49,7 @@ class Constitution:
         if not belief_changes:
             return False
         material_count = sum(1 for change in belief_changes if change >= self.materiality_threshold)
-        return material_count >= 10  # 10 out of 100 evaluators default
+        return material_count >= self.materiality_quorum
 
     def is_high_impact(self, affected_agents: int, irreversible: bool=False) -> bool:
         """
@@ -100,3 +102,62 @@ class Constitution:
             e["priority_score"] = e.get("irreversibility",0) * e.get("scope",0)
         # sort descending
         return sorted(evidence_stream, key=lambda x: x["priority_score"], reverse=True)
+
+    # ----------------------
+    # Batch variants (whole evidence store at once)
+    # ----------------------
+
+    def check_materiality_batch(self, belief_changes: np.ndarray) -> np.ndarray:
+        """
+        Vectorized check_materiality over an (N evidence x evaluators) matrix.
+        Pad ragged rows with NaN; NaN never counts as material.
+        Returns a boolean mask of length N.
+        """
+        changes = np.asarray(belief_changes)  # float32 matrices are compared in place, not copied
+        material_counts = np.count_nonzero(changes >= self.materiality_threshold, axis=1)
+        return material_counts >= self.materiality_quorum
+
+    def is_high_impact_batch(self, affected_agents: np.ndarray,
+                             irreversible: Union[bool, np.ndarray] = False) -> np.ndarray:
+        """
+        Vectorized is_high_impact; returns a boolean mask.
+        """
+        affected = np.asarray(affected_agents)
+        return (affected >= self.high_impact_agents) | np.asarray(irreversible, dtype=bool)
+
+    def priority_scores(self, irreversibility: np.ndarray, scope: np.ndarray) -> np.ndarray:
+        """
+        Vectorized triage priority (irreversibility * scope).
+        """
+        return np.multiply(irreversibility, scope, dtype=np.float64)
+
+    def top_k(self, scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        Indices of the k highest scores, best first.
+        argpartition selects them in O(N); only those k are then sorted.
+        """
+        scores = np.asarray(scores)
+        k = min(k, scores.size)
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        if k < scores.size:
+            kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+            above = np.flatnonzero(scores > kth)
+            # ties at the cut-off go to the earliest items, as a stable full sort would
+            ties = np.flatnonzero(scores == kth)[:k - above.size]
+            candidates = np.sort(np.concatenate([above, ties]))
+        else:
+            candidates = np.arange(scores.size)
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+    def triage_evidence_batch(self, evidence_stream: List[Dict[str, Any]],
+                              k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        triage_evidence for large streams: scores are computed in one pass and
+        only the top k (default: all) are ranked. Evidence dicts are not mutated.
+        """
+        n = len(evidence_stream)
+        irreversibility = np.fromiter((e.get("irreversibility", 0) for e in evidence_stream), dtype=np.float64, count=n)
+        scope = np.fromiter((e.get("scope", 0) for e in evidence_stream), dtype=np.float64, count=n)
+        order = self.top_k(self.priority_scores(irreversibility, scope), n if k is None else k)
+        return [evidence_stream[i] for i in order]
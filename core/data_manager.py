@@ -2,67 +2,99 @@
 import json
 import os
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional
 
-# Paths
-AUDIT_DIR = "data/audit_trails"
-SNAPSHOT_DIR = "data/logs/verifier_snapshots"
+from .audit_log import AUDIT_DIR, get_audit_log, iter_audit_entries, migrate_legacy_audit_files
+from .snapshot_store import SNAPSHOT_DIR, LazySnapshot, SnapshotStore
 
-# Ensure directories exist
-os.makedirs(AUDIT_DIR, exist_ok=True)
-os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+# Directories are created on first write, not at import
 
-
-def _get_audit_filename() -> str:
-    """Generate today's audit log filename."""
-    date_str = datetime.utcnow().strftime("%Y-%m-%d")
-    return os.path.join(AUDIT_DIR, f"{date_str}_audit.json")
+_snapshot_store: Optional[SnapshotStore] = None
 
 
 def append_audit_log(entry: Dict[str, Any]) -> None:
     """
-    Append a single audit entry to today's audit file.
-    Creates the file if it doesn't exist.
+    Append a single audit entry to today's audit log.
+    Entries are written as one JSON line to the current segment; see core/audit_log.py.
+    """
+    get_audit_log().append(entry)
+
+
+def read_audit_log(date_str: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream a day's audit entries (YYYY-MM-DD, default today) without loading the day into memory.
     """
-    filename = _get_audit_filename()
-    logs = []
-    if os.path.exists(filename):
-        with open(filename, "r", encoding="utf-8") as f:
-            try:
-                logs = json.load(f)
-            except json.JSONDecodeError:
-                logs = []
+    return iter_audit_entries(date_str, audit_dir=AUDIT_DIR)
 
-    logs.append(entry)
 
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(logs, f, indent=2)
+def query_audit_log(evidence_id: Optional[str] = None, start: Optional[Any] = None, end: Optional[Any] = None,
+                    status: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Indexed audit lookup across all days: by evidence id, time range
+    [start, end) (epoch seconds or datetime) and/or status.
+    """
+    return get_audit_log().query(evidence_id, start, end, status, limit)
+
+
+def migrate_audit_logs(remove: bool = False, errors: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+    """
+    Convert legacy `<date>_audit.json` files to the segmented format.
+    Files that cannot be parsed are left in place and listed in `errors`.
+    """
+    return migrate_legacy_audit_files(get_audit_log(), remove=remove, errors=errors)
 
 
-def save_verifier_snapshot(snapshot_name: Optional[str] = None, snapshot_data: Optional[Dict[str, Any]] = None) -> str:
+def get_snapshot_store() -> SnapshotStore:
+    """
+    Process-wide content-addressed store behind the verifier snapshot helpers.
+    """
+    global _snapshot_store
+    if _snapshot_store is None:
+        _snapshot_store = SnapshotStore(SNAPSHOT_DIR)
+    return _snapshot_store
+
+
+def _snapshot_key(snapshot_name: str) -> str:
+    return snapshot_name[:-len(".json")] if snapshot_name.endswith(".json") else snapshot_name
+
+
+def save_verifier_snapshot(snapshot_name: Optional[str] = None, snapshot_data: Optional[Dict[str, Any]] = None,
+                           base: Optional[str] = None, removed: Iterable[str] = ()) -> str:
     """
     Save a verifier snapshot.
     If snapshot_name is None, generate based on UTC timestamp.
+    With `base`, snapshot_data holds only the sections changed since that
+    snapshot (and `removed` the ones dropped); everything else is shared.
     """
     if snapshot_data is None:
         raise ValueError("snapshot_data must be provided")
 
     if snapshot_name is None:
         timestamp_str = datetime.utcnow().strftime("%Y-%m-%d_%H-%M-%S")
-        snapshot_name = f"{timestamp_str}_snapshot.json"
+        snapshot_name = f"{timestamp_str}_snapshot"
+
+    store = get_snapshot_store()
+    if base is not None:
+        return store.save_delta(_snapshot_key(snapshot_name), _snapshot_key(base), snapshot_data, removed)
+    return store.save(_snapshot_key(snapshot_name), snapshot_data)
+
 
-    path = os.path.join(SNAPSHOT_DIR, snapshot_name)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(snapshot_data, f, indent=2)
-    return path
+def open_verifier_snapshot(snapshot_name: str) -> LazySnapshot:
+    """
+    Lazily loaded snapshot: sections are read from disk on first access.
+    """
+    return get_snapshot_store().load(_snapshot_key(snapshot_name))
 
 
-def load_verifier_snapshot(snapshot_name: str) -> Dict[str, Any]:
+def load_verifier_snapshot(snapshot_name: str, sections: Optional[Iterable[str]] = None) -> Dict[str, Any]:
     """
-    Load a verifier snapshot by filename.
+    Load a verifier snapshot (all sections, or only `sections`).
+    Legacy single-file JSON snapshots are still readable.
     """
-    path = os.path.join(SNAPSHOT_DIR, snapshot_name)
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Snapshot {snapshot_name} does not exist")
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    legacy_path = os.path.join(SNAPSHOT_DIR, snapshot_name)
+    if snapshot_name.endswith(".json") and os.path.isfile(legacy_path):
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if sections is None else {s: data[s] for s in sections}
+    snapshot = open_verifier_snapshot(snapshot_name)
+    return snapshot.to_dict() if sections is None else {s: snapshot[s] for s in sections}
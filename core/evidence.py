@@ -0,0 +1,195 @@
+# core/evidence.py
+"""
+Compact evidence records.
+
+Evidence replaces the free-form dicts held by TruthEngine. Known fields
+live in __slots__ (no per-record dict, no repeated key strings), source
+and metadata strings are interned, and large text can be offloaded to an
+append-only TextStore. Records are read-only Mappings, so code written
+against the old dict shape (evidence.get("affected_agents", 0),
+evidence["id"]) keeps working.
+"""
+import os
+import sys
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Optional
+
+FIELDS = ("id", "content", "description", "source", "affected_agents",
+          "irreversibility", "scope", "branch_outputs", "metadata")
+
+# Older producer keys and the field they map to
+ALIASES = {"aggregated_response": "content", "prompt": "description", "text": "content"}
+
+_MISSING = object()
+
+# Identical metadata dicts (e.g. {"source": "feed", "lang": "en"}) share one read-only copy
+_METADATA_CACHE: Dict[tuple, Mapping] = {}
+_METADATA_CACHE_LIMIT = 65_536
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_metadata(metadata: Dict[str, Any]) -> Mapping:
+    items = tuple((_intern(k), _intern(v)) for k, v in metadata.items())
+    try:
+        shared = _METADATA_CACHE.get(items)
+    except TypeError:  # unhashable values: keep a private copy
+        return MappingProxyType(dict(items))
+    if shared is None:
+        shared = MappingProxyType(dict(items))
+        if len(_METADATA_CACHE) < _METADATA_CACHE_LIMIT:
+            _METADATA_CACHE[items] = shared
+    return shared
+
+
+class OffloadedText:
+    """
+    Handle to text kept in a TextStore; resolved when read.
+    """
+    __slots__ = ("store", "offset", "length")
+
+    def __init__(self, store: "TextStore", offset: int, length: int):
+        self.store = store
+        self.offset = offset
+        self.length = length
+
+    def __str__(self) -> str:
+        return self.store.read(self.offset, self.length)
+
+    def __repr__(self) -> str:
+        return f"OffloadedText(offset={self.offset}, length={self.length})"
+
+
+class TextStore:
+    """
+    Append-only file for large evidence text. Texts of at least
+    `threshold` characters are written once and replaced in the record by
+    an OffloadedText handle (offset/length into the file).
+    """
+    def __init__(self, path: str, threshold: int = 1024):
+        self.path = path
+        self.threshold = threshold
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, "a+b")
+        self._lock = threading.Lock()
+
+    def maybe_offload(self, text: Any) -> Any:
+        if type(text) is not str or len(text) < self.threshold:
+            return text
+        data = text.encode("utf-8")
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            self._file.write(data)
+        return OffloadedText(self, offset, len(data))
+
+    def read(self, offset: int, length: int) -> str:
+        with self._lock:
+            self._file.flush()
+            return os.pread(self._file.fileno(), length, offset).decode("utf-8")
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class Evidence(Mapping):
+    """
+    One piece of evidence. Unset fields are None and behave as missing
+    keys; keys outside FIELDS are kept in `extra`. metadata is a read-only
+    mapping, shared between records with identical metadata.
+    """
+    __slots__ = FIELDS + ("extra",)
+
+    def __init__(self, id: Optional[str] = None, content: Any = None, description: Any = None,
+                 source: Optional[str] = None, affected_agents: Optional[int] = None,
+                 irreversibility: Optional[float] = None, scope: Optional[float] = None,
+                 branch_outputs: Optional[list] = None, metadata: Optional[Dict[str, Any]] = None,
+                 extra: Optional[Dict[str, Any]] = None):
+        self.id = id
+        self.content = content
+        self.description = description
+        self.source = _intern(source)
+        self.affected_agents = affected_agents
+        self.irreversibility = irreversibility
+        self.scope = scope
+        self.branch_outputs = branch_outputs
+        self.metadata = _intern_metadata(metadata) if metadata else None
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data: Mapping, evidence_id: Optional[str] = None,
+                  text_store: Optional[TextStore] = None) -> "Evidence":
+        """
+        Convert any of the existing producer dict shapes (ingest JSONL, UI,
+        agents' generate_evidence, Aggregator.evaluate)
+        """
+        if isinstance(data, Evidence) and text_store is None:
+            return data
+        fields: Dict[str, Any] = {}
+        extra = None
+        for key, value in data.items():
+            name = key if key in FIELDS else ALIASES.get(key)
+            if name is not None and name not in fields:
+                fields[name] = value
+            else:
+                if extra is None:
+                    extra = {}
+                extra[_intern(key)] = value
+        if evidence_id is not None and fields.get("id") is None:
+            fields["id"] = evidence_id
+        if text_store is not None and "content" in fields:
+            fields["content"] = text_store.maybe_offload(fields["content"])
+        return cls(extra=extra, **fields)
+
+    # ----------------------
+    # Mapping interface
+    # ----------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in FIELDS:
+            value = getattr(self, key)
+            if value is None:
+                return default
+            return str(value) if type(value) is OffloadedText else value
+        if self.extra is not None:
+            return self.extra.get(key, default)
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        for name in FIELDS:
+            if getattr(self, name) is not None:
+                yield name
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self[key] for key in self}
+
+    def __reduce__(self):
+        # Pickled as a plain dict: offloaded text is resolved and the shared
+        # read-only metadata is re-interned on the receiving side
+        data = self.to_dict()
+        if self.metadata is not None:
+            data["metadata"] = dict(self.metadata)
+        return Evidence.from_dict, (data,)
+
+    def __repr__(self) -> str:
+        return f"Evidence({self.to_dict()!r})"
@@ -0,0 +1,159 @@
+# core/ingest.py
+import json
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, TextIO
+
+from .triage import Triage
+
+_DONE = object()
+
+
+def iter_jsonl(stream: TextIO, errors: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield evidence dicts from a JSONL stream, one line at a time.
+    Blank lines are ignored; malformed lines are counted in errors["parse_errors"].
+    """
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            evidence = json.loads(line)
+        except json.JSONDecodeError:
+            if errors is not None:
+                errors["parse_errors"] = errors.get("parse_errors", 0) + 1
+            continue
+        if isinstance(evidence, dict):
+            yield evidence
+        elif errors is not None:
+            errors["parse_errors"] = errors.get("parse_errors", 0) + 1
+
+
+def default_disseminate(truth_engine, evidence_id: str, evidence: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    High-impact evidence is held for oracle/human approval; the rest is released.
+    """
+    if evidence.get("affected_agents", 0) >= truth_engine.high_impact_threshold:
+        return {"evidence_id": evidence_id, "status": "approval_required"}
+    return {"evidence_id": evidence_id, "status": "disseminated"}
+
+
+class IngestPipeline:
+    """
+    Non-interactive evidence ingestion as three pipelined stages:
+
+        read/parse  ->  store + triage  ->  disseminate
+
+    Stages run in their own threads joined by bounded queues, so a slow
+    stage blocks the one before it (backpressure) instead of letting
+    memory grow. Evidence goes through TruthEngine.add_evidence, is queued
+    in Triage and leaves it in prioritized batches of triage.max_concurrent.
+    """
+    def __init__(self, truth_engine, triage: Optional[Triage] = None,
+                 disseminate: Optional[Callable[[str, Dict[str, Any]], Dict[str, Any]]] = None,
+                 queue_size: int = 1024, triage_backlog: int = 256,
+                 on_result: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.truth_engine = truth_engine
+        self.triage = triage or Triage(max_concurrent=64)
+        self.disseminate = disseminate or (lambda eid, ev: default_disseminate(truth_engine, eid, ev))
+        self.queue_size = queue_size
+        self.triage_backlog = triage_backlog  # items held in Triage before a batch is released
+        self.on_result = on_result
+        self.stats: Dict[str, Any] = {}
+
+    def run(self, evidence: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Push every item of `evidence` through the pipeline; returns throughput stats.
+        """
+        raw: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        batches: "queue.Queue" = queue.Queue(maxsize=max(1, self.queue_size // self.triage.max_concurrent))
+        stop = threading.Event()
+        failures = []
+        self.stats = {"read": 0, "stored": 0, "rejected": 0, "disseminated": 0, "statuses": {}}
+
+        def guarded(stage):
+            def runner():
+                try:
+                    stage()
+                except BaseException as e:
+                    failures.append(e)
+                    stop.set()
+            return runner
+
+        def put(q, item):
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(q):
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _DONE
+
+        def read_stage():
+            for item in evidence:
+                if not put(raw, item):
+                    return
+                self.stats["read"] += 1
+            put(raw, _DONE)
+
+        def store_stage():
+            counter = 0
+            while True:
+                item = get(raw)
+                if item is _DONE:
+                    break
+                counter += 1
+                evidence_id = item.get("id") or f"evidence_{counter:06d}"
+                record = self.truth_engine.add_evidence(evidence_id, item)
+                if record is None:  # stored asynchronously (ShardedTruthEngine)
+                    record = dict(item, id=evidence_id)
+                self.stats["stored"] += 1
+                # triage and dissemination see the stored record, not the raw input
+                if self.triage.add_to_queue(record) is None:
+                    self.stats["rejected"] += 1
+                while len(self.triage) >= self.triage_backlog:
+                    if not put(batches, self.triage.next_batch()):
+                        return
+            while len(self.triage):
+                if not put(batches, self.triage.next_batch()):
+                    return
+            put(batches, _DONE)
+
+        def disseminate_stage():
+            statuses = self.stats["statuses"]
+            while True:
+                batch = get(batches)
+                if batch is _DONE:
+                    break
+                for evidence_id, item in batch:
+                    result = self.disseminate(evidence_id, item)
+                    status = result.get("status", "unknown")
+                    statuses[status] = statuses.get(status, 0) + 1
+                    self.stats["disseminated"] += 1
+                    if self.on_result is not None:
+                        self.on_result(result)
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=guarded(stage), name=f"ingest-{stage.__name__}", daemon=True)
+                   for stage in (read_stage, store_stage, disseminate_stage)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+        if failures:
+            raise failures[0]
+
+        self.stats["elapsed_s"] = elapsed
+        self.stats["items_per_sec"] = self.stats["stored"] / elapsed if elapsed > 0 else 0.0
+        return self.stats
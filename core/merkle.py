@@ -0,0 +1,487 @@
+# core/merkle.py
+import hashlib
+import hmac
+import io
+import os
+import struct
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence
+
+from .canonical import DEFAULT_BATCH, decode, encode, hash_many
+
+HASH_SIZE = 32
+OFFSET = struct.Struct("<Q")
+LENGTH = struct.Struct("<I")
+EMPTY_ROOT = hashlib.sha256(b"").hexdigest()
+
+
+# ----------------------
+# Hashing (RFC 6962 domain separation)
+# ----------------------
+
+def leaf_hash(payload: bytes) -> bytes:
+    return hashlib.sha256(b"\x00" + payload).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def leaf_hashes(payloads: Sequence[bytes], executor: Optional[Executor] = None,
+                batch_size: int = DEFAULT_BATCH) -> List[bytes]:
+    """
+    leaf_hash() of many payloads, batched across a pool (see canonical.hash_many).
+    """
+    return hash_many(payloads, b"\x00", executor, batch_size)
+
+
+def _largest_power_of_two_below(n: int) -> int:
+    return 1 << ((n - 1).bit_length() - 1)
+
+
+def verify_inclusion(leaf: str, index: int, tree_size: int, proof: List[str], root: str) -> bool:
+    """
+    Check an inclusion proof (RFC 9162, 2.1.3.2). All hashes are hex strings.
+    """
+    if index >= tree_size:
+        return False
+    fn, sn = index, tree_size - 1
+    r = bytes.fromhex(leaf)
+    for p in proof:
+        p = bytes.fromhex(p)
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = node_hash(p, r)
+            if not fn & 1:
+                while fn and not fn & 1:
+                    fn >>= 1
+                    sn >>= 1
+        else:
+            r = node_hash(r, p)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and r.hex() == root
+
+
+def verify_consistency(old_size: int, new_size: int, old_root: str, new_root: str, proof: List[str]) -> bool:
+    """
+    Check that the tree of new_size extends the tree of old_size (RFC 9162, 2.1.4.2).
+    """
+    if old_size == new_size:
+        return old_root == new_root and not proof
+    if old_size == 0:
+        return not proof
+    if old_size > new_size or not proof:
+        return False
+    path = [bytes.fromhex(p) for p in proof]
+    if old_size & (old_size - 1) == 0:
+        path.insert(0, bytes.fromhex(old_root))
+    fn, sn = old_size - 1, new_size - 1
+    while fn & 1:
+        fn >>= 1
+        sn >>= 1
+    fr = sr = path[0]
+    for c in path[1:]:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            fr = node_hash(c, fr)
+            sr = node_hash(c, sr)
+            if not fn & 1:
+                while fn and not fn & 1:
+                    fn >>= 1
+                    sn >>= 1
+        else:
+            sr = node_hash(sr, c)
+        fn >>= 1
+        sn >>= 1
+    return fr.hex() == old_root and sr.hex() == new_root and sn == 0
+
+
+class TamperEvidentLog:
+    """
+    Append-only Merkle tree log for audit purposes.
+
+    Every complete, aligned subtree hash is appended to a per-level file as
+    soon as it exists, so any inclusion or consistency proof needs only
+    O(log n) fixed-offset reads. Only the frontier (one pending node per
+    level) lives in memory. With storage_dir=None the same files are kept in
+    memory buffers instead of on disk.
+
+    Entries are stored in their canonical binary encoding (core.canonical),
+    length-prefixed, and the leaf hash covers exactly those bytes, so any
+    process can recompute it.
+
+    A signed root checkpoint (HMAC-SHA256 over the canonical encoding of
+    size, root and timestamp) is written every `checkpoint_every` entries
+    and on close(), framed the same way as entries.
+    """
+    def __init__(self, storage_dir: Optional[str] = None, checkpoint_every: int = 1000,
+                 signing_key: Optional[bytes] = None):
+        self.storage_dir = storage_dir
+        self.checkpoint_every = checkpoint_every
+        if signing_key is None and os.getenv("TRUTHAI_LOG_SIGNING_KEY"):
+            signing_key = os.environ["TRUTHAI_LOG_SIGNING_KEY"].encode()
+        self.signing_key = signing_key
+        self._lock = threading.RLock()
+        self._files: Dict[str, BinaryIO] = {}
+        self._frontier: List[Optional[bytes]] = []
+        self.size = self._recover()
+
+    # ----------------------
+    # Appending
+    # ----------------------
+
+    def append(self, data: Dict[str, Any]) -> str:
+        """
+        Append an entry and return the new root hash.
+        """
+        record = {"data": data, "timestamp": time.time()}
+        payload = encode(record)
+        framed = LENGTH.pack(len(payload)) + payload
+        with self._lock:
+            n = self.size
+            entries = self._file("entries")
+            entries.seek(0, io.SEEK_END)
+            self._write("offsets", OFFSET.pack(entries.tell()))
+            self._write("entries", framed)
+
+            carry = leaf_hash(payload)
+            self._write_node(0, carry)
+            level = 0
+            while (n >> level) & 1:
+                carry = node_hash(self._frontier[level], carry)
+                self._frontier[level] = None
+                level += 1
+                self._write_node(level, carry)
+            if level == len(self._frontier):
+                self._frontier.append(None)
+            self._frontier[level] = carry
+            self.size = n + 1
+
+            if self.checkpoint_every and self.size % self.checkpoint_every == 0:
+                self.checkpoint()
+            return self.root()
+
+    def root(self) -> str:
+        """
+        Current Merkle root (hex).
+        """
+        with self._lock:
+            acc = None
+            for level, node in enumerate(self._frontier):
+                if node is not None and (self.size >> level) & 1:
+                    acc = node if acc is None else node_hash(node, acc)
+            return acc.hex() if acc is not None else EMPTY_ROOT
+
+    def last_hash(self) -> str:
+        return self.root()
+
+    def __len__(self) -> int:
+        return self.size
+
+    # ----------------------
+    # Reading entries
+    # ----------------------
+
+    def get_entry(self, index: int) -> Dict[str, Any]:
+        """
+        Entry at index, with its leaf hash.
+        """
+        with self._lock:
+            payload = self._read_payload(index)
+            record = decode(payload)
+            record["index"] = index
+            record["hash"] = self._read_node(0, index).hex()
+            return record
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        for index in range(self.size):
+            yield self.get_entry(index)
+
+    @property
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        All entries, materialised from storage. Prefer iter_entries() on large logs.
+        """
+        return list(self.iter_entries())
+
+    # ----------------------
+    # Proofs
+    # ----------------------
+
+    def inclusion_proof(self, index: int, tree_size: Optional[int] = None) -> List[str]:
+        with self._lock:
+            tree_size = self.size if tree_size is None else tree_size
+            if not 0 <= index < tree_size <= self.size:
+                raise IndexError(f"Leaf {index} not in tree of size {tree_size}")
+            return [h.hex() for h in self._path(index, 0, tree_size)]
+
+    def consistency_proof(self, old_size: int, new_size: Optional[int] = None) -> List[str]:
+        with self._lock:
+            new_size = self.size if new_size is None else new_size
+            if not 0 <= old_size <= new_size <= self.size:
+                raise ValueError(f"Invalid sizes {old_size} -> {new_size} (log has {self.size})")
+            if old_size in (0, new_size):
+                return []
+            return [h.hex() for h in self._subproof(old_size, 0, new_size, True)]
+
+    def root_at(self, tree_size: int) -> str:
+        with self._lock:
+            if not 0 <= tree_size <= self.size:
+                raise ValueError(f"Log has only {self.size} entries")
+            return self._subtree_hash(0, tree_size).hex() if tree_size else EMPTY_ROOT
+
+    def verify_entry(self, index: int) -> bool:
+        """
+        Recompute the entry's leaf hash from its stored payload and check its
+        inclusion proof against the current root.
+        """
+        with self._lock:
+            leaf = leaf_hash(self._read_payload(index))
+            if leaf != self._read_node(0, index):
+                return False
+            return verify_inclusion(leaf.hex(), index, self.size, self.inclusion_proof(index), self.root())
+
+    def verify_all(self, executor: Optional[Executor] = None, batch_size: int = DEFAULT_BATCH,
+                   block_entries: int = 65_536) -> Dict[str, Any]:
+        """
+        Bulk verification: recompute every leaf hash from its stored payload
+        and the root from those leaves. Payloads are read in blocks and
+        hashed with leaf_hashes() (pass a ProcessPoolExecutor to spread small
+        entries over all cores). Returns the indices whose payload no longer
+        matches its stored leaf and whether the recomputed root matches.
+        """
+        with self._lock:
+            size, root = self.size, self.root()
+        tampered: List[int] = []
+        frontier: List[Optional[bytes]] = []
+        for start in range(0, size, block_entries):
+            end = min(start + block_entries, size)
+            with self._lock:
+                payloads = self._read_payload_range(start, end)
+                leaves = self._file("level_00")
+                leaves.seek(start * HASH_SIZE)
+                stored = leaves.read((end - start) * HASH_SIZE)
+            for offset, leaf in enumerate(leaf_hashes(payloads, executor, batch_size)):
+                n = start + offset
+                if leaf != stored[offset * HASH_SIZE:(offset + 1) * HASH_SIZE]:
+                    tampered.append(n)
+                level = 0
+                while (n >> level) & 1:
+                    leaf = node_hash(frontier[level], leaf)
+                    level += 1
+                if level == len(frontier):
+                    frontier.append(None)
+                frontier[level] = leaf
+
+        acc = None
+        for level, node in enumerate(frontier):
+            if (size >> level) & 1:
+                acc = node if acc is None else node_hash(node, acc)
+        computed = acc.hex() if acc is not None else EMPTY_ROOT
+        return {"entries": size, "tampered": tampered, "root": computed,
+                "valid": not tampered and computed == root}
+
+    # ----------------------
+    # Checkpoints
+    # ----------------------
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """
+        Flush storage and record a (signed) root for the current size.
+        """
+        with self._lock:
+            cp = {"tree_size": self.size, "root": self.root(), "timestamp": time.time()}
+            cp["signature"] = self._sign(cp)
+            payload = encode(cp)
+            self._write("checkpoints", LENGTH.pack(len(payload)) + payload)
+            self._sync()
+            return cp
+
+    def latest_checkpoint(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            f = self._file("checkpoints")
+            f.seek(0)
+            data = f.read()
+            latest, pos = None, 0
+            while pos + LENGTH.size <= len(data):
+                (length,) = LENGTH.unpack_from(data, pos)
+                end = pos + LENGTH.size + length
+                if end > len(data):  # torn write
+                    break
+                latest, pos = data[pos + LENGTH.size:end], end
+            return decode(latest) if latest is not None else None
+
+    def verify_checkpoint(self, cp: Dict[str, Any]) -> bool:
+        """
+        True if the checkpoint's signature is valid and the current tree extends it.
+        """
+        unsigned = {k: cp[k] for k in ("tree_size", "root", "timestamp")}
+        if self.signing_key is not None and not hmac.compare_digest(cp.get("signature") or "", self._sign(unsigned)):
+            return False
+        with self._lock:
+            if cp["tree_size"] > self.size:
+                return False
+            proof = self.consistency_proof(cp["tree_size"])
+            return verify_consistency(cp["tree_size"], self.size, cp["root"], self.root(), proof)
+
+    def close(self):
+        with self._lock:
+            if self.size:
+                self.checkpoint()
+            for f in self._files.values():
+                f.close()
+            self._files.clear()
+
+    # ----------------------
+    # Tree internals
+    # ----------------------
+
+    def _subtree_hash(self, start: int, end: int) -> bytes:
+        """
+        MTH(D[start:end]) for a range whose start is aligned to its largest
+        power-of-two block, folded from the stored complete subtrees.
+        """
+        blocks = []
+        pos = start
+        remaining = end - start
+        while remaining:
+            level = remaining.bit_length() - 1
+            blocks.append(self._read_node(level, pos >> level))
+            pos += 1 << level
+            remaining -= 1 << level
+        acc = blocks[-1]
+        for block in reversed(blocks[:-1]):
+            acc = node_hash(block, acc)
+        return acc
+
+    def _path(self, index: int, start: int, end: int) -> List[bytes]:
+        n = end - start
+        if n == 1:
+            return []
+        k = _largest_power_of_two_below(n)
+        if index < k:
+            return self._path(index, start, start + k) + [self._subtree_hash(start + k, end)]
+        return self._path(index - k, start + k, end) + [self._subtree_hash(start, start + k)]
+
+    def _subproof(self, m: int, start: int, end: int, complete: bool) -> List[bytes]:
+        n = end - start
+        if m == n:
+            return [] if complete else [self._subtree_hash(start, end)]
+        k = _largest_power_of_two_below(n)
+        if m <= k:
+            return self._subproof(m, start, start + k, complete) + [self._subtree_hash(start + k, end)]
+        return self._subproof(m - k, start + k, end, False) + [self._subtree_hash(start, start + k)]
+
+    # ----------------------
+    # Storage
+    # ----------------------
+
+    def _file(self, name: str) -> BinaryIO:
+        f = self._files.get(name)
+        if f is None:
+            if self.storage_dir is None:
+                f = io.BytesIO()
+            else:
+                os.makedirs(self.storage_dir, exist_ok=True)
+                f = open(os.path.join(self.storage_dir, name + ".bin"), "a+b")
+            self._files[name] = f
+        return f
+
+    def _write(self, name: str, data: bytes):
+        f = self._file(name)
+        f.seek(0, io.SEEK_END)
+        f.write(data)
+
+    def _write_node(self, level: int, node: bytes):
+        self._write(f"level_{level:02d}", node)
+
+    def _read_node(self, level: int, index: int) -> bytes:
+        f = self._file(f"level_{level:02d}")
+        f.seek(index * HASH_SIZE)
+        return f.read(HASH_SIZE)
+
+    def _read_payload(self, index: int) -> bytes:
+        if not 0 <= index < self.size:
+            raise IndexError(f"Entry {index} out of range (log has {self.size})")
+        return self._read_payload_unchecked(index)
+
+    def _read_payload_unchecked(self, index: int) -> bytes:
+        offsets = self._file("offsets")
+        offsets.seek(index * OFFSET.size)
+        start = OFFSET.unpack(offsets.read(OFFSET.size))[0]
+        entries = self._file("entries")
+        entries.seek(start)
+        (length,) = LENGTH.unpack(entries.read(LENGTH.size))
+        return entries.read(length)
+
+    def _read_payload_range(self, start: int, end: int) -> List[bytes]:
+        """
+        Payloads of entries [start, end) from one contiguous read.
+        """
+        offsets = self._file("offsets")
+        offsets.seek(start * OFFSET.size)
+        raw = offsets.read((end - start) * OFFSET.size)
+        starts = [o for (o,) in OFFSET.iter_unpack(raw)]
+        entries = self._file("entries")
+        if not starts:
+            return []
+        base = starts[0]
+        entries.seek(base)
+        if end < self.size:
+            offsets.seek(end * OFFSET.size)
+            buf = entries.read(OFFSET.unpack(offsets.read(OFFSET.size))[0] - base)
+        else:
+            buf = entries.read()
+        payloads = []
+        for o in starts:
+            pos = o - base
+            (length,) = LENGTH.unpack_from(buf, pos)
+            payloads.append(buf[pos + LENGTH.size:pos + LENGTH.size + length])
+        return payloads
+
+    def _sync(self):
+        for f in self._files.values():
+            f.flush()
+            if self.storage_dir is not None:
+                os.fsync(f.fileno())
+
+    def _sign(self, cp: Dict[str, Any]) -> Optional[str]:
+        if self.signing_key is None:
+            return None
+        message = encode({k: cp[k] for k in ("tree_size", "root", "timestamp")})
+        return hmac.new(self.signing_key, message, hashlib.sha256).hexdigest()
+
+    def _recover(self) -> int:
+        """
+        Reopen an on-disk log: size comes from the leaf level, anything a torn
+        append left past it is truncated, and the frontier is read back.
+        """
+        if self.storage_dir is None or not os.path.isdir(self.storage_dir):
+            return 0
+        leaves = self._file("level_00")
+        leaves.seek(0, io.SEEK_END)
+        size = leaves.tell() // HASH_SIZE
+        offsets = self._file("offsets")
+        offsets.seek(0, io.SEEK_END)
+        size = min(size, offsets.tell() // OFFSET.size)
+
+        offsets.truncate(size * OFFSET.size)
+        if size:
+            end_of_last = len(self._read_payload_unchecked(size - 1)) + LENGTH.size
+            offsets.seek((size - 1) * OFFSET.size)
+            self._file("entries").truncate(OFFSET.unpack(offsets.read(OFFSET.size))[0] + end_of_last)
+        else:
+            self._file("entries").truncate(0)
+        for level in range(max(size, 1).bit_length()):
+            self._file(f"level_{level:02d}").truncate((size >> level) * HASH_SIZE)
+
+        self._frontier = [None] * max(size, 1).bit_length()
+        for level in range(len(self._frontier)):
+            if (size >> level) & 1:
+                self._frontier[level] = self._read_node(level, (size >> level) - 1)
+        return size
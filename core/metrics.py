@@ -0,0 +1,237 @@
+# core/metrics.py
+"""
+Lightweight pipeline instrumentation: counters and fixed-bucket latency
+histograms, exported as a dict or in Prometheus text format.
+
+Collection is off unless enable() is called or TRUTHAI_METRICS=1 is set;
+while disabled an instrumented call costs one flag check.
+"""
+import bisect
+import functools
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+STAGE_SECONDS = "truthai_stage_seconds"
+STAGE_ERRORS = "truthai_stage_errors_total"
+
+_enabled = os.getenv("TRUTHAI_METRICS", "") not in ("", "0", "false")
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    return tuple(sorted((labels or {}).items()))
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram; bucket counts are stored per bucket and made
+    cumulative only on export.
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative, running = {}, 0
+        for bound, c in zip(self.buckets + (float("inf"),), counts):
+            running += c
+            cumulative["+Inf" if bound == float("inf") else repr(bound)] = running
+        return {"buckets": cumulative, "sum": total, "count": count}
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class MetricsRegistry:
+    """
+    Metric families by name, each holding one Counter/Histogram per label set.
+    """
+    def __init__(self):
+        self._families: Dict[str, Tuple[str, str, Dict[LabelKey, Any]]] = {}  # name -> (type, help, series)
+        self._lock = threading.Lock()
+
+    def _series(self, name: str, kind: str, help_text: str, labels, factory):
+        key = _label_key(labels)
+        family = self._families.get(name)
+        if family is None or key not in family[2]:
+            with self._lock:
+                family = self._families.setdefault(name, (kind, help_text, {}))
+                family[2].setdefault(key, factory())
+        return family[2][key]
+
+    def histogram(self, name: str, labels: Optional[Dict[str, str]] = None, help_text: str = "",
+                  buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._series(name, "histogram", help_text, labels, lambda: Histogram(buckets))
+
+    def counter(self, name: str, labels: Optional[Dict[str, str]] = None, help_text: str = "") -> Counter:
+        return self._series(name, "counter", help_text, labels, Counter)
+
+    def reset(self):
+        with self._lock:
+            self._families.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        {family: {"type": ..., "series": [{"labels": {...}, ...values}]}}
+        """
+        with self._lock:
+            families = {name: (kind, dict(series)) for name, (kind, _, series) in self._families.items()}
+        out = {}
+        for name, (kind, series) in families.items():
+            rows = []
+            for key, metric in series.items():
+                row = {"labels": dict(key)}
+                row.update(metric.snapshot() if kind == "histogram" else {"value": metric.value})
+                rows.append(row)
+            out[name] = {"type": kind, "series": rows}
+        return out
+
+    def to_prometheus(self) -> str:
+        with self._lock:
+            helps = {name: help_text for name, (_, help_text, _) in self._families.items()}
+        lines = []
+        for name, family in self.snapshot().items():
+            if helps.get(name):
+                lines.append(f"# HELP {name} {helps[name]}")
+            lines.append(f"# TYPE {name} {family['type']}")
+            for row in family["series"]:
+                labels = row["labels"]
+                if family["type"] == "counter":
+                    lines.append(f"{name}{_format_labels(labels)} {row['value']}")
+                    continue
+                for bound, count in row["buckets"].items():
+                    lines.append(f"{name}_bucket{_format_labels(dict(labels, le=bound))} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {row['sum']}")
+                lines.append(f"{name}_count{_format_labels(labels)} {row['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = (f'{k}="{_escape(v)}"' for k, v in sorted(labels.items()))
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+REGISTRY = MetricsRegistry()
+
+
+def observe_stage(stage: str, seconds: float, **labels):
+    if _enabled:
+        REGISTRY.histogram(STAGE_SECONDS, dict(labels, stage=stage),
+                           "Wall-clock time spent per pipeline stage").observe(seconds)
+
+
+def increment(name: str, amount: float = 1.0, help_text: str = "", **labels):
+    if _enabled:
+        REGISTRY.counter(name, labels, help_text).inc(amount)
+
+
+def timed(stage: str) -> Callable:
+    """
+    Decorator recording the call's duration (and failures) under `stage`.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                REGISTRY.counter(STAGE_ERRORS, {"stage": stage}, "Calls that raised, per stage").inc()
+                raise
+            finally:
+                observe_stage(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def get_metrics() -> Dict[str, Any]:
+    return REGISTRY.snapshot()
+
+
+def export_prometheus() -> str:
+    return REGISTRY.to_prometheus()
+
+
+def write_prometheus(path: str) -> str:
+    """
+    Atomically write the current metrics in Prometheus text format (e.g. for
+    the node_exporter textfile collector).
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(export_prometheus())
+    os.replace(tmp_path, path)
+    return path
+
+
+def serve_metrics(port: int = 9464, host: str = "127.0.0.1"):
+    """
+    Serve /metrics from a daemon thread; call .shutdown() on the result to stop.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = export_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
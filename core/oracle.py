@@ -1,43 +1,140 @@
-import hashlib
-import json
-import time
-from typing import Any, Dict, List
-from .verification import MultiAgentVerification, VerifierAgent
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Union
+from .merkle import TamperEvidentLog
+from .metrics import timed
 
-class TamperEvidentLog:
+if TYPE_CHECKING:  # numpy-backed; only needed by callers that construct a verifier
+    from .verification import MultiAgentVerification
+
+
+class PendingApprovalStore:
     """
-    Simple append-only Merkle-like log for audit purposes
+    Questions awaiting human approval, indexed by request id.
+
+    Enqueue and removal are O(1) under a short lock, so new items can
+    arrive while a (bulk) decision is being processed; answers for
+    approved items are generated outside the lock, concurrently, and each
+    distinct question is answered once per batch. If answering fails, the
+    batch's items are put back and stay pending.
     """
-    def __init__(self):
-        self.entries: List[Dict[str, Any]] = []
+    def __init__(self, max_workers: int = 8):
+        self._items: Dict[str, Dict[str, Any]] = {}  # insertion-ordered
+        self._lock = threading.Lock()
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, request_id: str) -> bool:
+        return request_id in self._items
+
+    def add(self, item: Dict[str, Any]) -> str:
+        request_id = uuid.uuid4().hex
+        with self._lock:
+            self._items[request_id] = dict(item, request_id=request_id)
+        return request_id
+
+    def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        return self._items.get(request_id)
+
+    def items(self) -> List[Dict[str, Any]]:
+        """Pending items, oldest first"""
+        with self._lock:
+            return list(self._items.values())
+
+    def ids(self, limit: Optional[int] = None) -> List[str]:
+        with self._lock:
+            if limit is None:
+                return list(self._items)
+            return [rid for rid, _ in zip(self._items, range(limit))]
+
+    def take(self, request_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Atomically remove the given ids; unknown or already decided ids map to None"""
+        with self._lock:
+            return {rid: self._items.pop(rid, None) for rid in request_ids}
+
+    def restore(self, items: Dict[str, Optional[Dict[str, Any]]]):
+        """Put taken items back, ahead of anything that arrived since"""
+        with self._lock:
+            self._items = {**{rid: item for rid, item in items.items() if item is not None}, **self._items}
 
-    def append(self, data: Dict[str, Any]):
-        previous_hash = self.entries[-1]['hash'] if self.entries else "0"*64
-        serialized = json.dumps(data, sort_keys=True).encode()
-        entry_hash = hashlib.sha256(previous_hash.encode() + serialized).hexdigest()
-        self.entries.append({"data": data, "hash": entry_hash, "timestamp": time.time()})
-        return entry_hash
+    def decide(self, decisions: Dict[str, bool], generate: Callable[[str], str]) -> List[Dict[str, Any]]:
+        """
+        Apply {request_id: approved} decisions; approved questions are
+        answered with generate(question). Results follow `decisions` order.
+        """
+        taken = self.take(decisions)  # taken first so concurrent deciders never answer an item twice
+        questions = {item["question"] for rid, item in taken.items() if item is not None and decisions[rid]}
+        try:
+            answers = self._answer_all(questions, generate)
+        except BaseException:
+            self.restore(taken)
+            raise
+
+        results = []
+        for rid, item in taken.items():
+            if item is None:
+                results.append({"request_id": rid, "question": None, "answer": None,
+                                "approved": False, "status": "not_found"})
+            elif decisions[rid]:
+                results.append({"request_id": rid, "question": item["question"],
+                                "answer": answers[item["question"]], "approved": True, "status": "approved"})
+            else:
+                results.append({"request_id": rid, "question": item["question"], "answer": None,
+                                "approved": False, "status": "rejected"})
+        return results
+
+    def _answer_all(self, questions: set, generate: Callable[[str], str]) -> Dict[str, str]:
+        if len(questions) <= 1 or self.max_workers <= 1:
+            return {q: generate(q) for q in questions}
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="approval")
+            executor = self._executor
+        # a few chunks per worker: balances uneven answer times without a future per item
+        ordered = list(questions)
+        size = -(-len(ordered) // (self.max_workers * 4))
+        chunks = [ordered[i:i + size] for i in range(0, len(ordered), size)]
+        answers = {}
+        for chunk, chunk_answers in zip(chunks, executor.map(lambda c: [generate(q) for q in c], chunks)):
+            answers.update(zip(chunk, chunk_answers))
+        return answers
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
 
-    def last_hash(self) -> str:
-        return self.entries[-1]['hash'] if self.entries else "0"*64
 
 class OracleSandbox:
     """
     Enforces human-gated outputs and oracle-mode behavior
     """
-    def __init__(self, verifier: MultiAgentVerification, read_only=True):
+    def __init__(self, verifier: Optional["MultiAgentVerification"] = None, read_only=True, log_dir: str = None):
         self.verifier = verifier
         self.read_only = read_only  # True = v10 pure oracle; False = hybrid v9.1
-        self.log = TamperEvidentLog()
-        self.human_approval_queue: List[Dict[str, Any]] = []
+        self.log = TamperEvidentLog(storage_dir=log_dir)  # log_dir=None keeps the log in memory
+        self.pending = PendingApprovalStore()
 
+    @property
+    def human_approval_queue(self) -> List[Dict[str, Any]]:
+        """
+        Pending approvals, oldest first; each item carries its request_id
+        """
+        return self.pending.items()
+
+    @timed("oracle_query")
     def query(self, question: str, evidence: Dict[str, Any] = None, high_impact=False) -> Dict[str, Any]:
         """
         Process a query under oracle + verification rules
         """
         # Step 1: Evaluate evidence if provided
         eval_result = None
-        if evidence:
+        if evidence and self.verifier is not None:
             eval_result = self.verifier.evaluate_evidence(evidence, high_impact=high_impact)
 
         # Step 2: Check read-only / hybrid mode
@@ -49,13 +146,14 @@ class OracleSandbox:
 
         # Step 3: Human-gated approval fallback
         if not output_allowed or (eval_result and eval_result.get("conservative_mode")):
-            self.human_approval_queue.append({
+            request_id = self.pending.add({
                 "question": question,
                 "evidence": evidence,
                 "eval": eval_result
             })
             response = {
                 "status": "awaiting_human_approval",
+                "request_id": request_id,
                 "eval": eval_result
             }
         else:
@@ -82,41 +180,65 @@ class OracleSandbox:
         """
         return f"[ORACLE RESPONSE] {question}"
 
-    def approve_human_queue(self, approvals: List[bool]):
+    def approve_human_queue(self, approvals: Union[Dict[str, bool], List[bool]]):
         """
-        Humans approve pending questions in the queue
+        Humans approve or reject pending questions by request id
+        ({request_id: approved}). A plain list of booleans is still accepted
+        and applies to the oldest pending items in order.
         """
-        results = []
-        for i, approval in enumerate(approvals):
-            if i >= len(self.human_approval_queue):
-                break
-            item = self.human_approval_queue[i]
-            if approval:
-                # generate answer
-                answer = self._generate_answer(item['question'])
-                result = {"question": item['question'], "answer": answer, "approved": True}
-            else:
-                result = {"question": item['question'], "answer": None, "approved": False}
-            results.append(result)
-        # remove approved items from queue
-        self.human_approval_queue = self.human_approval_queue[len(approvals):]
+        if not isinstance(approvals, dict):
+            approvals = dict(zip(self.pending.ids(limit=len(approvals)), approvals))
+        results = self.pending.decide(approvals, self._generate_answer)
+        self.log.append({
+            "human_decisions": {r["request_id"]: r["status"] for r in results}
+        })
         return results
 
+    def approve(self, request_ids: Iterable[str]):
+        return self.approve_human_queue(dict.fromkeys(request_ids, True))
+
+    def reject(self, request_ids: Iterable[str]):
+        return self.approve_human_queue(dict.fromkeys(request_ids, False))
+
+    def approve_all(self):
+        """
+        Approve everything pending at the time of the call
+        """
+        return self.approve(self.pending.ids())
+
     def get_audit_log(self) -> List[Dict[str, Any]]:
         return self.log.entries
-# core/oracle.py
-from typing import Dict, Any
-import openai
 
-class OracleSandbox:
+    def close(self):
+        """
+        Stop the approval workers and checkpoint the log.
+        """
+        self.pending.close()
+        self.log.close()
+
+
+from .rate_limiter import PRIORITY_ORACLE, ModelCallScheduler, get_scheduler
+from .response_cache import ResponseCache
+from .single_flight import SingleFlight, get_single_flight
+
+
+class OpenAIOracle:
     """
     Minimal stub for emergency approval and high-impact queries.
     Simulates human/AI oracle responses for TruthEngine.
     """
 
-    def __init__(self, model: str = "gpt-4"):
+    def __init__(self, model: str = "gpt-4", cache: Optional[ResponseCache] = None,
+                 scheduler: Optional[ModelCallScheduler] = None,
+                 completion_fn: Optional[Callable[..., Any]] = None,
+                 single_flight: Optional[SingleFlight] = None):
         self.model = model
+        self.cache = cache  # optional ResponseCache; identical evidence skips the API
+        self.scheduler = scheduler  # None = the process-wide scheduler; oracle calls jump the queue
+        self.completion_fn = completion_fn  # defaults to openai.ChatCompletion.create
+        self.single_flight = single_flight  # None = the process-wide group
 
+    @timed("oracle_query")
     def query(self, question: str, evidence: Dict[str, Any], high_impact: bool = False) -> Dict[str, Any]:
         """
         Simulate an oracle query.
@@ -126,15 +248,18 @@ class OracleSandbox:
         """
         try:
             # For demonstration, we query OpenAI for high-level guidance
-            response = openai.ChatCompletion.create(
-                model=self.model,
-                messages=[
+            params = {
+                "model": self.model,
+                "messages": [
                     {"role": "system", "content": "You are an oracle evaluating truth evidence. Be conservative if uncertain."},
                     {"role": "user", "content": f"{question}\nEvidence: {evidence}"}
                 ],
-                temperature=0.0
-            )
-            text_response = response.choices[0].message.content.strip()
+                "temperature": 0.0
+            }
+            if self.cache is not None:
+                text_response = self.cache.get_or_compute(params, lambda: self._fetch(params))
+            else:
+                text_response = self._fetch(params)
         except Exception as e:
             # Fallback: conservative response if OpenAI API fails
             text_response = "Oracle unavailable — defaulting to conservative approval: DO NOT DISSEMINATE"
@@ -145,9 +270,22 @@ class OracleSandbox:
             "approved": not text_response.lower().startswith("do not")
         }
 
+    def _fetch(self, params: Dict[str, Any]) -> str:
+        # the same evidence arriving from several sources at once is asked about only once
+        return (self.single_flight or get_single_flight()).do_request(params, lambda: self._complete(params))
+
+    @timed("model_call")
+    def _complete(self, params: Dict[str, Any]) -> str:
+        create = self.completion_fn
+        if create is None:
+            import openai  # heavy (requests/aiohttp); only paid on the first real call
+            create = openai.ChatCompletion.create
+        response = (self.scheduler or get_scheduler()).complete(create, params, priority=PRIORITY_ORACLE)
+        return response["choices"][0]["message"]["content"].strip()
+
 # Example usage
 if __name__ == "__main__":
-    oracle = OracleSandbox()
+    oracle = OpenAIOracle()
     example_evidence = {"id": "climate_change", "summary": "CO2 is a major factor."}
     result = oracle.query("Approve high-impact dissemination?", example_evidence, high_impact=True)
     print(result)
@@ -0,0 +1,259 @@
+# core/rate_limiter.py
+"""
+Process-wide scheduler for model API calls.
+
+Every model request (Branch, OpenAIOracle) goes through one
+ModelCallScheduler, which enforces:
+
+- requests-per-minute and tokens-per-minute budgets (token buckets)
+- a bound on concurrent in-flight calls
+- strict priority between classes: oracle gating is admitted ahead of
+  interactive queries, which go ahead of background re-verification;
+  within a class calls are served in arrival order
+- rate-limit (HTTP 429) handling: the whole scheduler pauses for the
+  provider's Retry-After (or an exponential backoff) and the call is
+  retried without losing its place in line
+
+Slots are held only for the request itself. Wrapping a larger unit of
+work that makes its own scheduled calls (an agent's evaluate) would hold
+one slot while waiting for another, and deadlocks once every slot is
+held that way.
+"""
+import heapq
+import itertools
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .metrics import observe_stage
+from .utils import TokenBucket
+
+PRIORITY_ORACLE = 0
+PRIORITY_INTERACTIVE = 1
+PRIORITY_BACKGROUND = 2
+
+PRIORITY_NAMES = {PRIORITY_ORACLE: "oracle", PRIORITY_INTERACTIVE: "interactive", PRIORITY_BACKGROUND: "background"}
+
+DEFAULT_COMPLETION_TOKENS = 256  # assumed reply size when a request has no max_tokens
+
+
+def estimate_text_tokens(text: str) -> int:
+    # ~4 characters per token for English text
+    return max(1, len(text) // 4)
+
+
+def estimate_tokens(params: Dict[str, Any]) -> int:
+    """
+    Rough prompt + completion size of a ChatCompletion request, used to
+    reserve TPM budget before the call; corrected from `usage` afterwards
+    """
+    prompt = sum(estimate_text_tokens(str(m.get("content", ""))) for m in params.get("messages", []))
+    return prompt + int(params.get("max_tokens") or DEFAULT_COMPLETION_TOKENS)
+
+
+def _usage_tokens(response: Any) -> Optional[int]:
+    try:
+        return int(response["usage"]["total_tokens"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """
+    Seconds to back off if exc is a provider rate-limit error, else None
+    (0.0 = rate-limited without a Retry-After hint)
+    """
+    if getattr(exc, "http_status", None) != 429 and type(exc).__name__ != "RateLimitError":
+        return None
+    headers = getattr(exc, "headers", None) or {}
+    for name in ("retry-after", "Retry-After"):
+        if name in headers:
+            try:
+                return max(0.0, float(headers[name]))
+            except (TypeError, ValueError):
+                break
+    return 0.0
+
+
+class _Ticket:
+    __slots__ = ("priority", "seq", "tokens")
+
+    def __init__(self, priority: int, seq: int, tokens: float):
+        self.priority = priority
+        self.seq = seq
+        self.tokens = tokens
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class ModelCallScheduler:
+    """
+    Admits model calls under RPM/TPM budgets and a concurrency bound.
+
+    Only the head of the wait queue (highest priority, then oldest) may be
+    admitted, so a large background request waiting for TPM budget is
+    never overtaken by a later background one, and never delays oracle
+    calls that queue behind it for longer than the budget requires.
+    """
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 max_concurrent: int = 8, max_retries: int = 3, backoff: float = 1.0,
+                 request_burst: Optional[float] = None, token_burst: Optional[float] = None):
+        self.max_concurrent = max_concurrent
+        self.max_retries = max_retries
+        self.backoff = backoff  # first retry delay when the provider gives no Retry-After
+        self._rpm = TokenBucket(requests_per_minute / 60.0, request_burst) if requests_per_minute else None
+        self._tpm = TokenBucket(tokens_per_minute / 60.0, token_burst) if tokens_per_minute else None
+        self._cond = threading.Condition()
+        self._waiting: list = []  # heap of _Ticket
+        self._seq = itertools.count()
+        self._running = 0
+        self._cooldown_until = 0.0
+        self._stats = {"admitted": 0, "completed": 0, "failed": 0, "rate_limited": 0,
+                       "retries": 0, "queue_timeouts": 0, "tokens_reserved": 0, "tokens_used": 0}
+
+    def run(self, fn: Callable, *args, priority: int = PRIORITY_INTERACTIVE, tokens: float = 1,
+            timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Call fn(*args, **kwargs) once admitted. `tokens` is the TPM cost;
+        `timeout` bounds the time spent waiting for admission (TimeoutError).
+        """
+        return self._run(lambda: fn(*args, **kwargs), priority, tokens, timeout)
+
+    def complete(self, create: Callable, params: Dict[str, Any], priority: int = PRIORITY_INTERACTIVE,
+                 timeout: Optional[float] = None) -> Any:
+        """
+        Scheduled ChatCompletion call: create(**params) with the TPM cost
+        estimated from params and reconciled with the reply's usage
+        """
+        return self._run(lambda: create(**params), priority, estimate_tokens(params), timeout)
+
+    def _run(self, call: Callable[[], Any], priority: int, tokens: float, timeout: Optional[float]) -> Any:
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        ticket = _Ticket(priority, next(self._seq), tokens)
+        attempt = 0
+        while True:
+            self._acquire(ticket, deadline)
+            try:
+                result = call()
+            except Exception as e:
+                delay = _retry_after(e)
+                if delay is None or attempt >= self.max_retries:
+                    self._count("failed")
+                    raise
+                self._back_off(delay or self.backoff * 2 ** attempt)
+                attempt += 1
+                self._count("retries")
+                continue  # same ticket: keeps its place in line
+            finally:
+                self._release()  # also on KeyboardInterrupt/SystemExit, or the slot leaks
+            self._count("completed")
+            used = _usage_tokens(result)
+            if used is not None:
+                self._count("tokens_used", used)
+                if self._tpm is not None:
+                    self._tpm.consume(used - tokens)
+            return result
+
+    def _acquire(self, ticket: _Ticket, deadline: Optional[float]):
+        enqueued = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    wait_for = None
+                    if self._waiting[0] is ticket and self._running < self.max_concurrent:
+                        wait_for = self._admission_delay(ticket.tokens)
+                        if wait_for <= 0:
+                            heapq.heappop(self._waiting)
+                            self._take(ticket.tokens)
+                            self._running += 1
+                            self._stats["admitted"] += 1
+                            self._cond.notify_all()  # the next head may be admissible too
+                            break
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._stats["queue_timeouts"] += 1
+                            raise TimeoutError("Timed out waiting for model call capacity.")
+                        wait_for = remaining if wait_for is None else min(wait_for, remaining)
+                    self._cond.wait(wait_for)
+            except BaseException:
+                if ticket in self._waiting:
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                    self._cond.notify_all()
+                raise
+        observe_stage("scheduler_wait", time.monotonic() - enqueued,
+                      priority=PRIORITY_NAMES.get(ticket.priority, str(ticket.priority)))
+
+    def _admission_delay(self, tokens: float) -> float:
+        delay = self._cooldown_until - time.monotonic()
+        if self._rpm is not None:
+            delay = max(delay, self._rpm.time_until(1))
+        if self._tpm is not None:
+            delay = max(delay, self._tpm.time_until(min(tokens, self._tpm.capacity)))
+        return delay
+
+    def _take(self, tokens: float):
+        if self._rpm is not None:
+            self._rpm.consume(1)
+        if self._tpm is not None:
+            self._tpm.consume(tokens)  # requests larger than the burst run the bucket into debt
+        self._stats["tokens_reserved"] += tokens
+
+    def _release(self):
+        with self._cond:
+            self._running -= 1
+            self._cond.notify_all()
+
+    def _back_off(self, delay: float):
+        with self._cond:
+            self._stats["rate_limited"] += 1
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+            self._cond.notify_all()
+
+    def _count(self, name: str, amount: float = 1):
+        with self._cond:
+            self._stats[name] += amount
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats["running"] = self._running
+            stats["queued"] = len(self._waiting)
+        return stats
+
+
+_default_scheduler: Optional[ModelCallScheduler] = None
+_default_lock = threading.Lock()
+
+
+def _env_float(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+def get_scheduler() -> ModelCallScheduler:
+    """
+    The shared scheduler, configured from TRUTHAI_RPM, TRUTHAI_TPM and
+    TRUTHAI_MAX_CONCURRENT_CALLS on first use
+    """
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = ModelCallScheduler(
+                requests_per_minute=_env_float("TRUTHAI_RPM"),
+                tokens_per_minute=_env_float("TRUTHAI_TPM"),
+                max_concurrent=int(os.getenv("TRUTHAI_MAX_CONCURRENT_CALLS", "8")))
+        return _default_scheduler
+
+
+def set_scheduler(scheduler: Optional[ModelCallScheduler]):
+    """
+    Replace the shared scheduler (None = rebuild from the environment on next use)
+    """
+    global _default_scheduler
+    with _default_lock:
+        _default_scheduler = scheduler
@@ -0,0 +1,199 @@
+# core/response_cache.py
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from .canonical import digest
+
+# Paths
+CACHE_DIR = "data/cache/responses"
+
+# Request parameters that do not change the model output and are left out of the key
+NON_SEMANTIC_PARAMS = ("request_timeout", "timeout", "api_key", "stream")
+
+
+class ResponseCache:
+    """
+    Two-tier cache for deterministic (temperature=0) model calls.
+
+    Tier 1 is an in-memory LRU bounded by max_entries, tier 2 an on-disk store
+    with one JSON file per key. Both honour the same TTL. Keys are a SHA-256
+    over the canonical encoding of model, messages (system prompt + user
+    content) and sampling params.
+    """
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None,
+                 disk_dir: Optional[str] = CACHE_DIR):
+        self.max_entries = max_entries
+        self.ttl = ttl  # seconds; None = never expire
+        self.disk_dir = disk_dir  # None = memory only
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ----------------------
+    # Keys
+    # ----------------------
+
+    @staticmethod
+    def make_key(params: Dict[str, Any]) -> str:
+        """
+        Stable key for a chat completion request.
+        """
+        relevant = {k: v for k, v in params.items() if k not in NON_SEMANTIC_PARAMS}
+        return digest(relevant, default=str)
+
+    @staticmethod
+    def is_cacheable(params: Dict[str, Any]) -> bool:
+        """
+        Only deterministic calls are safe to replay.
+        """
+        return params.get("temperature", 1.0) == 0.0 and not params.get("stream", False)
+
+    # ----------------------
+    # Lookup / store
+    # ----------------------
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None:
+                value, created = item
+                if not self._expired(created, now):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+        record = self._read_disk(key)
+        if record is not None and not self._expired(record["created"], now):
+            with self._lock:
+                self._remember(key, record["value"], record["created"])
+                self.disk_hits += 1
+            return record["value"]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: str) -> None:
+        created = time.time()
+        with self._lock:
+            self._remember(key, value, created)
+        self._write_disk(key, value, created)
+
+    def get_or_compute(self, params: Dict[str, Any], compute: Callable[[], str]) -> str:
+        """
+        Return the cached response for params, calling compute() on a miss.
+        Non-deterministic requests bypass the cache entirely.
+        """
+        if not self.is_cacheable(params):
+            return compute()
+        key = self.make_key(params)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    # ----------------------
+    # Invalidation
+    # ----------------------
+
+    def invalidate(self, params: Dict[str, Any]) -> bool:
+        """
+        Drop the entry for one request from both tiers. Returns True if it existed.
+        """
+        return self.invalidate_key(self.make_key(params))
+
+    def invalidate_key(self, key: str) -> bool:
+        with self._lock:
+            existed = self._memory.pop(key, None) is not None
+        path = self._path(key)
+        if path and os.path.exists(path):
+            os.remove(path)
+            existed = True
+        return existed
+
+    def clear(self, disk: bool = True) -> None:
+        """
+        Drop every entry; with disk=False only the memory tier is emptied.
+        """
+        with self._lock:
+            self._memory.clear()
+        if disk and self.disk_dir and os.path.isdir(self.disk_dir):
+            for root, _, files in os.walk(self.disk_dir):
+                for name in files:
+                    if name.endswith(".json"):
+                        os.remove(os.path.join(root, name))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0
+            }
+
+    # ----------------------
+    # Internals
+    # ----------------------
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def _remember(self, key: str, value: str, created: float) -> None:
+        """Insert into the LRU tier; caller holds the lock."""
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _path(self, key: str) -> Optional[str]:
+        if not self.disk_dir:
+            return None
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_disk(self, key: str, value: str, created: float) -> None:
+        path = self._path(key)
+        if not path:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"value": value, "created": created}, f)
+        os.replace(tmp_path, path)
+
+
+_default_cache: Optional[ResponseCache] = None
+
+
+def get_default_cache() -> ResponseCache:
+    """
+    Process-wide cache shared by Branch and OpenAIOracle when opted in.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResponseCache()
+    return _default_cache
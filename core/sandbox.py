@@ -1,41 +1,332 @@
-from typing import Callable, Any
+from typing import Callable, Any, Dict, Optional
+from collections import deque
+import multiprocessing
+import queue
 import threading
 import time
 
+
+def _process_worker_main(conn):
+    """
+    Loop run inside each sandbox worker process: receive (func, args, kwargs),
+    send back (ok, result_or_exception).
+    """
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+        func, args, kwargs = message
+        try:
+            reply = (True, func(*args, **kwargs))
+        except BaseException as e:
+            reply = (False, e)
+        try:
+            conn.send(reply)
+        except Exception as e:  # unpicklable result or exception
+            conn.send((False, RuntimeError(f"Sandbox result could not be returned: {e!r}")))
+
+
+def _caller_safe(error: BaseException) -> BaseException:
+    """
+    A sandboxed call that exits (SystemExit) or is interrupted must not
+    take the caller down with it; only Exception subclasses pass through.
+    """
+    if isinstance(error, Exception):
+        return error
+    wrapped = RuntimeError(f"Sandboxed call raised {type(error).__name__}: {error}")
+    wrapped.__cause__ = error
+    return wrapped
+
+
+class _ProcessWorker:
+    """
+    One sandbox worker process and the pipe used to talk to it. Workers
+    from before the last shutdown() (an older generation) are stopped
+    when their call returns instead of going back to the pool.
+    """
+    def __init__(self, context, generation: int = 0):
+        self.generation = generation
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_process_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        self.process.terminate()
+        self.process.join(1.0)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(1.0)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class _ThreadTask:
+    """
+    One call handed to a sandbox thread. `finished` and `abandoned` are
+    only changed under the sandbox lock, so a call that completes just as
+    it times out is either returned or abandoned, never both.
+    """
+    __slots__ = ("func", "args", "kwargs", "started", "done", "started_at",
+                 "result", "error", "finished", "abandoned")
+
+    def __init__(self, func: Callable, args, kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.started = threading.Event()
+        self.done = threading.Event()
+        self.started_at = 0.0
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.finished = False
+        self.abandoned = False
+
+
 class Sandbox:
     """
     Wraps AI actions in a safe environment
+
+    Calls run on a bounded pool of max_workers; max_runtime_sec counts from
+    the moment a call starts executing, not from when it was queued. In
+    the default thread mode a timed-out call cannot be stopped: it is
+    reported and its thread is abandoned (it exits once the call returns)
+    and a fresh thread takes its pool slot, so runaway calls never starve
+    later ones. With use_processes=True each call runs in a pooled worker
+    process; on timeout that process is killed and replaced (func and its
+    arguments must then be picklable).
     """
-    def __init__(self, max_runtime_sec: int = 5):
+    def __init__(self, max_runtime_sec: int = 5, max_workers: int = 4, use_processes: bool = False,
+                 mp_context: Optional[str] = None, latency_samples: int = 1024):
         self.max_runtime_sec = max_runtime_sec
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self._mp_context = multiprocessing.get_context(mp_context)
+        self._lock = threading.Lock()
+        self._tasks: "queue.SimpleQueue[Optional[_ThreadTask]]" = queue.SimpleQueue()
+        self._live_threads = 0  # pool threads not abandoned to a timed-out call
+        self._idle_threads = 0
+        self._idle_workers: "queue.LifoQueue[_ProcessWorker]" = queue.LifoQueue()
+        self._workers_spawned = 0  # of the current generation
+        self._worker_generation = 0
+        self._latencies = deque(maxlen=latency_samples)
+        self._metrics = {
+            "queued": 0,
+            "running": 0,
+            "completed": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "abandoned_threads": 0,
+            "workers_replaced": 0
+        }
 
     def run(self, func: Callable, *args, **kwargs) -> Any:
         """
-        Execute function in sandboxed thread with timeout
+        Execute function in a sandboxed worker with timeout
         """
-        result = [None]
-        exception = [None]
+        start = time.monotonic()
+        self._count("queued", 1)
+        try:
+            if self.use_processes:
+                result = self._run_in_process(func, args, kwargs)
+            else:
+                result = self._run_in_thread(func, args, kwargs)
+        except TimeoutError:
+            self._count("timeouts", 1)
+            raise
+        except Exception:
+            self._count("failed", 1)
+            raise
+        else:
+            self._count("completed", 1)
+            return result
+        finally:
+            with self._lock:
+                self._latencies.append(time.monotonic() - start)
+
+    def _run_in_thread(self, func: Callable, args, kwargs) -> Any:
+        task = _ThreadTask(func, args, kwargs)
+        self._ensure_thread()
+        self._tasks.put(task)
+        task.started.wait()
+        remaining = task.started_at + self.max_runtime_sec - time.monotonic()
+        if not task.done.wait(max(0.0, remaining)):
+            with self._lock:
+                if not task.finished:
+                    task.abandoned = True
+                    self._live_threads -= 1
+                    self._metrics["abandoned_threads"] += 1
+            if task.abandoned:
+                print("[SANDBOX] Execution timed out. Thread cannot be killed; abandoning it.")
+                self._ensure_thread()  # replacement takes the abandoned thread's slot
+                raise TimeoutError("Sandbox execution exceeded max runtime.")
+            task.done.wait()
+        if task.error is not None:
+            raise _caller_safe(task.error)
+        return task.result
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._idle_threads or self._live_threads >= self.max_workers:
+                return
+            self._live_threads += 1
+        threading.Thread(target=self._thread_main, args=(self._tasks,), name="sandbox", daemon=True).start()
 
-        def target():
+    def _thread_main(self, tasks: "queue.SimpleQueue[Optional[_ThreadTask]]"):
+        while True:
+            with self._lock:
+                current = tasks is self._tasks  # False once shutdown() has retired this queue
+                if current:
+                    self._idle_threads += 1
+            task = tasks.get()
+            with self._lock:
+                if task is None:  # shutdown
+                    return
+                if current:
+                    self._idle_threads -= 1
+                self._metrics["queued"] -= 1
+                self._metrics["running"] += 1
+            task.started_at = time.monotonic()
+            task.started.set()
             try:
-                result[0] = func(*args, **kwargs)
-            except Exception as e:
-                exception[0] = e
-
-        thread = threading.Thread(target=target)
-        thread.start()
-        thread.join(self.max_runtime_sec)
-
-        if thread.is_alive():
-            print("[SANDBOX] Execution timed out. Terminating.")
-            # Could add logging + kill flag here
-            thread.join(0.1)
+                task.result = task.func(*task.args, **task.kwargs)
+            except BaseException as e:
+                task.error = e
+            with self._lock:
+                self._metrics["running"] -= 1
+                task.finished = True
+                abandoned = task.abandoned or tasks is not self._tasks
+            task.done.set()
+            if abandoned:
+                return  # a replacement already holds this slot
+
+    def _run_in_process(self, func: Callable, args, kwargs) -> Any:
+        worker = self._acquire_worker()
+        self._count("queued", -1)
+        self._count("running", 1)
+        timed_out = False
+        died = None
+        try:
+            worker.conn.send((func, args, kwargs))
+            if worker.conn.poll(self.max_runtime_sec):
+                ok, payload = worker.conn.recv()
+            else:
+                timed_out = True
+        except (EOFError, OSError) as e:
+            died = e  # worker died mid-call (crash, os._exit, OOM kill)
+        finally:
+            if timed_out:
+                print("[SANDBOX] Execution timed out. Killing worker process.")
+            self._count("running", -1)
+            self._release_worker(worker, broken=timed_out or died is not None)
+        if died is not None:
+            raise RuntimeError(f"Sandbox worker process died: {died!r}")
+        if timed_out:
             raise TimeoutError("Sandbox execution exceeded max runtime.")
+        if not ok:
+            raise _caller_safe(payload)
+        return payload
+
+    def _release_worker(self, worker: _ProcessWorker, broken: bool):
+        """
+        Return a worker to the pool after a call; a broken one is killed
+        and replaced, one from before the last shutdown() is stopped.
+        """
+        if broken:
+            worker.kill()
+        with self._lock:
+            current = worker.generation == self._worker_generation
+        if not current:
+            if not broken:
+                worker.stop()
+            return
+        if broken:
+            self._count("workers_replaced", 1)
+            worker = _ProcessWorker(self._mp_context, worker.generation)
+        with self._lock:
+            current = worker.generation == self._worker_generation
+            if current:
+                self._idle_workers.put(worker)
+        if not current:  # shut down while the replacement started
+            worker.stop()
 
-        if exception[0]:
-            raise exception[0]
+    def _acquire_worker(self) -> _ProcessWorker:
+        try:
+            return self._idle_workers.get_nowait()
+        except queue.Empty:
+            pass
+        while True:
+            with self._lock:
+                generation = self._worker_generation
+                spawn = self._workers_spawned < self.max_workers
+                if spawn:
+                    self._workers_spawned += 1
+            if spawn:
+                return _ProcessWorker(self._mp_context, generation)
+            try:
+                # re-check now and then: a shutdown() frees spawn slots without returning workers
+                return self._idle_workers.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+    def _count(self, name: str, delta: int):
+        with self._lock:
+            self._metrics[name] += delta
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Queue depth, timeout counts and latency (seconds) of sandboxed calls
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            metrics = dict(self._metrics)
+        metrics["queue_depth"] = metrics.pop("queued")
+        metrics["latency_p50"] = latencies[len(latencies) // 2] if latencies else None
+        metrics["latency_p99"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else None
+        metrics["latency_max"] = latencies[-1] if latencies else None
+        return metrics
 
-        return result[0]
+    def shutdown(self):
+        """
+        Stop pooled threads and worker processes
+        """
+        with self._lock:
+            tasks, threads = self._tasks, self._live_threads
+            self._tasks = queue.SimpleQueue()  # later calls start a fresh set of threads
+            self._live_threads = self._idle_threads = 0
+            self._workers_spawned = 0
+            self._worker_generation += 1  # busy workers are stopped when their call returns
+        while True:  # calls still waiting for a thread fail instead of hanging
+            try:
+                task = tasks.get_nowait()
+            except queue.Empty:
+                break
+            if task is not None:
+                self._count("queued", -1)
+                task.error = RuntimeError("Sandbox was shut down before the call started")
+                task.finished = True
+                task.started.set()
+                task.done.set()
+        for _ in range(threads):
+            tasks.put(None)
+        while True:
+            try:
+                self._idle_workers.get_nowait().stop()
+            except queue.Empty:
+                break
 
     def human_gate(self, output: Any) -> Any:
         """
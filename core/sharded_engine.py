@@ -0,0 +1,284 @@
+# core/sharded_engine.py
+import heapq
+import multiprocessing
+import os
+import threading
+import zlib
+from collections.abc import Mapping
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.evidence import Evidence, TextStore
+from core.truth_engine import TruthEngine
+
+# Evidence buffered per shard before it is sent as one message
+DEFAULT_FLUSH_EVERY = 512
+
+
+def shard_for(evidence_id: str, shards: int) -> int:
+    """
+    Shard owning an evidence id. CRC-32 rather than hash(), which is
+    salted per process.
+    """
+    return zlib.crc32(str(evidence_id).encode("utf-8")) % shards
+
+
+def _shard_main(conn, text_store_path: Optional[str]):
+    """
+    Worker process: one TruthEngine plus what the router needs to merge
+    metrics. Adds arrive as batches of (seq, evidence_id, evidence) with no
+    reply; every other request gets ("ok", value) or ("error", message).
+    A failing item does not stop the rest of its batch; the number of
+    failed adds and the first error are reported on the next request.
+    """
+    text_store = TextStore(text_store_path) if text_store_path else None
+    engine = TruthEngine(text_store=text_store)
+    first_seq: Dict[str, int] = {}  # insertion order across shards, for find()
+    branch_outputs_seen = 0         # sum of len(branch_outputs), drives truth_capacity
+    quality_seq = -1                # seq of the last evidence that set truth_quality
+    failures = 0
+    first_failure: Optional[str] = None
+
+    while True:
+        op, payload = conn.recv()
+        if op == "add":
+            for seq, evidence_id, evidence in payload:
+                try:
+                    record = engine.add_evidence(evidence_id, evidence)
+                except Exception as e:
+                    failures += 1
+                    first_failure = first_failure or f"{type(e).__name__}: {e}"
+                    if evidence_id in engine.material_evidence_store:  # stored, metrics update failed
+                        first_seq.setdefault(evidence_id, seq)
+                    continue
+                first_seq.setdefault(evidence_id, seq)
+                branch_outputs = record.get("branch_outputs")
+                if branch_outputs:
+                    branch_outputs_seen += len(branch_outputs)
+                    quality_seq = seq
+            continue
+        if op == "stop":
+            if text_store is not None:
+                text_store.close()
+            conn.send(("ok", None))
+            return
+        if failures:
+            conn.send(("error", f"{failures} add(s) failed, first: {first_failure}"))
+            failures, first_failure = 0, None
+            continue
+        try:
+            if op == "get":
+                value = engine.material_evidence_store.get(payload)
+            elif op == "state":
+                value = {"count": len(engine.material_evidence_store), "branch_outputs": branch_outputs_seen,
+                         "quality": engine.truth_quality, "quality_seq": quality_seq}
+            elif op == "keys":
+                value = list(engine.material_evidence_store)
+            elif op == "find":
+                total, page = engine.find_evidence(**payload)
+                value = (total, [(first_seq[eid], eid, ev) for eid, ev in page])
+            else:
+                raise ValueError(f"Unknown shard request {op!r}")
+            conn.send(("ok", value))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class ShardedTruthEngine:
+    """
+    TruthEngine partitioned by evidence id across worker processes.
+
+    Each worker owns the evidence whose id hashes to it (see shard_for)
+    and runs an ordinary TruthEngine. add_evidence() only buffers the item
+    for its shard; buffers go out `flush_every` items at a time over a
+    pipe, so ingestion runs on every worker in parallel and a busy worker
+    pushes back on the producer. Lookups, find_evidence() and
+    get_system_state() flush first, so they see every earlier add.
+
+    Global metrics are merged to what a single engine fed the same
+    evidence in the same order would report: the router numbers every
+    add, truth_quality comes from the shard holding the latest evidence
+    with branch outputs, truth_capacity from the total number of branch
+    outputs seen, and counts are summed (an id always lands on the same
+    shard, so there are no duplicates).
+    """
+    def __init__(self, shards: Optional[int] = None, flush_every: int = DEFAULT_FLUSH_EVERY,
+                 text_store_dir: Optional[str] = None, mp_context: Optional[str] = None):
+        self.shards = shards or os.cpu_count() or 1
+        self.flush_every = flush_every
+        self.high_impact_threshold: int = 1_000_000
+        self.catastrophic_risk_threshold: float = 0.3
+        self.material_evidence_store = ShardedEvidenceView(self)
+        self._lock = threading.RLock()
+        self._seq = 0
+        self._buffers: List[List[Tuple[int, str, Any]]] = [[] for _ in range(self.shards)]
+        context = multiprocessing.get_context(mp_context)
+        self._conns = []
+        self._workers = []
+        for i in range(self.shards):
+            parent, child = context.Pipe()
+            text_store_path = os.path.join(text_store_dir, f"shard-{i:02d}.bin") if text_store_dir else None
+            worker = context.Process(target=_shard_main, args=(child, text_store_path),
+                                     name=f"truth-shard-{i}", daemon=True)
+            worker.start()
+            child.close()
+            self._conns.append(parent)
+            self._workers.append(worker)
+
+    # ----------------------
+    # Writes
+    # ----------------------
+
+    def add_evidence(self, evidence_id: str, evidence: Dict[str, Any]) -> None:
+        """
+        Queue evidence for its shard. Stored asynchronously: the record is
+        visible to lookups made after this call, but is not returned.
+        """
+        with self._lock:
+            shard = shard_for(evidence_id, self.shards)
+            buffer = self._buffers[shard]
+            buffer.append((self._seq, evidence_id, evidence))
+            self._seq += 1
+            if len(buffer) >= self.flush_every:
+                self._send(shard)
+
+    def add_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        add_evidence() for (evidence_id, evidence) pairs; returns the count.
+        """
+        count = 0
+        for evidence_id, evidence in items:
+            self.add_evidence(evidence_id, evidence)
+            count += 1
+        return count
+
+    def flush(self):
+        with self._lock:
+            for shard in range(self.shards):
+                self._send(shard)
+
+    # ----------------------
+    # Reads
+    # ----------------------
+
+    def get_evidence(self, evidence_id: str) -> Optional[Evidence]:
+        with self._lock:
+            shard = shard_for(evidence_id, self.shards)
+            self._send(shard)
+            return self._request(shard, "get", evidence_id)
+
+    def find_evidence(self, text: Optional[str] = None, min_affected_agents: int = 0,
+                      source: Optional[str] = None, offset: int = 0, limit: int = 50,
+                      newest_first: bool = True) -> Tuple[int, List[Tuple[str, Evidence]]]:
+        """
+        TruthEngine.find_evidence across shards: each shard returns its first
+        offset + limit matches, which are merged in global insertion order.
+        """
+        query = {"text": text, "min_affected_agents": min_affected_agents, "source": source,
+                 "offset": 0, "limit": offset + limit, "newest_first": newest_first}
+        results = self._gather("find", query)
+        total = sum(t for t, _ in results)
+        merged = heapq.merge(*(page for _, page in results), key=lambda item: item[0], reverse=newest_first)
+        return total, [(eid, ev) for _, eid, ev in islice(merged, offset, offset + limit)]
+
+    def get_system_state(self) -> Dict[str, Any]:
+        """
+        Metrics merged over all shards, consistent with every add made so far.
+        """
+        states = self._gather("state")
+        latest = max(states, key=lambda s: s["quality_seq"])
+        seen = sum(s["branch_outputs"] for s in states)
+        return {
+            "truth_capacity": max(0.0, 1.0 - 0.01 * seen),
+            "truth_quality": latest["quality"] if latest["quality_seq"] >= 0 else 1.0,
+            "material_evidence_count": sum(s["count"] for s in states),
+            "shard_counts": [s["count"] for s in states]
+        }
+
+    @property
+    def truth_capacity(self) -> float:
+        return self.get_system_state()["truth_capacity"]
+
+    @property
+    def truth_quality(self) -> float:
+        return self.get_system_state()["truth_quality"]
+
+    # ----------------------
+    # Lifecycle
+    # ----------------------
+
+    def close(self):
+        with self._lock:
+            if not self._workers:
+                return
+            self.flush()
+            for conn in self._conns:
+                conn.send(("stop", None))
+            for conn, worker in zip(self._conns, self._workers):
+                conn.recv()
+                worker.join()
+                conn.close()
+            self._conns, self._workers = [], []
+
+    def __enter__(self) -> "ShardedTruthEngine":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----------------------
+    # Internals
+    # ----------------------
+
+    def _send(self, shard: int):
+        """Caller holds the lock."""
+        buffer = self._buffers[shard]
+        if buffer:
+            self._conns[shard].send(("add", buffer))
+            self._buffers[shard] = []
+
+    def _request(self, shard: int, op: str, payload: Any = None) -> Any:
+        """Caller holds the lock."""
+        self._conns[shard].send((op, payload))
+        return self._unwrap(self._conns[shard].recv())
+
+    def _gather(self, op: str, payload: Any = None) -> List[Any]:
+        """
+        Send one request to every shard, then collect the replies, so the
+        shards answer in parallel.
+        """
+        with self._lock:
+            self.flush()
+            for conn in self._conns:
+                conn.send((op, payload))
+            return [self._unwrap(conn.recv()) for conn in self._conns]
+
+    @staticmethod
+    def _unwrap(reply: Tuple[str, Any]) -> Any:
+        status, value = reply
+        if status == "error":
+            raise RuntimeError(f"Shard failed: {value}")
+        return value
+
+
+class ShardedEvidenceView(Mapping):
+    """
+    material_evidence_store for a ShardedTruthEngine: item lookups go to
+    the owning shard, so code using engine.material_evidence_store[id] or
+    .get(id) works unchanged.
+    """
+    def __init__(self, engine: ShardedTruthEngine):
+        self.engine = engine
+
+    def __getitem__(self, evidence_id: str) -> Evidence:
+        record = self.engine.get_evidence(evidence_id)
+        if record is None:
+            raise KeyError(evidence_id)
+        return record
+
+    def __iter__(self) -> Iterator[str]:
+        for keys in self.engine._gather("keys"):
+            yield from keys
+
+    def __len__(self) -> int:
+        return self.engine.get_system_state()["material_evidence_count"]
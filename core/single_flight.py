@@ -0,0 +1,100 @@
+# core/single_flight.py
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .metrics import increment
+from .response_cache import ResponseCache
+
+COALESCED_TOTAL = "truthai_singleflight_coalesced_total"
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: the first caller for a key runs
+    the function, callers arriving while it is in flight wait and receive
+    the same result (or exception). Nothing is kept once the call returns,
+    so unlike ResponseCache this only removes duplicate work during bursts.
+    """
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run fn() unless a call for key is already in flight, in which case
+        wait up to `timeout` seconds for its result
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+        if not leader:
+            increment(COALESCED_TOTAL, help_text="Upstream calls saved by coalescing", flight=self.name)
+            if not call.done.wait(timeout):
+                raise TimeoutError("Timed out waiting for an identical in-flight call.")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def do_request(self, params: Dict[str, Any], fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """
+        Coalesce a model request by its ResponseCache key. Sampled
+        (temperature > 0) requests are independent draws and always run.
+        """
+        if not ResponseCache.is_cacheable(params):
+            return fn()
+        return self.do(ResponseCache.make_key(params), fn, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = self.executed + self.coalesced
+            return {
+                "in_flight": len(self._calls),
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "saved_ratio": self.coalesced / calls if calls else 0.0
+            }
+
+
+_default_flight: Optional[SingleFlight] = None
+_default_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """
+    Process-wide group shared by Branch and OpenAIOracle
+    """
+    global _default_flight
+    with _default_lock:
+        if _default_flight is None:
+            _default_flight = SingleFlight("model")
+        return _default_flight
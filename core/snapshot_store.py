@@ -0,0 +1,235 @@
+# core/snapshot_store.py
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+from .canonical import encode, iter_decode
+
+# Paths
+SNAPSHOT_DIR = "data/logs/verifier_snapshots"
+
+MANIFEST_VERSION = 1
+
+
+class SnapshotStore:
+    """
+    Content-addressed, compressed storage for verifier snapshots.
+
+    A snapshot is a dict of sections (its top-level keys). Each section is
+    serialized as a run of core.canonical records (one per dict item,
+    sorted by key, or per list element, in order) and cut into chunks at
+    content-defined record boundaries, so an edit only changes the chunks
+    around it. Chunks are zlib-compressed and stored once under their
+    SHA-256:
+
+        <root>/chunks/ab/abcdef....z
+        <root>/manifests/<name>.json   section -> ordered chunk hashes
+
+    Manifests stay plain JSON: they hold only names and hashes, are never
+    hashed themselves, and are meant to be readable with ordinary tools.
+
+    Saving writes only chunks that are not stored yet; save_delta() goes
+    further and only serializes the sections that changed since a base
+    snapshot. load() returns a LazySnapshot that reads a section's chunks
+    the first time that section is accessed.
+    """
+    def __init__(self, root: str = SNAPSHOT_DIR, target_chunk_records: int = 256,
+                 max_chunk_bytes: int = 1 << 20, compress_level: int = 6):
+        self.root = root
+        self.target_chunk_records = target_chunk_records  # average records per chunk
+        self.max_chunk_bytes = max_chunk_bytes
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+        self.stats = {"chunks_written": 0, "chunks_reused": 0, "bytes_written": 0}
+
+    # ----------------------
+    # Writing
+    # ----------------------
+
+    def save(self, name: str, data: Mapping[str, Any]) -> str:
+        """
+        Store a full snapshot; returns the manifest path. Values
+        core.canonical cannot encode raise TypeError.
+        """
+        sections = {section: self._write_section(value) for section, value in data.items()}
+        return self._write_manifest(name, None, sections)
+
+    def save_delta(self, name: str, base: str, changed: Mapping[str, Any], removed: Iterable[str] = ()) -> str:
+        """
+        Store a snapshot equal to `base` with `changed` sections replaced or
+        added and `removed` sections dropped. Untouched sections are not
+        serialized again; the new manifest points at the base's chunks.
+        """
+        sections = dict(self._read_manifest(base)["sections"])
+        for section in removed:
+            sections.pop(section, None)
+        for section, value in changed.items():
+            sections[section] = self._write_section(value)
+        return self._write_manifest(name, base, sections)
+
+    def _write_section(self, value: Any) -> Dict[str, Any]:
+        if isinstance(value, dict):
+            kind, records = "dict", (encode({k: value[k]}) for k in sorted(value, key=str))
+        elif isinstance(value, list):
+            kind, records = "list", (encode(item) for item in value)
+        else:
+            kind, records = "value", iter([encode(value)])
+
+        chunks, size, buffer, buffered = [], 0, [], 0
+        for record in records:
+            buffer.append(record)
+            buffered += len(record)
+            # cut after records whose hash hits the target rate: boundaries move with content, not offsets
+            if zlib.crc32(record) % self.target_chunk_records == 0 or buffered >= self.max_chunk_bytes:
+                chunks.append(self._put_chunk(b"".join(buffer)))
+                size += buffered
+                buffer, buffered = [], 0
+        if buffer:
+            chunks.append(self._put_chunk(b"".join(buffer)))
+            size += buffered
+        return {"kind": kind, "chunks": chunks, "bytes": size}
+
+    def _put_chunk(self, payload: bytes) -> str:
+        digest = hashlib.sha256(payload).hexdigest()
+        path = self._chunk_path(digest)
+        if os.path.exists(path):
+            self._count("chunks_reused")
+            return digest
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        compressed = zlib.compress(payload, self.compress_level)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp_path, path)
+        self._count("chunks_written")
+        self._count("bytes_written", len(compressed))
+        return digest
+
+    def _write_manifest(self, name: str, base: Optional[str], sections: Dict[str, Any]) -> str:
+        manifest = {"version": MANIFEST_VERSION, "name": name, "created": time.time(),
+                    "base": base, "sections": sections}
+        path = self._manifest_path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
+        return path
+
+    # ----------------------
+    # Reading
+    # ----------------------
+
+    def load(self, name: str) -> "LazySnapshot":
+        return LazySnapshot(self, self._read_manifest(name))
+
+    def exists(self, name: str) -> bool:
+        return os.path.exists(self._manifest_path(name))
+
+    def list_snapshots(self) -> List[str]:
+        manifest_dir = os.path.join(self.root, "manifests")
+        if not os.path.isdir(manifest_dir):
+            return []
+        return sorted(n[:-len(".json")] for n in os.listdir(manifest_dir) if n.endswith(".json"))
+
+    def read_section(self, entry: Dict[str, Any]) -> Any:
+        records = (record for digest in entry["chunks"] for record in iter_decode(self._get_chunk(digest)))
+        if entry["kind"] == "dict":
+            result = {}
+            for record in records:
+                result.update(record)
+            return result
+        if entry["kind"] == "list":
+            return list(records)
+        return next(records)
+
+    def _get_chunk(self, digest: str) -> bytes:
+        with open(self._chunk_path(digest), "rb") as f:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                    return zlib.decompress(view)  # decompress straight from the mapping, no read copy
+            except ValueError:  # empty file cannot be mapped
+                return zlib.decompress(f.read())
+
+    def _read_manifest(self, name: str) -> Dict[str, Any]:
+        path = self._manifest_path(name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Snapshot {name} does not exist")
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    # ----------------------
+    # Housekeeping
+    # ----------------------
+
+    def delete(self, name: str) -> bool:
+        path = self._manifest_path(name)
+        if not os.path.exists(path):
+            return False
+        os.remove(path)
+        return True
+
+    def gc(self) -> int:
+        """
+        Remove chunks no manifest refers to; returns how many were deleted
+        """
+        live = set()
+        for name in self.list_snapshots():
+            for entry in self._read_manifest(name)["sections"].values():
+                live.update(entry["chunks"])
+        removed = 0
+        chunk_dir = os.path.join(self.root, "chunks")
+        for dirpath, _, files in os.walk(chunk_dir):
+            for filename in files:
+                if filename.endswith(".z") and filename[:-2] not in live:
+                    os.remove(os.path.join(dirpath, filename))
+                    removed += 1
+        return removed
+
+    def _chunk_path(self, digest: str) -> str:
+        return os.path.join(self.root, "chunks", digest[:2], f"{digest}.z")
+
+    def _manifest_path(self, name: str) -> str:
+        return os.path.join(self.root, "manifests", f"{name}.json")
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.stats[name] += amount
+
+
+class LazySnapshot(Mapping):
+    """
+    Read-only view of a stored snapshot; each section is read and decoded
+    on first access and then kept.
+    """
+    def __init__(self, store: SnapshotStore, manifest: Dict[str, Any]):
+        self.store = store
+        self.manifest = manifest
+        self._loaded: Dict[str, Any] = {}
+
+    @property
+    def name(self) -> str:
+        return self.manifest["name"]
+
+    def __getitem__(self, section: str) -> Any:
+        if section not in self._loaded:
+            entry = self.manifest["sections"][section]  # KeyError for unknown sections
+            self._loaded[section] = self.store.read_section(entry)
+        return self._loaded[section]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.manifest["sections"])
+
+    def __len__(self) -> int:
+        return len(self.manifest["sections"])
+
+    def loaded_sections(self) -> List[str]:
+        return list(self._loaded)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {section: self[section] for section in self}
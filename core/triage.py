@@ -1,40 +1,363 @@
-from typing import List, Dict, Any
+import heapq
+import itertools
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import Callable, List, Dict, Any, Mapping, Optional, Tuple
+
+from .metrics import timed
+from .utils import TokenBucket
+
+
+def priority_score(e: Dict[str, Any]) -> float:
+    """
+    Estimated impact of a piece of evidence (irreversibility * scope)
+    """
+    irreversibility = e.get("irreversibility", 0.5)
+    scope = e.get("scope", 0.5)
+    return irreversibility * scope
+
+
+class EvidencePriorityQueue:
+    """
+    Max-priority queue of evidence keyed by evidence id.
+
+    Binary heap with lazy deletion: cancelled or re-prioritised items leave
+    a dead heap entry behind that is skipped when it reaches the top. Equal
+    scores pop in insertion order.
+    """
+    _REMOVED = None
+
+    def __init__(self):
+        self._heap: List[list] = []
+        # evidence_id -> [neg_score, arrival, seq, evidence_id, evidence]; seq is unique per heap entry
+        self._entries: Dict[str, list] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, evidence_id: str) -> bool:
+        return evidence_id in self._entries
+
+    def push(self, evidence_id: str, evidence: Dict[str, Any], score: float):
+        """
+        Insert evidence, replacing any queued item with the same id.
+        """
+        if evidence_id in self._entries:
+            self._entries.pop(evidence_id)[4] = self._REMOVED
+        seq = next(self._counter)
+        entry = [-score, seq, seq, evidence_id, evidence]
+        self._entries[evidence_id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def pop(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        items = self.pop_top_k(1)
+        return items[0] if items else None
+
+    def pop_top_k(self, k: int) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Remove and return up to k (evidence_id, evidence) pairs, best first.
+        """
+        out = []
+        while len(out) < k:
+            entry = self._pop_entry()
+            if entry is None:
+                break
+            out.append((entry[3], entry[4]))
+        self._maybe_compact()
+        return out
+
+    def peek_top_k(self, k: int) -> List[Dict[str, Any]]:
+        """
+        The k highest-priority items without removing them (O(k log n)).
+        """
+        live = []
+        while self._heap and len(live) < k:
+            entry = heapq.heappop(self._heap)
+            if entry[4] is not self._REMOVED:
+                live.append(entry)
+        for entry in live:
+            heapq.heappush(self._heap, entry)
+        return [entry[4] for entry in live]
+
+    def update_priority(self, evidence_id: str, score: float) -> bool:
+        entry = self._entries.get(evidence_id)
+        if entry is None:
+            return False
+        evidence = entry[4]
+        entry[4] = self._REMOVED
+        new_entry = [-score, entry[1], next(self._counter), evidence_id, evidence]  # ties keep arrival order
+        self._entries[evidence_id] = new_entry
+        heapq.heappush(self._heap, new_entry)
+        self._maybe_compact()
+        return True
+
+    def cancel(self, evidence_id: str) -> bool:
+        entry = self._entries.pop(evidence_id, None)
+        if entry is None:
+            return False
+        entry[4] = self._REMOVED
+        self._maybe_compact()
+        return True
+
+    def get(self, evidence_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(evidence_id)
+        return entry[4] if entry is not None else None
+
+    def items(self) -> List[Dict[str, Any]]:
+        return [entry[4] for entry in self._entries.values()]
+
+    def _pop_entry(self) -> Optional[list]:
+        """Pop the best live heap entry (raw), or None when empty."""
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if entry[4] is not self._REMOVED:
+                del self._entries[entry[3]]
+                return entry
+        return None
+
+    def _reinsert(self, entry: list):
+        """Put back an entry returned by _pop_entry(), keeping its place."""
+        self._entries[entry[3]] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _maybe_compact(self):
+        """Rebuild the heap once dead entries outnumber live ones."""
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._entries):
+            self._heap = [e for e in self._heap if e[4] is not self._REMOVED]
+            heapq.heapify(self._heap)
+
+
+class _SourceState:
+    """
+    Per-source queue, admission bucket and counters used by Triage.
+    """
+    __slots__ = ("name", "queue", "bucket", "weight", "finish", "active",
+                 "admitted", "rejected", "processed", "waits")
+
+    def __init__(self, name: str, weight: float, bucket: Optional[TokenBucket], wait_samples: int):
+        self.name = name
+        self.queue = EvidencePriorityQueue()
+        self.bucket = bucket
+        self.weight = weight
+        self.finish = 0.0  # virtual finish tag of the last item served
+        self.active = False  # has an entry in Triage._active
+        self.admitted = 0
+        self.rejected = 0
+        self.processed = 0
+        self.waits = deque(maxlen=wait_samples)
+
+
+def _check_weight(source: str, weight: float) -> float:
+    if not weight > 0:  # also rejects NaN
+        raise ValueError(f"Weight for source {source!r} must be positive, got {weight!r}")
+    return weight
+
+
+def evidence_source(evidence: Dict[str, Any]) -> str:
+    return evidence.get("source") or (evidence.get("metadata") or {}).get("source") or "unknown"
+
+
+def _percentile(samples, q: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
 
 class Triage:
     """
     Prioritizes incoming evidence for evaluation by TruthEngine.
-    Implements weighted truth triage to prevent saturation attacks.
+    Implements weighted truth triage to prevent saturation attacks:
+
+    - admission control: with source_rate set, each source gets a token
+      bucket (source_rate/sec, source_burst deep) and excess evidence is rejected
+    - weighted fair queuing: every source has its own priority queue and
+      batches are drawn across sources by virtual finish time, so a flood
+      from one source only ever costs the others their fair share
+    - priority aging: effective priority is score + aging_rate * seconds
+      waited; stored as a static key so aging adds no per-item work
     """
-    def __init__(self, max_concurrent: int = 5):
+    def __init__(self, max_concurrent: int = 5, source_rate: Optional[float] = None,
+                 source_burst: Optional[float] = None, source_weights: Optional[Dict[str, float]] = None,
+                 aging_rate: float = 0.0, wait_samples: int = 1024,
+                 clock: Callable[[], float] = time.monotonic):
         self.max_concurrent = max_concurrent
-        self.queue: List[Dict[str, Any]] = []
+        self.source_rate = source_rate
+        self.source_burst = source_burst
+        self._sources: Dict[str, _SourceState] = {}
+        self.source_weights = source_weights or {}
+        self.aging_rate = aging_rate
+        self.wait_samples = wait_samples
+        self.clock = clock
+        self._epoch = clock()
+        self._index: Dict[str, Tuple[str, float]] = {}  # evidence_id -> (source, enqueued_at)
+        self._active: List[tuple] = []  # heap of (virtual finish tag, seq, source)
+        self._vtime = 0.0
+        self._seq = itertools.count()
+        self._auto_ids = itertools.count()
+
+    @property
+    def source_weights(self) -> Mapping[str, float]:
+        """
+        Fair-queuing weight per source (unlisted sources weigh 1.0); read-only,
+        change it by assigning a new mapping or with set_source_weight()
+        """
+        return MappingProxyType(self._source_weights)
+
+    @source_weights.setter
+    def source_weights(self, weights: Mapping[str, float]):
+        checked = {name: _check_weight(name, weight) for name, weight in weights.items()}
+        self._source_weights = checked
+        for name, state in self._sources.items():
+            state.weight = checked.get(name, 1.0)
+
+    def set_source_weight(self, source: str, weight: float):
+        """
+        Change one source's weight; applies from the next item it is scheduled for
+        """
+        self._source_weights[source] = _check_weight(source, weight)
+        if source in self._sources:
+            self._sources[source].weight = weight
+
+    @property
+    def queue(self) -> List[Dict[str, Any]]:
+        """
+        Queued evidence in arrival order
+        """
+        return [self._sources[source].queue.get(evidence_id)
+                for evidence_id, (source, _) in self._index.items()]
+
+    def __len__(self) -> int:
+        return len(self._index)
 
-    def add_to_queue(self, evidence: Dict[str, Any]):
+    def add_to_queue(self, evidence: Dict[str, Any]) -> Optional[str]:
         """
-        Adds evidence to triage queue
+        Adds evidence to triage queue; returns the id it is queued under,
+        or None if the source is over its admission rate
         """
-        self.queue.append(evidence)
+        state = self._source(evidence_source(evidence))
+        if state.bucket is not None and not state.bucket.try_acquire():
+            state.rejected += 1
+            return None
+
+        evidence_id = evidence.get("id") or f"evidence_{next(self._auto_ids)}"
+        if evidence_id in self._index:
+            self.cancel(evidence_id)
+        enqueued_at = self.clock() - self._epoch
+        self._index[evidence_id] = (state.name, enqueued_at)
+        state.queue.push(evidence_id, evidence, self._aged(priority_score(evidence), enqueued_at))
+        state.admitted += 1
+        self._activate(state)
+        return evidence_id
+
+    def update_priority(self, evidence_id: str, score: float) -> bool:
+        if evidence_id not in self._index:
+            return False
+        source, enqueued_at = self._index[evidence_id]
+        return self._sources[source].queue.update_priority(evidence_id, self._aged(score, enqueued_at))
+
+    def cancel(self, evidence_id: str) -> bool:
+        if evidence_id not in self._index:
+            return False
+        source, _ = self._index.pop(evidence_id)
+        return self._sources[source].queue.cancel(evidence_id)
 
     def prioritize(self) -> List[Dict[str, Any]]:
         """
-        Sorts queue based on estimated impact (irreversibility * scope)
+        The next batch process_batch would take, without removing it
         """
-        def priority_score(e: Dict[str, Any]):
-            irreversibility = e.get("irreversibility", 0.5)
-            scope = e.get("scope", 0.5)
-            return irreversibility * scope
+        saved = (list(self._active), self._vtime,
+                 {name: (s.finish, s.active) for name, s in self._sources.items()})
+        taken = self._take(self.max_concurrent)
+        for state, entry in reversed(taken):
+            state.queue._reinsert(entry)
+        self._active, self._vtime = saved[0], saved[1]
+        for name, (finish, active) in saved[2].items():
+            self._sources[name].finish, self._sources[name].active = finish, active
+        return [entry[4] for _, entry in taken]
 
-        sorted_queue = sorted(self.queue, key=priority_score, reverse=True)
-        # Return top N for processing
-        return sorted_queue[:self.max_concurrent]
+    def next_batch(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Remove and return the next prioritized batch as (evidence_id, evidence) pairs
+        """
+        now = self.clock() - self._epoch
+        batch = []
+        for state, entry in self._take(self.max_concurrent):
+            evidence_id, evidence = entry[3], entry[4]
+            _, enqueued_at = self._index.pop(evidence_id)
+            state.waits.append(now - enqueued_at)
+            state.processed += 1
+            batch.append((evidence_id, evidence))
+        return batch
 
+    @timed("triage_process_batch")
     def process_batch(self, truth_engine):
         """
         Process prioritized batch through TruthEngine
         """
-        batch = self.prioritize()
-        for ev in batch:
-            ev_id = ev.get("id", f"evidence_{hash(ev)}")
-            truth_engine.add_evidence(ev_id, ev)
-        # Remove processed items
-        self.queue = [e for e in self.queue if e not in batch]
+        for evidence_id, evidence in self.next_batch():
+            truth_engine.add_evidence(evidence_id, evidence)
+
+    def get_source_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-source admission, queue and wait-time (seconds) statistics
+        """
+        return {
+            name: {
+                "weight": s.weight,
+                "queued": len(s.queue),
+                "admitted": s.admitted,
+                "rejected": s.rejected,
+                "processed": s.processed,
+                "wait_p50": _percentile(s.waits, 0.50),
+                "wait_p99": _percentile(s.waits, 0.99)
+            }
+            for name, s in self._sources.items()
+        }
+
+    # ----------------------
+    # Internals
+    # ----------------------
+
+    def _aged(self, score: float, enqueued_at: float) -> float:
+        # score + rate * (now - enqueued_at) orders the same as score - rate * enqueued_at
+        return score - self.aging_rate * enqueued_at
+
+    def _source(self, name: str) -> _SourceState:
+        state = self._sources.get(name)
+        if state is None:
+            bucket = None
+            if self.source_rate is not None:
+                bucket = TokenBucket(self.source_rate, self.source_burst, clock=self.clock)
+            state = _SourceState(name, self._source_weights.get(name, 1.0), bucket, self.wait_samples)
+            self._sources[name] = state
+        return state
+
+    def _activate(self, state: _SourceState):
+        if not state.active:
+            tag = max(self._vtime, state.finish) + 1.0 / state.weight
+            heapq.heappush(self._active, (tag, next(self._seq), state.name))
+            state.active = True
+
+    def _take(self, k: int) -> List[Tuple[_SourceState, list]]:
+        """
+        Pop up to k entries, choosing the source with the smallest virtual finish tag each time.
+        """
+        taken = []
+        while len(taken) < k and self._active:
+            tag, _, name = heapq.heappop(self._active)
+            state = self._sources[name]
+            entry = state.queue._pop_entry()
+            if entry is None:
+                state.active = False
+                continue
+            self._vtime = tag - 1.0 / state.weight
+            state.finish = tag
+            if len(state.queue):
+                heapq.heappush(self._active, (tag + 1.0 / state.weight, next(self._seq), name))
+            else:
+                state.active = False
+            taken.append((state, entry))
+        return taken
@@ -1,9 +1,8 @@
-from typing import Dict, Any
+from itertools import islice
+from typing import Dict, Any, List, Optional, Tuple
 
-from core.oracle import OracleSandbox
-
-oracle = OracleSandbox(model="gpt-4")  # or gpt-3.5-turbo
-truth_engine = TruthEngine(verifier=verifier, oracle=oracle)
+from core.evidence import Evidence, TextStore
+from core.metrics import timed
 
 
 class TruthEngine:
@@ -11,19 +10,24 @@ class TruthEngine:
     Core truth-preservation engine: manages evidence, thresholds,
     catastrophic risk, and high-impact dissemination
     """
-    def __init__(self):
+    def __init__(self, text_store: Optional[TextStore] = None):
         self.truth_capacity: float = 1.0
         self.truth_quality: float = 1.0
-        self.material_evidence_store: Dict[str, Any] = {}
+        self.material_evidence_store: Dict[str, Evidence] = {}
+        self.text_store = text_store  # optional: large evidence content lives on disk
         self.high_impact_threshold: int = 1_000_000
         self.catastrophic_risk_threshold: float = 0.3  # >30% triggers emergency
 
-    def add_evidence(self, evidence_id: str, evidence: Dict[str, Any]):
+    @timed("truth_engine_add_evidence")
+    def add_evidence(self, evidence_id: str, evidence: Dict[str, Any]) -> Evidence:
         """
-        Add evidence to the store and update system metrics
+        Add evidence to the store and update system metrics.
+        Dicts are converted to compact Evidence records; the stored record is returned.
         """
-        self.material_evidence_store[evidence_id] = evidence
-        self._update_metrics(evidence)
+        record = Evidence.from_dict(evidence, evidence_id, self.text_store)
+        self.material_evidence_store[evidence_id] = record
+        self._update_metrics(record)
+        return record
 
     def _update_metrics(self, evidence: Dict[str, Any]):
         """
@@ -41,6 +45,31 @@ class TruthEngine:
         # Capacity decreases slightly with more uncertainty
         self.truth_capacity = max(0.0, self.truth_capacity - 0.01 * len(branch_outputs))
 
+    def find_evidence(self, text: Optional[str] = None, min_affected_agents: int = 0,
+                      source: Optional[str] = None, offset: int = 0, limit: int = 50,
+                      newest_first: bool = True) -> Tuple[int, List[Tuple[str, Evidence]]]:
+        """
+        One page of stored evidence matching the filters, plus the total match count.
+        Single pass over the store; only the requested page is materialised.
+        """
+        items = reversed(self.material_evidence_store.items()) if newest_first else self.material_evidence_store.items()
+        if text is None and not min_affected_agents and source is None:
+            return len(self.material_evidence_store), list(islice(items, offset, offset + limit))
+
+        needle = text.lower() if text else None
+        total, page = 0, []
+        for evidence_id, evidence in items:
+            if evidence.get("affected_agents", 0) < min_affected_agents:
+                continue
+            if source is not None and evidence.get("source") != source:
+                continue
+            if needle and needle not in evidence_id.lower() and needle not in str(evidence.get("description", "")).lower():
+                continue
+            if offset <= total < offset + limit:
+                page.append((evidence_id, evidence))
+            total += 1
+        return total, page
+
     def get_system_state(self):
         """
         Return current metrics for monitoring/logging
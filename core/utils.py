@@ -1,13 +1,15 @@
-import hashlib
+import threading
 import time
-from typing import Any
+from typing import Any, Callable, Optional
+
+from .canonical import digest
 
 def merkle_hash(data: Any) -> str:
     """
-    Simple hash for append-only logging
+    SHA-256 over the canonical encoding, so equal data hashes equally in
+    any process (objects without an encoding are hashed via str())
     """
-    serialized = str(data).encode("utf-8")
-    return hashlib.sha256(serialized).hexdigest()
+    return digest(data, default=str)
 
 def timestamp() -> float:
     return time.time()
@@ -24,3 +26,49 @@ def chunk_list(lst: list, n: int):
     """
     for i in range(0, len(lst), n):
         yield lst[i:i + n]
+
+
+class TokenBucket:
+    """
+    Classic token bucket: refills at `rate` tokens/sec up to `capacity`.
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.clock = clock
+        self.tokens = self.capacity
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        with self._lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def consume(self, tokens: float):
+        """
+        Take tokens unconditionally; the balance may go negative (debt is
+        repaid by refill before the next acquire succeeds). A negative
+        amount refunds tokens, up to capacity
+        """
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - tokens)
+
+    def time_until(self, tokens: float = 1.0) -> float:
+        """
+        Seconds until `tokens` could be acquired (0 if available now)
+        """
+        with self._lock:
+            self._refill()
+            missing = tokens - self.tokens
+            return 0.0 if missing <= 0 else missing / self.rate
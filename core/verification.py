@@ -1,17 +1,20 @@
-from typing import Dict, Any, List
-import random
+from typing import Dict, Any, List, Optional, Sequence, Union
+import numpy as np
 
 class MultiAgentVerification:
     """
     Simplified multi-branch verification system.
     Uses pseudo-independent "agents" (branches) to validate evidence.
+    Branch agreement is drawn from a numpy Generator; pass `seed` for reproducible runs.
     """
-    def __init__(self, branches: List[str] = None):
+    def __init__(self, branches: List[str] = None, seed: Optional[int] = None):
         self.branches = branches or ["analytical", "creative", "conservative"]
+        self.rng = np.random.default_rng(seed)
 
     def evaluate_evidence(self, evidence: Dict[str, Any], high_impact: bool = False) -> Dict[str, float]:
         """
         Returns a dict of quality_delta and capacity_delta based on branch agreement.
+        Raises ValueError if the branch weights sum to zero.
         """
         branch_outputs = evidence.get("branch_outputs", [])
 
@@ -20,10 +23,47 @@ class MultiAgentVerification:
 
         # Compute weighted agreement (simplified)
         total_weight = sum(b.get("weight", 1.0) for b in branch_outputs)
-        agreement_score = sum(b.get("weight", 1.0) * random.uniform(0.8, 1.0) for b in branch_outputs) / total_weight
+        if total_weight == 0:
+            raise ValueError("Branch weights sum to zero; agreement is undefined")
+        draws = self.rng.uniform(0.8, 1.0, size=len(branch_outputs))
+        agreement_score = sum(b.get("weight", 1.0) * float(d) for b, d in zip(branch_outputs, draws)) / total_weight
 
         # Adjust metrics
         quality_delta = (agreement_score - 0.9) * 0.1  # small adjustment
         capacity_delta = -0.01 if high_impact else 0.0
 
         return {"quality_delta": quality_delta, "capacity_delta": capacity_delta}
+
+    def evaluate_batch(self, evidence_batch: Sequence[Dict[str, Any]],
+                       high_impact: Union[bool, Sequence[bool]] = False) -> Dict[str, np.ndarray]:
+        """
+        Vectorized evaluate_evidence over many evidence items.
+
+        Branch weights of the whole batch are flattened into one array and
+        reduced per item with bincount, so the only Python-level work is
+        reading the weights out of the dicts. Returns arrays aligned with
+        evidence_batch; with the same seed the values match calling
+        evaluate_evidence item by item. Like evaluate_evidence, raises
+        ValueError (before drawing anything) if an item's branch weights
+        sum to zero.
+        """
+        n = len(evidence_batch)
+        counts = np.fromiter((len(e.get("branch_outputs") or ()) for e in evidence_batch),
+                             dtype=np.int64, count=n)
+        weights = np.fromiter((b.get("weight", 1.0) for e in evidence_batch for b in e.get("branch_outputs") or ()),
+                              dtype=np.float64, count=int(counts.sum()))
+        groups = np.repeat(np.arange(n), counts)
+
+        total_weight = np.bincount(groups, weights=weights, minlength=n)
+        has_branches = counts > 0
+        zero = np.flatnonzero(has_branches & (total_weight == 0))
+        if zero.size:
+            raise ValueError(f"Branch weights sum to zero for item {int(zero[0])}; agreement is undefined")
+        draws = self.rng.uniform(0.8, 1.0, size=weights.size)
+        weighted_agreement = np.bincount(groups, weights=weights * draws, minlength=n)
+        agreement_score = np.divide(weighted_agreement, total_weight, out=np.zeros(n), where=has_branches)
+
+        high_impact = np.broadcast_to(np.asarray(high_impact, dtype=bool), (n,))
+        quality_delta = np.where(has_branches, (agreement_score - 0.9) * 0.1, 0.0)
+        capacity_delta = np.where(has_branches & high_impact, -0.01, 0.0)
+        return {"quality_delta": quality_delta, "capacity_delta": capacity_delta}
@@ -0,0 +1,143 @@
+import json
+import os
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from core.rate_limiter import estimate_text_tokens
+
+Summarizer = Callable[[str, List[Dict[str, Any]]], str]
+
+
+def extractive_summary(digest: str, turns: List[Dict[str, Any]], clip: int = 120) -> str:
+    """
+    Default summarizer: the previous digest plus the opening of each
+    folded turn. Swap in a model-backed summarizer for better digests.
+    """
+    lines = [digest] if digest else []
+    for turn in turns:
+        lines.append(f"User: {_clip(turn['user'], clip)} | AI: {_clip(turn['ai'], clip)}")
+    return "\n".join(lines)
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+class ChatHistory:
+    """
+    Bounded conversation context for ChatInterface.
+
+    Recent turns are kept verbatim in a token-counted sliding window; turns
+    pushed out of the window are folded into a digest every
+    `summarize_every` turns. context() never exceeds max_context_tokens:
+    the digest is capped at summary_tokens (oldest text dropped first) and
+    the window gets the rest. With spill_path set, every turn is also
+    appended to a JSONL file, so the full history is kept out of memory.
+    """
+    def __init__(self, max_context_tokens: int = 3000, summary_tokens: int = 500, summarize_every: int = 8,
+                 summarizer: Optional[Summarizer] = None, spill_path: Optional[str] = None,
+                 count_tokens: Callable[[str], int] = estimate_text_tokens):
+        if summary_tokens >= max_context_tokens:
+            raise ValueError("summary_tokens must leave room for recent turns")
+        self.max_context_tokens = max_context_tokens
+        self.summary_tokens = summary_tokens
+        self.window_tokens = max_context_tokens - summary_tokens
+        self.summarize_every = summarize_every
+        self.summarizer = summarizer or extractive_summary
+        self.count_tokens = count_tokens
+        self.spill_path = spill_path
+        self.window: deque = deque()  # recent turns: {"user", "ai", "tokens"}
+        self._window_used = 0
+        self._evicted: List[Dict[str, Any]] = []  # out of the window, not yet in the digest
+        self.digest = ""
+        self._digest_used = 0
+        self.turn_count = 0
+        if spill_path and os.path.dirname(spill_path):
+            os.makedirs(os.path.dirname(spill_path), exist_ok=True)
+
+    def append(self, user: str, ai: str):
+        turn = {"user": user, "ai": ai}
+        self.turn_count += 1
+        if self.spill_path:
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(turn) + "\n")
+
+        turn["tokens"] = self.count_tokens(user) + self.count_tokens(ai)
+        if turn["tokens"] > self.window_tokens:  # one oversized turn cannot break the budget
+            turn = self._truncate(turn)
+        self.window.append(turn)
+        self._window_used += turn["tokens"]
+        while self._window_used > self.window_tokens:
+            old = self.window.popleft()
+            self._window_used -= old["tokens"]
+            self._evicted.append(old)
+        if len(self._evicted) >= self.summarize_every:
+            self.compact()
+
+    def compact(self):
+        """
+        Fold evicted turns into the digest now (normally done every summarize_every turns)
+        """
+        if not self._evicted:
+            return
+        digest = self.summarizer(self.digest, self._evicted)
+        self._evicted = []
+        self.digest, self._digest_used = self._fit(digest, self.summary_tokens)
+
+    def context(self) -> List[Dict[str, Any]]:
+        """
+        What the agent sees: an optional {"summary": digest} entry followed
+        by the recent turns as {"user", "ai"} dicts, oldest first
+        """
+        out = [{"summary": self.digest}] if self.digest else []
+        out.extend({"user": t["user"], "ai": t["ai"]} for t in self.window)
+        return out
+
+    def context_tokens(self) -> int:
+        return self._digest_used + self._window_used
+
+    def full_history(self) -> Iterator[Dict[str, Any]]:
+        """
+        Every turn ever appended (requires spill_path); streamed from disk
+        """
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return
+        with open(self.spill_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def __len__(self) -> int:
+        return self.turn_count
+
+    # ----------------------
+    # Internals
+    # ----------------------
+
+    def _fit(self, text: str, budget: int):
+        """Trim text from the front until it fits budget tokens; returns (text, tokens)."""
+        tokens = self.count_tokens(text)
+        while tokens > budget and text:
+            # cut proportionally, then re-count; converges in a couple of passes
+            cut = max(1, int(len(text) * (1 - budget / tokens)))
+            text = text[cut:]
+            newline = text.find("\n")
+            if 0 <= newline < len(text) - 1:
+                text = text[newline + 1:]  # keep whole digest lines
+            tokens = self.count_tokens(text)
+        return text, tokens
+
+    def _truncate(self, turn: Dict[str, Any]) -> Dict[str, Any]:
+        half = self.window_tokens // 2
+        user, user_tokens = self._fit_tail(turn["user"], half)
+        ai, ai_tokens = self._fit_tail(turn["ai"], self.window_tokens - user_tokens)
+        return {"user": user, "ai": ai, "tokens": user_tokens + ai_tokens}
+
+    def _fit_tail(self, text: str, budget: int):
+        """Keep the beginning of text within budget tokens."""
+        tokens = self.count_tokens(text)
+        while tokens > budget and text:
+            text = text[:int(len(text) * budget / tokens)]
+            tokens = self.count_tokens(text)
+        return text, tokens
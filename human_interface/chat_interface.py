@@ -1,16 +1,32 @@
+from typing import Any, Dict, List, Optional
+
 from agents.openai_agent import OpenAIAgent
-from core.oracle import OracleSandbox
+from core.oracle import OpenAIOracle
+from .chat_history import ChatHistory, Summarizer
 
 class ChatInterface:
     """
     Human-facing conversational interface.
     No autonomous action. No persistence unless approved.
+
+    The context passed to the agent is bounded by max_context_tokens (see
+    ChatHistory), so the cost of a turn does not grow with the conversation.
     """
 
-    def __init__(self, agent: OpenAIAgent, oracle: OracleSandbox):
+    def __init__(self, agent: OpenAIAgent, oracle: OpenAIOracle, max_context_tokens: int = 3000,
+                 summary_tokens: int = 500, summarizer: Optional[Summarizer] = None,
+                 spill_path: Optional[str] = None):
         self.agent = agent
         self.oracle = oracle
-        self.chat_history = []
+        self.history = ChatHistory(max_context_tokens=max_context_tokens, summary_tokens=summary_tokens,
+                                   summarizer=summarizer, spill_path=spill_path)
+
+    @property
+    def chat_history(self) -> List[Dict[str, Any]]:
+        """
+        The bounded context: digest of older turns plus the recent window
+        """
+        return self.history.context()
 
     def chat(self, user_input: str) -> str:
         # Oracle gate (non-high-impact by default)
@@ -28,5 +44,5 @@ class ChatInterface:
             context=self.chat_history
         )
 
-        self.chat_history.append({"user": user_input, "ai": response})
+        self.history.append(user_input, response)
         return response
@@ -1,26 +1,237 @@
-from typing import List, Dict, Any
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import List, Dict, Any, Iterable, Optional
+
+from core.triage import priority_score
 from core.truth_engine import TruthEngine
 
+# Paths
+REVIEW_DB = "data/review/review_queue.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS review_items (
+    evidence_id  TEXT PRIMARY KEY,
+    priority     REAL NOT NULL,
+    seq          INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    reviewer     TEXT,
+    lease_token  TEXT,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    enqueued_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS review_items_order ON review_items (priority DESC, seq);
+CREATE INDEX IF NOT EXISTS review_items_seq ON review_items (seq);
+"""
+
+
 class ReviewQueue:
     """
     Holds evidence requiring human review.
+
+    Backed by SQLite (WAL) and keyed by evidence id; only ids are stored,
+    evidence is looked up in the TruthEngine when an item is claimed.
+    Reviewers claim batches under a lease: a claimed item is hidden until
+    it is acked (done), nacked (returned) or its lease expires, at which
+    point another reviewer can claim it. Claims take the highest priority
+    first, then arrival order, and run in a write transaction so
+    concurrent reviewers (threads or processes) never get the same item.
+
+    The queue lives in REVIEW_DB by default, so it survives restarts and
+    is shared between processes; pass db_path=":memory:" for a private,
+    throwaway queue (tests).
     """
-    def __init__(self, truth_engine: TruthEngine):
-        self.queue: List[Dict[str, Any]] = []
+    def __init__(self, truth_engine: Optional[TruthEngine] = None, db_path: str = REVIEW_DB,
+                 lease_seconds: float = 300.0, clock=time.time):
         self.truth_engine = truth_engine
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.clock = clock
+        in_memory = db_path == ":memory:"
+        if not in_memory and os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30.0, isolation_level=None,
+                                     check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            if not in_memory:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
 
-    def add_to_queue(self, evidence_id: str):
-        evidence = self.truth_engine.material_evidence_store.get(evidence_id)
-        if not evidence:
-            return {"status": "error", "message": "Evidence not found"}
+    # ----------------------
+    # Producers
+    # ----------------------
 
-        self.queue.append(evidence)
+    def add_to_queue(self, evidence_id: str, priority: Optional[float] = None):
+        """
+        Queue evidence for review; re-adding a queued id only updates its priority
+        """
+        if priority is None:
+            evidence = self._lookup(evidence_id)
+            if evidence is None:
+                return {"status": "error", "message": "Evidence not found"}
+            priority = priority_score(evidence)
+        self.add_many([(evidence_id, priority)])
         return {"status": "success", "message": f"Evidence {evidence_id} queued for review"}
 
-    def get_next_for_review(self):
-        if not self.queue:
+    def add_many(self, items: Iterable[tuple]) -> int:
+        """
+        Queue (evidence_id, priority) pairs in one transaction; returns the count
+        """
+        now = self.clock()
+        items = list(items)
+        with self._transaction() as cur:
+            start = cur.execute("SELECT COALESCE(MAX(seq), 0) FROM review_items").fetchone()[0]
+            cur.executemany(
+                "INSERT INTO review_items (evidence_id, priority, seq, available_at, enqueued_at) "
+                "VALUES (?, ?, ?, 0, ?) "
+                "ON CONFLICT(evidence_id) DO UPDATE SET priority = excluded.priority",
+                [(evidence_id, float(priority), start + i + 1, now) for i, (evidence_id, priority) in enumerate(items)])
+        return len(items)
+
+    # ----------------------
+    # Reviewers
+    # ----------------------
+
+    def claim(self, reviewer: str, limit: int = 10, lease_seconds: Optional[float] = None,
+              with_evidence: bool = True) -> List[Dict[str, Any]]:
+        """
+        Lease up to `limit` of the highest-priority available items to reviewer.
+        Each item carries the lease_token needed to ack/nack/extend it.
+        """
+        now = self.clock()
+        expires = now + (lease_seconds if lease_seconds is not None else self.lease_seconds)
+        token = uuid.uuid4().hex
+        with self._transaction() as cur:
+            rows = cur.execute(
+                "SELECT evidence_id, priority, attempts FROM review_items "
+                "WHERE available_at <= ? ORDER BY priority DESC, seq LIMIT ?", (now, limit)).fetchall()
+            cur.executemany(
+                "UPDATE review_items SET available_at = ?, reviewer = ?, lease_token = ?, attempts = attempts + 1 "
+                "WHERE evidence_id = ?", [(expires, reviewer, token, row[0]) for row in rows])
+        claimed = []
+        for evidence_id, priority, attempts in rows:
+            item = {"evidence_id": evidence_id, "priority": priority, "lease_token": token,
+                    "lease_expires": expires, "attempts": attempts + 1}
+            if with_evidence:
+                item["evidence"] = self._lookup(evidence_id)
+            claimed.append(item)
+        return claimed
+
+    def ack(self, evidence_id: str, lease_token: str) -> bool:
+        """
+        Mark a claimed item reviewed. False if the lease was lost (expired and reclaimed).
+        """
+        with self._transaction() as cur:
+            cur.execute("DELETE FROM review_items WHERE evidence_id = ? AND lease_token = ?",
+                        (evidence_id, lease_token))
+            return cur.rowcount == 1
+
+    def nack(self, evidence_id: str, lease_token: str, delay: float = 0.0,
+             priority: Optional[float] = None) -> bool:
+        """
+        Give a claimed item back, optionally after `delay` seconds and with a new priority
+        """
+        with self._transaction() as cur:
+            cur.execute(
+                "UPDATE review_items SET available_at = ?, reviewer = NULL, lease_token = NULL, "
+                "priority = COALESCE(?, priority) WHERE evidence_id = ? AND lease_token = ?",
+                (self.clock() + delay, priority, evidence_id, lease_token))
+            return cur.rowcount == 1
+
+    def extend_lease(self, evidence_id: str, lease_token: str, lease_seconds: Optional[float] = None) -> bool:
+        expires = self.clock() + (lease_seconds if lease_seconds is not None else self.lease_seconds)
+        with self._transaction() as cur:
+            cur.execute("UPDATE review_items SET available_at = ? WHERE evidence_id = ? AND lease_token = ?",
+                        (expires, evidence_id, lease_token))
+            return cur.rowcount == 1
+
+    def get_next_for_review(self, reviewer: str = "default"):
+        """
+        Remove and return the evidence of the highest-priority item.
+        The item is claimed and acked in one go, so it does not come back;
+        reviewers who may fail midway should use claim() and ack() instead.
+        """
+        items = self.claim(reviewer, limit=1)
+        if not items:
             return None
-        return self.queue.pop(0)
+        item = items[0]
+        self.ack(item["evidence_id"], item["lease_token"])
+        return item["evidence"] or {"id": item["evidence_id"]}
+
+    # ----------------------
+    # Inspection
+    # ----------------------
+
+    @property
+    def queue(self) -> List[Dict[str, Any]]:
+        """
+        Evidence of every queued item (leased included) in review order.
+        Items whose evidence is not in the TruthEngine appear as {"id": ...}.
+        """
+        return [self._lookup(evidence_id) or {"id": evidence_id} for evidence_id in self.queued_ids()]
+
+    def queued_ids(self) -> List[str]:
+        """
+        Ids of every queued item (leased included) in review order
+        """
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT evidence_id FROM review_items ORDER BY priority DESC, seq")]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM review_items").fetchone()[0]
 
     def get_queue_state(self):
-        return {"pending_count": len(self.queue)}
+        now = self.clock()
+        with self._lock:
+            total, leased = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(available_at > ? AND lease_token IS NOT NULL), 0) "
+                "FROM review_items", (now,)).fetchone()
+        return {"pending_count": total - leased, "leased_count": leased}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ----------------------
+    # Internals
+    # ----------------------
+
+    def _lookup(self, evidence_id: str) -> Optional[Dict[str, Any]]:
+        if self.truth_engine is None:
+            return None
+        return self.truth_engine.material_evidence_store.get(evidence_id)
+
+    def _transaction(self):
+        return _Transaction(self._conn, self._lock)
+
+
+class _Transaction:
+    """
+    BEGIN IMMEDIATE ... COMMIT under the in-process lock; the immediate
+    write lock is what keeps other processes from claiming the same rows.
+    """
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock):
+        self.conn = conn
+        self.lock = lock
+
+    def __enter__(self) -> sqlite3.Cursor:
+        self.lock.acquire()
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self.lock.release()
+            raise
+        return self.conn.cursor()
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.lock.release()
+        return False
@@ -1,81 +1,70 @@
 # main.py
-import os
-import time
-from core.truth_engine import TruthEngine
-from core.oracle import OracleSandbox
-from core.triage import Triage
-from agents.openai_agent import OpenAIAgent
-from core.utils import load_openai_key
-
-# ----------------------------
-# Load API keys
-# ----------------------------
-OPENAI_API_KEY = load_openai_key("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    raise ValueError("OpenAI API key not found. Set it in your environment variables.")
+"""
+Batch / streaming evidence ingestion for TRUTHAL.
 
-# ----------------------------
-# Instantiate core systems
-# ----------------------------
-oracle = OracleSandbox(api_key=OPENAI_API_KEY)
-truth_engine = TruthEngine(verifier=None, oracle=oracle)  # Replace None if MultiAgentVerification is implemented
-triage_system = Triage()  # Handles prioritization of incoming evidence
-openai_agent = OpenAIAgent(api_key=OPENAI_API_KEY)
+Reads JSONL evidence (one object per line) from a file or stdin and pushes
+it through TruthEngine, Triage and dissemination:
 
-# ----------------------------
-# Simulation loop
-# ----------------------------
-evidence_counter = 1
+    python main.py evidence.jsonl
+    cat evidence.jsonl | python main.py --output results.jsonl
+    python main.py evidence.jsonl --shards 8   # evidence store split over 8 processes
+"""
+import argparse
+import json
+import sys
 
-print("[INFO] TRUTHAL system initialized. Enter 'quit' to stop the loop.")
-
-while True:
-    # ------------------------
-    # Step 1: Accept new evidence input
-    # ------------------------
-    content = input("\nEnter evidence content (or 'quit' to exit): ")
-    if content.lower() == "quit":
-        print("[INFO] Exiting TRUTHAL loop.")
-        break
+from core import metrics
+from core.truth_engine import TruthEngine
+from core.triage import Triage
+from core.ingest import IngestPipeline, iter_jsonl
 
-    # Example: number of affected agents is simulated or user-defined
-    affected_agents_input = input("Enter number of affected agents (default 1000): ")
-    affected_agents = int(affected_agents_input) if affected_agents_input.isdigit() else 1000
 
-    evidence_id = f"evidence_{evidence_counter:03d}"
-    evidence_data = {
-        "content": content,
-        "affected_agents": affected_agents,
-        "metadata": {"source": "user_input", "confidence": 0.9}
-    }
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay JSONL evidence through the TRUTHAL pipeline.")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL evidence file ('-' for stdin)")
+    parser.add_argument("--output", help="write one dissemination result per line to this file")
+    parser.add_argument("--batch-size", type=int, default=64, help="evidence per triage batch")
+    parser.add_argument("--queue-size", type=int, default=1024, help="bound of each inter-stage queue")
+    parser.add_argument("--metrics-file", help="write per-stage latency histograms (Prometheus text) here")
+    parser.add_argument("--shards", type=int, default=0,
+                        help="partition the evidence store across this many worker processes (0 = in-process)")
+    args = parser.parse_args(argv)
+    if args.metrics_file:
+        metrics.enable()
 
-    # ------------------------
-    # Step 2: Add evidence to TruthEngine
-    # ------------------------
-    print(f"[INFO] Adding evidence {evidence_id}...")
-    truth_engine.add_evidence(evidence_id, evidence_data)
+    # ----------------------------
+    # Instantiate core systems
+    # ----------------------------
+    if args.shards:
+        from core.sharded_engine import ShardedTruthEngine
+        truth_engine = ShardedTruthEngine(args.shards)
+    else:
+        truth_engine = TruthEngine()
+    triage_system = Triage(max_concurrent=args.batch_size)  # Handles prioritization of incoming evidence
 
-    # ------------------------
-    # Step 3: Run triage (priority weighting)
-    # ------------------------
-    prioritized_list = triage_system.rank([evidence_data])
-    for ev in prioritized_list:
-        # Auto-disseminate based on priority
-        response = truth_engine.disseminate(evidence_id)
-        print(f"[DISSEMINATION RESPONSE] {response}")
+    out = open(args.output, "w", encoding="utf-8") if args.output else None
+    on_result = (lambda result: out.write(json.dumps(result) + "\n")) if out else None
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    errors = {}
+    try:
+        pipeline = IngestPipeline(truth_engine, triage_system, queue_size=args.queue_size, on_result=on_result)
+        stats = pipeline.run(iter_jsonl(source, errors))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out:
+            out.close()
 
-    # ------------------------
-    # Step 4: Query agent for verification / summarization
-    # ------------------------
-    agent_question = f"Summarize and verify: {content}"
-    agent_response = openai_agent.query(agent_question)
-    print(f"[AGENT RESPONSE] {agent_response}")
+    stats["parse_errors"] = errors.get("parse_errors", 0)
+    stats["system_state"] = truth_engine.get_system_state()
+    if args.shards:
+        truth_engine.close()
+    print(f"[INFO] Ingested {stats['stored']} evidence items in {stats['elapsed_s']:.2f}s "
+          f"({stats['items_per_sec']:.0f} items/s)", file=sys.stderr)
+    print(json.dumps(stats, indent=2))
+    if args.metrics_file:
+        metrics.write_prometheus(args.metrics_file)
 
-    # ------------------------
-    # Step 5: Log system state
-    # ------------------------
-    state = truth_engine.get_system_state()
-    print(f"[SYSTEM STATE] {state}")
 
-    evidence_counter += 1
-    time.sleep(0.5)  # Prevents console flooding, adjustable
+if __name__ == "__main__":
+    main()
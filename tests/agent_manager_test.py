@@ -0,0 +1,89 @@
+import threading
+import time
+import unittest
+from agents.agent_manager import AgentManager
+
+
+class FakeAgent:
+    def __init__(self, name, delay, confidence=0.9, delays=None):
+        self.name = name
+        self.delay = delay
+        self.delays = list(delays or [])
+        self.confidence = confidence
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def evaluate(self, prompt):
+        with self._lock:
+            self.calls += 1
+            delay = self.delays.pop(0) if self.delays else self.delay
+        time.sleep(delay)
+        return {"answer": f"{self.name}: {prompt}", "confidence": self.confidence,
+                "rationale": "fake", "metadata": {"agent": self.name}}
+
+
+class BrokenAgent:
+    def evaluate(self, prompt):
+        raise RuntimeError("api down")
+
+
+class AgentManagerTest(unittest.TestCase):
+
+    def test_agents_run_concurrently(self):
+        manager = AgentManager(FakeAgent("a", 0.2), FakeAgent("b", 0.2), FakeAgent("c", 0.2))
+        start = time.monotonic()
+        results = manager.evaluate_all("q")
+        self.assertLess(time.monotonic() - start, 0.45)
+        self.assertEqual([r["metadata"]["agent"] for r in results], ["a", "b", "c"])
+
+    def test_quorum_returns_with_fastest_adequate_agent(self):
+        manager = AgentManager(FakeAgent("fast_unsure", 0.0, confidence=0.3),
+                               FakeAgent("fast_sure", 0.05, confidence=0.95),
+                               FakeAgent("slow", 1.0), quorum_confidence=0.9)
+        start = time.monotonic()
+        results = manager.evaluate_all("q")
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(results[2]["metadata"]["status"], "cancelled")
+        self.assertEqual(manager.aggregate(results)["metadata"]["agent"], "fast_sure")
+
+    def test_hedged_request_beats_slow_primary(self):
+        flaky = FakeAgent("flaky", 0.0, delays=[1.0])  # first call hangs, hedge is instant
+        manager = AgentManager(FakeAgent("a", 0.0), FakeAgent("b", 0.0), flaky, hedge_after=0.05)
+        start = time.monotonic()
+        results = manager.evaluate_all("q")
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(results[2]["metadata"]["agent"], "flaky")
+        self.assertEqual(flaky.calls, 2)
+        self.assertEqual(manager.stats["hedges_won"], 1)
+
+    def test_failures_become_placeholders(self):
+        manager = AgentManager(BrokenAgent(), FakeAgent("b", 0.0), FakeAgent("c", 0.0))
+        results = manager.evaluate_all("q")
+        self.assertEqual(results[0]["metadata"]["status"], "error")
+        self.assertIsNone(results[0]["answer"])
+
+    def test_hung_agent_does_not_starve_the_others(self):
+        release = threading.Event()
+        hung = FakeAgent("hung", 0.0)
+        answer = hung.evaluate
+        hung.evaluate = lambda prompt: release.wait() and answer(prompt)
+        manager = AgentManager(hung, FakeAgent("b", 0.0), FakeAgent("c", 0.0), hedge_after=0.01, max_in_flight=2)
+        self.addCleanup(release.set)
+        statuses = []
+        for _ in range(3):
+            results = manager.evaluate_all("q", timeout=0.1)
+            self.assertEqual([r["metadata"]["agent"] for r in results[1:]], ["b", "c"])
+            statuses.append(results[0]["metadata"]["status"])
+        self.assertEqual(statuses, ["timeout", "overloaded", "overloaded"])
+        self.assertEqual(manager.stats["hedges_sent"], 1)
+        self.assertEqual(manager.stats["overloaded"], 2)
+
+        release.set()
+        deadline = time.monotonic() + 2
+        while manager._in_flight[0] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(manager.evaluate_all("q", timeout=0.1)[0]["metadata"]["agent"], "hung")
+
+
+if __name__ == "__main__":
+    unittest.main()
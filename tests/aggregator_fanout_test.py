@@ -0,0 +1,60 @@
+import time
+import unittest
+from agents.aggregator import Aggregator, Branch
+from core.truth_engine import TruthEngine
+
+
+def slow_completion(delays):
+    def create(model=None, messages=None, **params):
+        prompt = messages[0]["content"]
+        for marker, delay in delays.items():
+            if prompt.startswith(marker):
+                if delay is None:
+                    raise RuntimeError("upstream failure")
+                time.sleep(delay)
+        return {"choices": [{"message": {"content": f"answer from {prompt.split()[0]}"}}]}
+    return create
+
+
+class AggregatorFanoutTest(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = TruthEngine()
+
+    def test_concurrent_latency_is_slowest_branch(self):
+        fn = slow_completion({"a": 0.2, "b": 0.2, "c": 0.2})
+        aggregator = Aggregator(self.engine, concurrent=True)
+        for name in "abc":
+            aggregator.add_branch(Branch(name, 1.0, name, completion_fn=fn))
+        start = time.monotonic()
+        result = aggregator.evaluate("is water wet?")
+        elapsed = time.monotonic() - start
+        self.assertLess(elapsed, 0.5, "Branches should be queried concurrently")
+        self.assertEqual([o["status"] for o in result["branch_outputs"]], ["ok", "ok", "ok"])
+
+    def test_missed_deadline_and_errors_are_recorded(self):
+        fn = slow_completion({"fast": 0.0, "slow": 1.0, "broken": None})
+        aggregator = Aggregator(self.engine, concurrent=True)
+        aggregator.add_branch(Branch("fast", 1.0, "fast", completion_fn=fn))
+        aggregator.add_branch(Branch("slow", 1.0, "slow", timeout=0.1, completion_fn=fn))
+        aggregator.add_branch(Branch("broken", 1.0, "broken", completion_fn=fn))
+        start = time.monotonic()
+        result = aggregator.evaluate("claim")
+        self.assertLess(time.monotonic() - start, 0.5, "Should not wait past the slow branch deadline")
+
+        statuses = {o["name"]: o["status"] for o in result["branch_outputs"]}
+        self.assertEqual(statuses, {"fast": "ok", "slow": "timeout", "broken": "error"})
+        self.assertIn("[fast]", result["aggregated_response"])
+        self.assertNotIn("[slow]", result["aggregated_response"])
+        self.assertIn("claim", self.engine.material_evidence_store)
+
+    def test_sequential_mode_unchanged(self):
+        fn = slow_completion({})
+        aggregator = Aggregator(self.engine)
+        aggregator.add_branch(Branch("a", 0.5, "a", completion_fn=fn))
+        result = aggregator.evaluate("claim")
+        self.assertEqual(result["aggregated_response"], "[a] answer from a")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import threading
+import time
+import unittest
+from core.oracle import OracleSandbox, PendingApprovalStore
+
+
+class PendingApprovalStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.store = PendingApprovalStore(max_workers=4)
+        self.addCleanup(self.store.close)
+
+    def add(self, question):
+        return self.store.add({"question": question, "evidence": None, "eval": None})
+
+    def test_decisions_are_applied_by_request_id(self):
+        a, b, c = self.add("qa"), self.add("qb"), self.add("qc")
+        results = self.store.decide({c: True, a: False}, lambda q: f"answer to {q}")
+        self.assertEqual([(r["request_id"], r["status"]) for r in results], [(c, "approved"), (a, "rejected")])
+        self.assertEqual(results[0]["answer"], "answer to qc")
+        self.assertIsNone(results[1]["answer"])
+        self.assertEqual(self.store.ids(), [b])
+
+    def test_unknown_or_already_decided_ids(self):
+        a = self.add("q")
+        self.store.decide({a: True}, str.upper)
+        results = self.store.decide({a: True, "nope": False}, str.upper)
+        self.assertEqual([r["status"] for r in results], ["not_found", "not_found"])
+
+    def test_each_distinct_question_is_answered_once(self):
+        calls = []
+        ids = [self.add("same question") for _ in range(50)]
+        results = self.store.decide(dict.fromkeys(ids, True), lambda q: calls.append(q) or "yes")
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(r["answer"] == "yes" for r in results))
+
+    def test_answers_are_generated_concurrently(self):
+        ids = [self.add(f"q{i}") for i in range(8)]
+
+        def slow(q):
+            time.sleep(0.05)
+            return q
+
+        start = time.perf_counter()
+        self.store.decide(dict.fromkeys(ids, True), slow)
+        self.assertLess(time.perf_counter() - start, 0.3)
+
+    def test_enqueue_during_bulk_approval(self):
+        first = [self.add(f"q{i}") for i in range(2000)]
+        added = []
+
+        def producer():
+            for i in range(2000):
+                added.append(self.add(f"late{i}"))
+
+        t = threading.Thread(target=producer)
+        t.start()
+        results = self.store.decide(dict.fromkeys(first, True), lambda q: q)
+        t.join()
+        self.assertTrue(all(r["status"] == "approved" for r in results))
+        self.assertEqual(self.store.ids(), added)
+
+    def test_bulk_approve_10k(self):
+        ids = [self.add(f"q{i}") for i in range(10_000)]
+        start = time.perf_counter()
+        results = self.store.decide(dict.fromkeys(ids, True), lambda q: q)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(results), 10_000)
+        self.assertEqual(len(self.store), 0)
+        self.assertLess(elapsed, 2.0)
+
+    def test_failed_answers_leave_items_pending(self):
+        ids = [self.add(f"q{i}") for i in range(6)]
+
+        def flaky(q):
+            if q == "q3":
+                raise RuntimeError("model down")
+            return q
+
+        with self.assertRaises(RuntimeError):
+            self.store.decide({ids[1]: False, ids[3]: True, ids[4]: True}, flaky)
+        self.assertEqual(sorted(self.store.ids()), sorted(ids))
+        results = self.store.decide({ids[1]: False, ids[3]: True}, str.upper)
+        self.assertEqual([r["status"] for r in results], ["rejected", "approved"])
+
+
+class OracleSandboxApprovalTest(unittest.TestCase):
+
+    def test_high_impact_queries_wait_for_approval(self):
+        oracle = OracleSandbox()
+        self.addCleanup(oracle.close)
+        first = oracle.query("release a?", high_impact=True)
+        second = oracle.query("release b?", high_impact=True)
+        third = oracle.query("release c?", high_impact=True)
+        self.assertEqual(first["status"], "awaiting_human_approval")
+        self.assertEqual(len(oracle.human_approval_queue), 3)
+
+        results = oracle.approve([first["request_id"]])
+        self.assertEqual(results[0]["answer"], "[ORACLE RESPONSE] release a?")
+        self.assertEqual(oracle.reject([second["request_id"]])[0]["status"], "rejected")
+        self.assertEqual([r["request_id"] for r in oracle.approve_all()], [third["request_id"]])
+        self.assertEqual(oracle.human_approval_queue, [])
+        self.assertEqual(oracle.get_audit_log()[-1]["data"], {"human_decisions": {third["request_id"]: "approved"}})
+
+    def test_legacy_list_of_booleans(self):
+        oracle = OracleSandbox()
+        self.addCleanup(oracle.close)
+        ids = [oracle.query(f"q{i}", high_impact=True)["request_id"] for i in range(3)]
+        results = oracle.approve_human_queue([True, False])
+        self.assertEqual([(r["request_id"], r["status"]) for r in results],
+                         [(ids[0], "approved"), (ids[1], "rejected")])
+        self.assertEqual([item["request_id"] for item in oracle.human_approval_queue], [ids[2]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from core.audit_index import AuditIndex, date_start
+from core.audit_log import SegmentedAuditLog, list_segments
+
+
+class AuditIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.audit_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.audit_dir, ignore_errors=True)
+
+    def fill(self, log, days=3, per_day=40):
+        for d in range(days):
+            date_str = f"2024-03-0{d + 1}"
+            for i in range(per_day):
+                log.append({"evidence_id": f"ev-{i % 10}", "status": "error" if i % 7 == 0 else "success",
+                            "timestamp": date_start(date_str) + i * 60, "n": d * per_day + i}, date_str=date_str)
+
+    def test_lookups_by_id_time_and_status(self):
+        log = SegmentedAuditLog(self.audit_dir, max_segment_bytes=1000)
+        self.fill(log)
+        self.assertGreater(len(list_segments(self.audit_dir, "2024-03-02")), 1)
+
+        by_id = log.query(evidence_id="ev-3")
+        self.assertEqual([e["n"] for e in by_id], [n for n in range(120) if n % 40 % 10 == 3])
+        window = log.query(start=datetime(2024, 3, 2, 0, 10), end=datetime(2024, 3, 2, 0, 15))
+        self.assertEqual([e["n"] for e in window], [50, 51, 52, 53, 54])
+        errors = log.query(status="error", start=date_start("2024-03-03"))
+        self.assertEqual([e["n"] for e in errors], [80, 87, 94, 101, 108, 115])
+        self.assertEqual([e["n"] for e in log.query(evidence_id="ev-0", newest_first=True, limit=2)], [110, 100])
+        log.close()
+
+    def test_existing_segments_are_indexed_on_open(self):
+        log = SegmentedAuditLog(self.audit_dir, index=False)
+        self.fill(log, days=2, per_day=20)
+        log.append({"evidence_id": "no-timestamp"}, date_str="2024-03-02")
+        log.close()
+        with open(list_segments(self.audit_dir, "2024-03-02")[-1], "a") as f:
+            f.write('{"evidence_id": "torn"')  # interrupted write
+
+        reopened = SegmentedAuditLog(self.audit_dir)
+        self.assertEqual(reopened.index.stats()["entries"], 41)
+        self.assertEqual(len(reopened.query(evidence_id="ev-5")), 4)
+        self.assertEqual(reopened.query(evidence_id="no-timestamp"), [{"evidence_id": "no-timestamp"}])
+        self.assertEqual(reopened.query(evidence_id="torn"), [])
+        reopened.close()
+
+    def test_rebuild_over_a_corrupt_line(self):
+        log = SegmentedAuditLog(self.audit_dir, index=False)
+        log.append({"evidence_id": "a", "timestamp": 10}, date_str="2024-03-01")
+        log.close()
+        segment = list_segments(self.audit_dir, "2024-03-01")[-1]
+        with open(segment, "a", encoding="utf-8") as f:
+            f.write('{"evidence_id": "b", "ti{"evidence_id": "c"}\n')  # torn write merged with the next line
+            f.write('{"evidence_id": "d", "timestamp": 20}\n')
+
+        index = AuditIndex(self.audit_dir)
+        self.assertEqual(index.catch_up(), 2)
+        self.assertEqual([e["evidence_id"] for e in index.query(start=0)], ["a", "d"])
+        self.assertEqual(index.query(evidence_id="d"), [{"evidence_id": "d", "timestamp": 20}])
+
+        with open(segment, "r+b") as f:  # an indexed line damaged afterwards
+            f.write(b"#")
+        self.assertEqual([e["evidence_id"] for e in index.query(start=0)], ["d"])
+
+    def test_unflushed_rows_are_recovered_after_a_crash(self):
+        log = SegmentedAuditLog(self.audit_dir, commit_every=1000, commit_interval=3600)
+        self.fill(log, days=1, per_day=30)
+        # no close(): index rows were never flushed
+        index = AuditIndex(self.audit_dir)
+        self.assertEqual(index.stats()["entries"], 0)
+        self.assertEqual(index.catch_up(), 30)
+        self.assertEqual(index.segments_between(date_start("2024-03-01"), date_start("2024-03-02")),
+                         [os.path.basename(p) for p in list_segments(self.audit_dir, "2024-03-01")])
+        self.assertEqual(len(index.query(evidence_id="ev-1")), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
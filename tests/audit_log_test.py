@@ -0,0 +1,117 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from core.audit_log import SegmentedAuditLog, iter_audit_entries, list_segments, migrate_legacy_audit_files
+
+
+class AuditLogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.audit_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.audit_dir, ignore_errors=True)
+
+    def test_append_and_stream(self):
+        log = SegmentedAuditLog(self.audit_dir)
+        for i in range(5):
+            log.append({"i": i}, date_str="2024-01-01")
+        entries = list(iter_audit_entries("2024-01-01", audit_dir=self.audit_dir))
+        self.assertEqual([e["i"] for e in entries], list(range(5)))
+        log.close()
+
+    def test_segments_rotate_by_size(self):
+        log = SegmentedAuditLog(self.audit_dir, max_segment_bytes=200)
+        for i in range(50):
+            log.append({"i": i, "payload": "x" * 20}, date_str="2024-01-01")
+        log.close()
+        segments = list_segments(self.audit_dir, "2024-01-01")
+        self.assertGreater(len(segments), 1, "Log should rotate into several segments")
+        self.assertTrue(all(os.path.getsize(p) <= 200 for p in segments))
+        entries = list(iter_audit_entries("2024-01-01", audit_dir=self.audit_dir))
+        self.assertEqual([e["i"] for e in entries], list(range(50)))
+
+        # A new writer resumes at the last segment instead of starting over
+        reopened = SegmentedAuditLog(self.audit_dir, max_segment_bytes=200)
+        reopened.append({"i": 50}, date_str="2024-01-01")
+        reopened.close()
+        self.assertEqual(len(list(iter_audit_entries("2024-01-01", audit_dir=self.audit_dir))), 51)
+
+    def test_torn_last_line_is_skipped(self):
+        log = SegmentedAuditLog(self.audit_dir)
+        path = log.append({"ok": True}, date_str="2024-01-01")
+        log.close()
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"partial": ')
+        self.assertEqual(list(iter_audit_entries("2024-01-01", audit_dir=self.audit_dir)), [{"ok": True}])
+
+    def test_append_after_torn_write_is_kept(self):
+        log = SegmentedAuditLog(self.audit_dir)
+        log.append({"n": "a"}, date_str="2024-01-01")
+        log.append({"n": "b"}, date_str="2024-01-01")
+        log.close()
+        with open(list_segments(self.audit_dir, "2024-01-01")[-1], "a", encoding="utf-8") as f:
+            f.write('{"n": "c", "pay')  # interrupted write
+
+        reopened = SegmentedAuditLog(self.audit_dir)
+        reopened.append({"n": "d"}, date_str="2024-01-01")
+        reopened.close()
+        entries = list(iter_audit_entries("2024-01-01", audit_dir=self.audit_dir))
+        self.assertEqual([e["n"] for e in entries], ["a", "b", "d"])
+        self.assertEqual([e["n"] for e in SegmentedAuditLog(self.audit_dir).query(start=0)], ["a", "b", "d"])
+
+    def test_migrate_legacy_files(self):
+        legacy = os.path.join(self.audit_dir, "2023-12-31_audit.json")
+        with open(legacy, "w", encoding="utf-8") as f:
+            json.dump([{"n": 1}, {"n": 2}], f, indent=2)
+        log = SegmentedAuditLog(self.audit_dir)
+        self.assertEqual(migrate_legacy_audit_files(log), {"2023-12-31": 2})
+        self.assertEqual(migrate_legacy_audit_files(log), {}, "Second run should be a no-op")
+        self.assertEqual(list(iter_audit_entries("2023-12-31", audit_dir=self.audit_dir)), [{"n": 1}, {"n": 2}])
+        self.assertTrue(os.path.exists(legacy + ".migrated"))
+        log.close()
+
+    def test_migrate_skips_unparseable_files(self):
+        broken = os.path.join(self.audit_dir, "2023-12-30_audit.json")
+        with open(broken, "w", encoding="utf-8") as f:
+            f.write('[{"n": 1}, {"n"')
+        with open(os.path.join(self.audit_dir, "2023-12-31_audit.json"), "w", encoding="utf-8") as f:
+            json.dump([{"n": 3}], f)
+        log = SegmentedAuditLog(self.audit_dir)
+        errors = {}
+        self.assertEqual(migrate_legacy_audit_files(log, remove=True, errors=errors), {"2023-12-31": 1})
+        self.assertEqual(list(errors), [broken])
+        self.assertTrue(os.path.exists(broken), "Unparseable file must be left in place")
+        self.assertEqual(list_segments(self.audit_dir, "2023-12-30"), [])
+        log.close()
+
+    def test_interrupted_migration_is_resumed_without_duplicates(self):
+        legacy = os.path.join(self.audit_dir, "2023-12-31_audit.json")
+        tmp = os.path.join(self.audit_dir, "2023-12-31_audit.migrating")
+        log = SegmentedAuditLog(self.audit_dir)
+        log.append({"n": 0}, date_str="2023-12-31")
+
+        # Crash while writing the temporary file: the legacy file is redone
+        with open(legacy, "w", encoding="utf-8") as f:
+            json.dump([{"n": 1}, {"n": 2}], f)
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write('{"n":1}\n{"n"')
+        self.assertEqual(migrate_legacy_audit_files(log), {"2023-12-31": 2})
+        self.assertFalse(os.path.exists(tmp))
+
+        # Crash after the legacy file was marked migrated: the segment is installed once
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write('{"n":3}\n')
+        self.assertEqual(migrate_legacy_audit_files(log), {})
+        self.assertEqual(migrate_legacy_audit_files(log), {})
+        log.append({"n": 4}, date_str="2023-12-31")
+        log.close()
+        self.assertEqual([e["n"] for e in iter_audit_entries("2023-12-31", audit_dir=self.audit_dir)],
+                         [0, 1, 2, 3, 4])
+        self.assertEqual(SegmentedAuditLog(self.audit_dir).index.stats()["entries"], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from core.canonical import decode, encode, hash_many
+from core.evidence import Evidence
+from core.merkle import TamperEvidentLog, leaf_hash, leaf_hashes
+from core.utils import merkle_hash
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class CanonicalEncodingTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        value = {"s": "évidence", "i": [0, -1, 2 ** 70, -(2 ** 70)], "f": [0.1, -0.0, 1e308],
+                 "b": b"\x00\n", "n": None, "t": True, "nested": {"x": {"y": []}}, 3: "int key"}
+        self.assertEqual(decode(encode(value)), value)
+
+    def test_hashable_keys_and_set_members_round_trip(self):
+        value = {(1, ("a", b"x")): "tuple key", frozenset({1, 2}): "frozenset key",
+                 "s": {frozenset({"x", (1, 2)}), (3, frozenset())}}
+        self.assertEqual(decode(encode(value)), value)
+        nested = [(1, 2), frozenset({3})]
+        self.assertEqual(decode(encode(nested)), [[1, 2], {3}], "Outside keys and sets, tuples decode as lists")
+
+    def test_dict_order_and_mapping_type_do_not_matter(self):
+        a = {"b": 1, "a": {"y": 2.5, "x": [1, 2]}}
+        b = {"a": {"x": [1, 2], "y": 2.5}, "b": 1}
+        self.assertEqual(encode(a), encode(b))
+        record = Evidence.from_dict({"id": "e1", "content": "c", "metadata": {"k": "v"}})
+        self.assertEqual(encode(record), encode(record.to_dict()))
+        self.assertEqual(merkle_hash(a), merkle_hash(b))
+
+    def test_types_are_distinguished(self):
+        encodings = {encode(v) for v in (1, 1.0, True, "1", b"1", [1], None, 0, False, "")}
+        self.assertEqual(len(encodings), 10)
+
+    def test_hash_is_stable_across_processes(self):
+        value = {"z": 1.1, "a": {"q": [3, 2, 1]}, "m": "x"}
+        script = ("from core.utils import merkle_hash; "
+                  "print(merkle_hash({'m': 'x', 'a': {'q': [3, 2, 1]}, 'z': 1.1}))")
+        env = dict(os.environ, PYTHONHASHSEED="123")
+        out = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        self.assertEqual(out, merkle_hash(value))
+
+    def test_unsupported_types_need_a_default(self):
+        with self.assertRaises(TypeError):
+            encode(object())
+        self.assertEqual(decode(encode({"o": object}, default=lambda o: o.__name__)), {"o": "object"})
+
+
+class BatchHashingTest(unittest.TestCase):
+
+    def test_matches_serial_hashing_on_any_executor(self):
+        small = [encode({"i": i}) for i in range(5000)]
+        large = [os.urandom(4096) for _ in range(300)]
+        expected_small = [leaf_hash(p) for p in small]
+        self.assertEqual(leaf_hashes(small, batch_size=256), expected_small)
+        self.assertEqual(hash_many(large, batch_size=32), [hashlib.sha256(p).digest() for p in large])
+        with ThreadPoolExecutor(4) as pool:
+            self.assertEqual(leaf_hashes(small, executor=pool, batch_size=256), expected_small)
+        with ProcessPoolExecutor(2) as pool:
+            self.assertEqual(leaf_hashes(small, executor=pool, batch_size=1000), expected_small)
+
+
+class LogVerificationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.storage_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.storage_dir, ignore_errors=True)
+
+    def test_verify_all_recomputes_root_and_finds_tampering(self):
+        log = TamperEvidentLog(self.storage_dir, checkpoint_every=0)
+        for i in range(300):
+            log.append({"amount": i, "note": "n" * (i % 7)})
+        result = log.verify_all(batch_size=16, block_entries=50)
+        self.assertEqual(result, {"entries": 300, "tampered": [], "root": log.root(), "valid": True})
+        log.close()
+
+        path = os.path.join(self.storage_dir, "entries.bin")
+        with open(path, "rb") as f:
+            content = f.read()
+        with open(path, "wb") as f:
+            f.write(content.replace(encode("amount") + encode(123), encode("amount") + encode(124)))
+        result = TamperEvidentLog(self.storage_dir).verify_all(block_entries=64)
+        self.assertEqual(result["tampered"], [123])
+        self.assertFalse(result["valid"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import unittest
+from human_interface.chat_history import ChatHistory
+from human_interface.chat_interface import ChatInterface
+from core.rate_limiter import estimate_text_tokens
+
+
+class EchoAgent:
+    def __init__(self):
+        self.context_tokens = []
+
+    def generate_response(self, prompt, context):
+        size = sum(estimate_text_tokens(" ".join(str(v) for v in item.values())) for item in context)
+        self.context_tokens.append(size)
+        return f"answer to {prompt} " + "detail " * 40
+
+
+class OpenOracle:
+    def query(self, question, evidence, high_impact=False):
+        return {"approved": True}
+
+
+class ChatHistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_context_stays_within_budget(self):
+        agent = EchoAgent()
+        chat = ChatInterface(agent, OpenOracle(), max_context_tokens=600, summary_tokens=150)
+        for i in range(200):
+            chat.chat(f"question {i} " + "words " * 20)
+            self.assertLessEqual(chat.history.context_tokens(), 600)
+        # turn 200 sees about as much context as the window allows, not 199 turns
+        self.assertLessEqual(max(agent.context_tokens), 700)
+        self.assertEqual(agent.context_tokens[150], agent.context_tokens[199])
+        self.assertIn("summary", chat.chat_history[0])
+        self.assertIn("question 199", chat.chat_history[-1]["user"])
+
+    def test_digest_keeps_latest_folded_turns(self):
+        history = ChatHistory(max_context_tokens=100, summary_tokens=40, summarize_every=2)
+        for i in range(30):
+            history.append(f"q{i} " * 10, f"a{i} " * 10)
+        self.assertLessEqual(estimate_text_tokens(history.digest), 40)
+        self.assertNotIn("q0 ", history.digest)
+        self.assertTrue(history.digest)
+
+    def test_custom_summarizer_runs_periodically(self):
+        calls = []
+
+        def summarizer(digest, turns):
+            calls.append(len(turns))
+            return f"{len(calls)} summaries"
+
+        history = ChatHistory(max_context_tokens=60, summary_tokens=10, summarize_every=4, summarizer=summarizer)
+        for i in range(20):
+            history.append("x" * 40, "y" * 40)  # 20 tokens per turn, two fit the window
+        self.assertTrue(all(n >= 4 for n in calls))
+        self.assertEqual(history.context()[0], {"summary": f"{len(calls)} summaries"})
+
+    def test_oversized_turn_is_truncated(self):
+        history = ChatHistory(max_context_tokens=100, summary_tokens=20)
+        history.append("u" * 4000, "a" * 4000)
+        self.assertLessEqual(history.context_tokens(), 100)
+
+    def test_full_history_spills_to_disk(self):
+        path = os.path.join(self.tmp, "chat", "session.jsonl")
+        history = ChatHistory(max_context_tokens=50, summary_tokens=10, spill_path=path)
+        for i in range(25):
+            history.append(f"q{i}", f"a{i}")
+        full = list(history.full_history())
+        self.assertEqual(len(full), 25)
+        self.assertEqual(full[0], {"user": "q0", "ai": "a0"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+from core.constitution import Constitution
+
+
+class ConstitutionBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.constitution = Constitution()
+        rng = np.random.default_rng(0)
+        self.changes = rng.uniform(0.0, 0.2, size=(50, 100))
+        self.changes[0] = 0.0  # nothing material
+        self.changes[1, :10] = 0.5  # exactly the quorum once other values are cleared
+        self.changes[1, 10:] = 0.0
+
+    def test_materiality_mask_matches_scalar_check(self):
+        mask = self.constitution.check_materiality_batch(self.changes)
+        expected = [self.constitution.check_materiality({"belief_changes": list(row)}) for row in self.changes]
+        self.assertEqual(mask.tolist(), expected)
+        self.assertFalse(mask[0])
+        self.assertTrue(mask[1])
+
+    def test_threshold_change_reapplies_cheaply(self):
+        self.constitution.materiality_threshold = 0.3
+        self.assertEqual(self.constitution.check_materiality_batch(self.changes).sum(), 1)
+
+    def test_nan_padding_is_not_material(self):
+        ragged = np.full((1, 100), np.nan)
+        ragged[0, :9] = 1.0
+        self.assertFalse(self.constitution.check_materiality_batch(ragged)[0])
+
+    def test_high_impact_mask(self):
+        mask = self.constitution.is_high_impact_batch([10, 2_000_000, 5], irreversible=[False, False, True])
+        self.assertEqual(mask.tolist(), [False, True, True])
+
+    def test_top_k_matches_full_sort(self):
+        stream = [{"id": i, "irreversibility": (i * 7 % 10) / 10, "scope": (i * 3 % 5) / 5} for i in range(40)]
+        expected = [e["id"] for e in self.constitution.triage_evidence([dict(e) for e in stream])]
+        ranked = [e["id"] for e in self.constitution.triage_evidence_batch(stream)]
+        self.assertEqual(ranked, expected)
+        self.assertEqual([e["id"] for e in self.constitution.triage_evidence_batch(stream, k=5)], expected[:5])
+
+
+if __name__ == "__main__":
+    unittest.main()
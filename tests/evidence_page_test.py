@@ -0,0 +1,45 @@
+import time
+import unittest
+from core.truth_engine import TruthEngine
+
+
+class EvidencePageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = TruthEngine()
+        for i in range(100):
+            self.engine.add_evidence(f"e{i:03d}", {
+                "description": "flood warning" if i % 10 == 0 else "routine report",
+                "affected_agents": i * 1000,
+                "source": "user" if i % 2 else "feed"
+            })
+
+    def test_unfiltered_pages_newest_first(self):
+        total, page = self.engine.find_evidence(offset=0, limit=3)
+        self.assertEqual(total, 100)
+        self.assertEqual([eid for eid, _ in page], ["e099", "e098", "e097"])
+        _, last = self.engine.find_evidence(offset=98, limit=10, newest_first=False)
+        self.assertEqual([eid for eid, _ in last], ["e098", "e099"])
+
+    def test_filters_combine_and_count_all_matches(self):
+        total, page = self.engine.find_evidence(text="FLOOD", min_affected_agents=30_000, source="feed",
+                                                offset=1, limit=2)
+        self.assertEqual(total, 7)  # e030, e040, ..., e090
+        self.assertEqual([eid for eid, _ in page], ["e080", "e070"])
+
+    def test_text_matches_id(self):
+        total, page = self.engine.find_evidence(text="e04")
+        self.assertEqual(total, 10)
+
+    def test_page_of_100k_store_is_fast(self):
+        store = self.engine.material_evidence_store
+        for i in range(100_000):
+            store[f"bulk{i}"] = {"description": f"item {i}", "affected_agents": i}
+        start = time.perf_counter()
+        self.engine.find_evidence(offset=0, limit=50)
+        self.engine.find_evidence(text="item 99", min_affected_agents=10, offset=0, limit=50)
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+from agents.claude_agent import ClaudeAgent
+from benchmarks.evidence_memory import evidence_lines, measure_store
+from core.evidence import Evidence, TextStore
+from core.ingest import default_disseminate
+from core.triage import priority_score
+from core.truth_engine import TruthEngine
+
+
+class EvidenceRecordTest(unittest.TestCase):
+
+    def test_dict_shapes_round_trip(self):
+        shapes = [
+            {"id": "a", "content": "x", "affected_agents": 5},
+            {"id": "b", "description": "d", "affected_agents": 0, "source": "user"},
+            {"id": "c", "irreversibility": 0.9, "scope": 0.2, "metadata": {"source": "feed"}, "custom": [1]},
+        ]
+        for shape in shapes:
+            record = Evidence.from_dict(shape)
+            self.assertEqual(record, shape)
+            self.assertEqual(record.to_dict(), shape)
+
+    def test_aggregator_keys_map_to_fields(self):
+        record = Evidence.from_dict({"prompt": "p", "aggregated_response": "r", "branch_outputs": []}, "p")
+        self.assertEqual((record.id, record.description, record.content), ("p", "p", "r"))
+
+    def test_dict_style_access_used_across_the_pipeline(self):
+        engine = TruthEngine()
+        record = engine.add_evidence("e1", {"affected_agents": 2_000_000, "irreversibility": 1.0, "scope": 0.5})
+        self.assertIs(engine.material_evidence_store["e1"], record)
+        self.assertEqual(record["id"], "e1")
+        self.assertEqual(record.get("source", "unknown"), "unknown")
+        self.assertNotIn("source", record)
+        self.assertEqual(priority_score(record), 0.5)
+        self.assertEqual(default_disseminate(engine, "e1", record)["status"], "approval_required")
+        with self.assertRaises(KeyError):
+            record["missing"]
+
+    def test_identical_metadata_is_shared_and_read_only(self):
+        a = Evidence.from_dict({"id": "a", "metadata": {"source": "feed", "lang": "en"}})
+        b = Evidence.from_dict({"id": "b", "metadata": {"source": "feed", "lang": "en"}})
+        self.assertIs(a.metadata, b.metadata)
+        with self.assertRaises(TypeError):
+            a["metadata"]["lang"] = "fr"
+
+    def test_agents_produce_records(self):
+        evidence = ClaudeAgent().generate_evidence("claim")
+        self.assertIsInstance(evidence, Evidence)
+        self.assertEqual(evidence["source"], "claude")
+
+    def test_large_content_is_offloaded(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, True)
+        store = TextStore(os.path.join(tmp, "text.bin"), threshold=100)
+        self.addCleanup(store.close)
+        engine = TruthEngine(text_store=store)
+        long_text = "évidence " * 100
+        record = engine.add_evidence("big", {"content": long_text})
+        small = engine.add_evidence("small", {"content": "short"})
+        self.assertNotIsInstance(record.content, str)
+        self.assertEqual(record["content"], long_text)
+        self.assertEqual(small.content, "short")
+
+    def test_records_use_a_fraction_of_dict_memory(self):
+        lines = evidence_lines(20_000)
+        self.assertLess(measure_store(lines, as_records=True), 0.5 * measure_store(lines, as_records=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from benchmarks.import_time import measure
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ImportTimeTest(unittest.TestCase):
+
+    def test_entry_points_skip_heavy_dependencies(self):
+        for module in ("core.truth_engine", "core.ingest", "agents.aggregator", "core.oracle"):
+            self.assertEqual(measure(module, repeats=1)["heavy_imports"], [], module)
+
+    def test_import_has_no_side_effects(self):
+        with tempfile.TemporaryDirectory() as cwd:
+            env = dict(os.environ, PYTHONPATH=ROOT)
+            subprocess.run([sys.executable, "-c", "import core.data_manager, core.truth_engine, main"],
+                           cwd=cwd, env=env, check=True)
+            self.assertEqual(os.listdir(cwd), [])
+
+    def test_heavy_modules_still_load_on_use(self):
+        probe = ("import sys; from core.verification import MultiAgentVerification; "
+                 "MultiAgentVerification(seed=0); print('numpy' in sys.modules)")
+        out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "True")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import io
+import json
+import unittest
+from core.evidence import Evidence
+from core.ingest import IngestPipeline, iter_jsonl
+from core.triage import Triage
+from core.truth_engine import TruthEngine
+
+
+class IngestTest(unittest.TestCase):
+
+    def make_stream(self, n):
+        lines = [json.dumps({"id": f"ev{i}", "affected_agents": 2_000_000 if i % 4 == 0 else 10,
+                             "irreversibility": (i % 10) / 10, "scope": 0.5}) for i in range(n)]
+        lines.insert(3, "{not json")
+        return io.StringIO("\n".join(lines) + "\n")
+
+    def test_pipeline_processes_every_item(self):
+        engine = TruthEngine()
+        results = []
+        errors = {}
+        pipeline = IngestPipeline(engine, Triage(max_concurrent=8), queue_size=4, triage_backlog=16,
+                                  on_result=results.append)
+        stats = pipeline.run(iter_jsonl(self.make_stream(500), errors))
+        self.assertEqual(stats["stored"], 500)
+        self.assertEqual(stats["disseminated"], 500)
+        self.assertEqual(errors["parse_errors"], 1)
+        self.assertEqual(stats["statuses"], {"approval_required": 125, "disseminated": 375})
+        self.assertEqual(len(engine.material_evidence_store), 500)
+        self.assertEqual(len({r["evidence_id"] for r in results}), 500)
+
+    def test_stored_records_are_disseminated(self):
+        engine = TruthEngine()
+        seen = []
+
+        def disseminate(evidence_id, evidence):
+            seen.append((evidence_id, evidence))
+            return {"status": "disseminated", "evidence_id": evidence_id}
+
+        raw = [{"text": "aliased content", "irreversibility": 0.9}, {"id": "given", "prompt": "q"}]
+        IngestPipeline(engine, disseminate=disseminate).run(raw)
+        self.assertEqual(sorted(eid for eid, _ in seen), ["evidence_000001", "given"])
+        for evidence_id, evidence in seen:
+            self.assertIsInstance(evidence, Evidence)
+            self.assertIs(evidence, engine.material_evidence_store[evidence_id])
+        self.assertNotIn("id", raw[0], "The caller's dict is left untouched")
+
+    def test_stage_failure_is_raised(self):
+        def broken(evidence_id, evidence):
+            raise RuntimeError("sink down")
+        pipeline = IngestPipeline(TruthEngine(), disseminate=broken, queue_size=2)
+        with self.assertRaises(RuntimeError):
+            pipeline.run(iter_jsonl(self.make_stream(1000)))
+
+
+if __name__ == "__main__":
+    unittest.main()
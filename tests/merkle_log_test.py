@@ -0,0 +1,86 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+from core.merkle import TamperEvidentLog, node_hash, verify_consistency, verify_inclusion
+
+
+def reference_root(leaves):
+    """Straight recursive MTH from RFC 6962."""
+    if not leaves:
+        return hashlib.sha256(b"").digest()
+    if len(leaves) == 1:
+        return leaves[0]
+    k = 1 << ((len(leaves) - 1).bit_length() - 1)
+    return node_hash(reference_root(leaves[:k]), reference_root(leaves[k:]))
+
+
+class MerkleLogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.storage_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.storage_dir, ignore_errors=True)
+
+    def test_root_matches_reference_tree(self):
+        log = TamperEvidentLog()
+        leaves = []
+        for i in range(37):
+            log.append({"i": i})
+            leaves.append(bytes.fromhex(log.get_entry(i)["hash"]))
+            self.assertEqual(log.root(), reference_root(leaves).hex())
+
+    def test_inclusion_and_consistency_proofs(self):
+        log = TamperEvidentLog()
+        for i in range(21):
+            log.append({"i": i})
+        for index in range(21):
+            leaf = log.get_entry(index)["hash"]
+            self.assertTrue(verify_inclusion(leaf, index, 21, log.inclusion_proof(index), log.root()))
+            self.assertTrue(log.verify_entry(index))
+        for old_size in range(22):
+            proof = log.consistency_proof(old_size)
+            self.assertTrue(verify_consistency(old_size, 21, log.root_at(old_size), log.root(), proof))
+        self.assertFalse(verify_inclusion(log.get_entry(3)["hash"], 4, 21, log.inclusion_proof(4), log.root()))
+
+    def test_reopen_from_disk_and_checkpoints(self):
+        log = TamperEvidentLog(self.storage_dir, checkpoint_every=5, signing_key=b"secret")
+        for i in range(13):
+            log.append({"i": i})
+        root = log.root()
+        log.close()
+
+        reopened = TamperEvidentLog(self.storage_dir, signing_key=b"secret")
+        self.assertEqual(len(reopened), 13)
+        self.assertEqual(reopened.root(), root)
+        self.assertEqual(reopened.get_entry(7)["data"], {"i": 7})
+        checkpoint = reopened.latest_checkpoint()
+        self.assertEqual(checkpoint["tree_size"], 13)
+
+        reopened.append({"i": 13})
+        self.assertTrue(reopened.verify_checkpoint(checkpoint), "New tree should extend the checkpoint")
+        forged = dict(checkpoint, root="00" * 32)
+        self.assertFalse(reopened.verify_checkpoint(forged))
+        reopened.close()
+
+        with open(os.path.join(self.storage_dir, "checkpoints.bin"), "ab") as f:
+            f.write(b"\xff\x00\x00\x00torn")  # interrupted checkpoint write
+        self.assertEqual(TamperEvidentLog(self.storage_dir).latest_checkpoint()["tree_size"], 14)
+
+    def test_tampered_entry_fails_verification(self):
+        log = TamperEvidentLog(self.storage_dir, checkpoint_every=0)
+        for i in range(4):
+            log.append({"amount": i})
+        log.close()
+        path = f"{self.storage_dir}/entries.bin"
+        with open(path, "rb") as f:
+            content = f.read()
+        with open(path, "wb") as f:
+            f.write(content.replace(b"\x06amounti\x04", b"\x06amounti\x12"))  # amount 2 -> 9
+        self.assertFalse(TamperEvidentLog(self.storage_dir).verify_entry(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
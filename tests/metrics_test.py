@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from core import metrics
+from core.triage import Triage
+from core.truth_engine import TruthEngine
+
+
+class MetricsTest(unittest.TestCase):
+
+    def setUp(self):
+        metrics.REGISTRY.reset()
+        metrics.enable()
+
+    def tearDown(self):
+        metrics.disable()
+        metrics.REGISTRY.reset()
+
+    def stage_counts(self):
+        family = metrics.get_metrics().get(metrics.STAGE_SECONDS, {"series": []})
+        return {row["labels"]["stage"]: row["count"] for row in family["series"]}
+
+    def test_pipeline_stages_are_timed(self):
+        engine = TruthEngine()
+        triage = Triage(max_concurrent=2)
+        for i in range(3):
+            triage.add_to_queue({"id": f"e{i}"})
+        triage.process_batch(engine)
+        counts = self.stage_counts()
+        self.assertEqual(counts["triage_process_batch"], 1)
+        self.assertEqual(counts["truth_engine_add_evidence"], 2)
+
+    def test_disabled_records_nothing(self):
+        metrics.disable()
+        TruthEngine().add_evidence("e", {})
+        self.assertEqual(self.stage_counts(), {})
+
+    def test_prometheus_text(self):
+        metrics.observe_stage("oracle_query", 0.003)
+        metrics.observe_stage("oracle_query", 2.0)
+        text = metrics.export_prometheus()
+        self.assertIn("# TYPE truthai_stage_seconds histogram", text)
+        self.assertIn('truthai_stage_seconds_bucket{le="0.005",stage="oracle_query"} 1', text)
+        self.assertIn('truthai_stage_seconds_bucket{le="+Inf",stage="oracle_query"} 2', text)
+        self.assertIn('truthai_stage_seconds_count{stage="oracle_query"} 2', text)
+
+    def test_errors_are_counted(self):
+        @metrics.timed("flaky")
+        def flaky():
+            raise ValueError("boom")
+        with self.assertRaises(ValueError):
+            flaky()
+        self.assertEqual(metrics.get_metrics()[metrics.STAGE_ERRORS]["series"][0]["value"], 1)
+
+    def test_write_prometheus_file(self):
+        metrics.observe_stage("branch_query", 0.01, branch="skeptic")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = metrics.write_prometheus(os.path.join(tmp, "truthai.prom"))
+            with open(path, encoding="utf-8") as f:
+                self.assertIn('branch="skeptic"', f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,231 @@
+import json
+import threading
+import time
+import unittest
+from collections import deque
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import openai
+
+from agents.agent_manager import AgentManager
+from agents.aggregator import Branch
+from core.rate_limiter import (PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, PRIORITY_ORACLE,
+                               ModelCallScheduler)
+
+
+class StandInServer:
+    """
+    Local /v1/chat/completions endpoint that answers 429 once more than
+    `max_requests` arrive within `window` seconds or more than
+    `max_concurrent` are in flight.
+    """
+    def __init__(self, max_requests=1000, window=1.0, max_concurrent=1000, latency=0.02, fail_first=0):
+        self.max_requests = max_requests
+        self.window = window
+        self.max_concurrent = max_concurrent
+        self.latency = latency
+        self.fail_first = fail_first
+        self.lock = threading.Lock()
+        self.arrivals = deque()
+        self.in_flight = 0
+        self.served = 0
+        self.rejected = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                ok = server._enter()
+                try:
+                    if ok:
+                        time.sleep(server.latency)
+                        content = body["messages"][-1]["content"]
+                        self._reply(200, {"object": "chat.completion",
+                                          "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+                                          "usage": {"total_tokens": 10}})
+                    else:
+                        self._reply(429, {"error": {"message": "Rate limit reached", "type": "requests"}},
+                                    {"Retry-After": "0.05"})
+                finally:
+                    if ok:
+                        server._leave()
+
+            def _reply(self, status, payload, headers=None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.api_base = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def _enter(self):
+        now = time.monotonic()
+        with self.lock:
+            while self.arrivals and now - self.arrivals[0] > self.window:
+                self.arrivals.popleft()
+            if (self.fail_first > 0 or len(self.arrivals) >= self.max_requests
+                    or self.in_flight >= self.max_concurrent):
+                self.fail_first = max(0, self.fail_first - 1)
+                self.rejected += 1
+                return False
+            self.arrivals.append(now)
+            self.in_flight += 1
+            return True
+
+    def _leave(self):
+        with self.lock:
+            self.in_flight -= 1
+            self.served += 1
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def fire(branches, prompt="q"):
+    errors = []
+
+    def call(branch):
+        try:
+            branch.query(prompt)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call, args=(b,)) for b in branches]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return errors
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def make_branches(self, server, scheduler, n):
+        create = partial(openai.ChatCompletion.create, api_base=server.api_base, api_key="test-key")
+        return [Branch(f"b{i}", 1.0, f"branch {i}", completion_fn=create, scheduler=scheduler) for i in range(n)]
+
+    def test_burst_stays_under_server_limits(self):
+        server = StandInServer(max_requests=25, window=1.0, max_concurrent=4)
+        self.addCleanup(server.close)
+        # 10 req/s with a burst of 10 never puts more than 20 in a 1s window
+        scheduler = ModelCallScheduler(requests_per_minute=600, max_concurrent=4, max_retries=0)
+        errors = fire(self.make_branches(server, scheduler, 24))
+        self.assertEqual(errors, [])
+        self.assertEqual(server.rejected, 0)
+        self.assertEqual(server.served, 24)
+        self.assertEqual(scheduler.get_stats()["tokens_used"], 240)
+
+    def test_unscheduled_burst_is_rejected(self):
+        server = StandInServer(max_requests=25, window=1.0, max_concurrent=4)
+        self.addCleanup(server.close)
+        scheduler = ModelCallScheduler(max_concurrent=64, max_retries=0)
+        errors = fire(self.make_branches(server, scheduler, 24))
+        self.assertGreater(server.rejected, 0)
+        self.assertTrue(all(isinstance(e, openai.error.RateLimitError) for e in errors))
+
+    def test_rate_limited_call_is_retried(self):
+        server = StandInServer(fail_first=2)
+        self.addCleanup(server.close)
+        scheduler = ModelCallScheduler(max_concurrent=2, max_retries=3)
+        branch = self.make_branches(server, scheduler, 1)[0]
+        self.assertEqual(branch.query("hello"), "branch 0\nhello")
+        stats = scheduler.get_stats()
+        self.assertEqual(stats["rate_limited"], 2)
+        self.assertEqual(stats["completed"], 1)
+
+    def test_oracle_calls_are_admitted_first(self):
+        scheduler = ModelCallScheduler(max_concurrent=1)
+        release = threading.Event()
+        order = []
+        blocker = threading.Thread(target=scheduler.run, args=(release.wait,))
+        blocker.start()
+        while scheduler.get_stats()["running"] < 1:
+            time.sleep(0.001)
+
+        threads = []
+        for name, priority in [("background", PRIORITY_BACKGROUND), ("interactive", PRIORITY_INTERACTIVE),
+                               ("oracle", PRIORITY_ORACLE)]:
+            t = threading.Thread(target=scheduler.run, args=(order.append, name), kwargs={"priority": priority})
+            t.start()
+            threads.append(t)
+            while scheduler.get_stats()["queued"] < len(threads):
+                time.sleep(0.001)
+
+        release.set()
+        for t in [blocker] + threads:
+            t.join()
+        self.assertEqual(order, ["oracle", "interactive", "background"])
+
+    def test_slot_is_released_when_call_is_interrupted(self):
+        scheduler = ModelCallScheduler(max_concurrent=1)
+
+        def interrupted():
+            raise KeyboardInterrupt
+
+        for _ in range(3):
+            with self.assertRaises(KeyboardInterrupt):
+                scheduler.run(interrupted)
+        self.assertEqual(scheduler.get_stats()["running"], 0)
+        self.assertEqual(scheduler.run(lambda: "ok", timeout=0.5), "ok")
+
+    def test_admission_timeout(self):
+        scheduler = ModelCallScheduler(requests_per_minute=60, request_burst=1)
+        scheduler.run(lambda: None)
+        with self.assertRaises(TimeoutError):
+            scheduler.run(lambda: None, timeout=0.05)
+        self.assertEqual(scheduler.get_stats()["queued"], 0)
+
+    def test_branch_separates_admission_and_request_timeouts(self):
+        scheduler = ModelCallScheduler(max_concurrent=1)
+        seen = []
+
+        def create(**params):
+            seen.append(params["request_timeout"])
+            return {"choices": [{"message": {"content": "ok"}}]}
+
+        branch = Branch("b", 1.0, "", timeout=30, queue_timeout=0.05, completion_fn=create, scheduler=scheduler)
+        self.assertEqual(branch.query("q"), "ok")
+        self.assertEqual(seen, [30])
+
+        release = threading.Event()
+        blocker = threading.Thread(target=scheduler.run, args=(release.wait,))
+        blocker.start()
+        self.addCleanup(blocker.join)
+        self.addCleanup(release.set)
+        while scheduler.get_stats()["running"] < 1:
+            time.sleep(0.001)
+        start = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            branch.query("other")
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_agent_with_nested_model_calls_does_not_deadlock(self):
+        scheduler = ModelCallScheduler(max_concurrent=1)
+        create = lambda **params: {"choices": [{"message": {"content": params["messages"][0]["content"]}}]}
+
+        class BranchAgent:
+            def __init__(self, name):
+                self.branch = Branch(name, 1.0, name, completion_fn=create, scheduler=scheduler)
+
+            def evaluate(self, prompt):
+                return {"answer": self.branch.query(prompt), "confidence": 1.0, "rationale": "", "metadata": {}}
+
+        manager = AgentManager(BranchAgent("a"), BranchAgent("b"), BranchAgent("c"))
+        results = manager.evaluate_all("q", timeout=5)
+        self.assertEqual([r["answer"] for r in results], ["a\nq", "b\nq", "c\nq"])
+        self.assertEqual(scheduler.get_stats()["completed"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
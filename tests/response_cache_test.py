@@ -0,0 +1,68 @@
+import shutil
+import tempfile
+import time
+import unittest
+from agents.aggregator import Branch
+from core.response_cache import ResponseCache
+
+
+class CountingCompletion:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, model=None, messages=None, **params):
+        self.calls += 1
+        return {"choices": [{"message": {"content": f"reply #{self.calls}"}}]}
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.disk_dir = tempfile.mkdtemp()
+        self.params = {"model": "gpt-4", "messages": [{"role": "system", "content": "x"}], "temperature": 0.0}
+
+    def tearDown(self):
+        shutil.rmtree(self.disk_dir, ignore_errors=True)
+
+    def test_branch_reuses_cached_response(self):
+        completion = CountingCompletion()
+        cache = ResponseCache(disk_dir=self.disk_dir)
+        branch = Branch("a", 1.0, "analyse", completion_fn=completion, cache=cache)
+        first = branch.query("claim")
+        second = branch.query("claim")
+        self.assertEqual(first, second)
+        self.assertEqual(completion.calls, 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_disk_tier_survives_new_instance(self):
+        ResponseCache(disk_dir=self.disk_dir).get_or_compute(self.params, lambda: "stored")
+        fresh = ResponseCache(disk_dir=self.disk_dir)
+        self.assertEqual(fresh.get_or_compute(self.params, lambda: "recomputed"), "stored")
+        self.assertEqual(fresh.stats()["disk_hits"], 1)
+
+    def test_lru_eviction_and_ttl(self):
+        cache = ResponseCache(max_entries=1, ttl=0.01, disk_dir=None)
+        cache.put("k1", "v1")
+        cache.put("k2", "v2")
+        self.assertEqual(cache.stats()["evictions"], 1)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("k2"), "Entries older than the TTL should miss")
+
+    def test_invalidate_and_nondeterministic_bypass(self):
+        cache = ResponseCache(disk_dir=self.disk_dir)
+        cache.get_or_compute(self.params, lambda: "old")
+        self.assertTrue(cache.invalidate(self.params))
+        self.assertEqual(cache.get_or_compute(self.params, lambda: "new"), "new")
+
+        sampled = dict(self.params, temperature=0.7)
+        cache.get_or_compute(sampled, lambda: "a")
+        self.assertEqual(cache.get_or_compute(sampled, lambda: "b"), "b")
+
+    def test_timeout_is_not_part_of_key(self):
+        with_timeout = dict(self.params, request_timeout=5)
+        self.assertEqual(ResponseCache.make_key(self.params), ResponseCache.make_key(with_timeout))
+
+
+if __name__ == "__main__":
+    unittest.main()
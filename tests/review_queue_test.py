@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from core.truth_engine import TruthEngine
+from human_interface.review_queue import REVIEW_DB, ReviewQueue
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ReviewQueueTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp, "review.db")
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def make_queue(self, **kwargs):
+        queue = ReviewQueue(db_path=self.db_path, clock=self.clock, **kwargs)
+        self.addCleanup(queue.close)
+        return queue
+
+    def test_claims_by_priority_then_arrival(self):
+        queue = self.make_queue()
+        queue.add_many([("low", 0.1), ("high", 0.9), ("mid-a", 0.5), ("mid-b", 0.5)])
+        claimed = queue.claim("alice", limit=3, with_evidence=False)
+        self.assertEqual([c["evidence_id"] for c in claimed], ["high", "mid-a", "mid-b"])
+        self.assertEqual(queue.get_queue_state(), {"pending_count": 1, "leased_count": 3})
+
+    def test_evidence_is_resolved_from_truth_engine(self):
+        engine = TruthEngine()
+        engine.add_evidence("e1", {"id": "e1", "irreversibility": 1.0, "scope": 1.0})
+        queue = self.make_queue(truth_engine=engine)
+        self.assertEqual(queue.add_to_queue("missing")["status"], "error")
+        queue.add_to_queue("e1")
+        self.assertEqual(queue.queue[0]["irreversibility"], 1.0)
+        self.assertEqual(queue.get_next_for_review()["id"], "e1")
+        self.clock.now += 10_000  # past any lease: a legacy pop must not come back
+        self.assertIsNone(queue.get_next_for_review())
+        self.assertEqual(len(queue), 0)
+
+    def test_expired_lease_is_reclaimed_and_stale_ack_rejected(self):
+        queue = self.make_queue(lease_seconds=30)
+        queue.add_many([("e1", 1.0)])
+        first = queue.claim("alice")[0]
+        self.assertEqual(queue.claim("bob"), [])
+        self.clock.now += 31
+        second = queue.claim("bob")[0]
+        self.assertEqual(second["attempts"], 2)
+        self.assertFalse(queue.ack("e1", first["lease_token"]))
+        self.assertTrue(queue.ack("e1", second["lease_token"]))
+        self.assertEqual(len(queue), 0)
+
+    def test_nack_returns_item_with_new_priority(self):
+        queue = self.make_queue()
+        queue.add_many([("e1", 0.9), ("e2", 0.5)])
+        item = queue.claim("alice", limit=1)[0]
+        self.assertTrue(queue.nack(item["evidence_id"], item["lease_token"], priority=0.1))
+        self.assertEqual([c["evidence_id"] for c in queue.claim("bob", limit=2)], ["e2", "e1"])
+
+    def test_survives_restart(self):
+        queue = ReviewQueue(db_path=self.db_path, clock=self.clock)
+        queue.add_many([("e1", 0.3), ("e2", 0.7)])
+        queue.claim("alice", limit=1, lease_seconds=60)
+        queue.close()
+        reopened = self.make_queue()
+        self.assertEqual(reopened.queued_ids(), ["e2", "e1"])
+        self.assertEqual(reopened.queue, [{"id": "e2"}, {"id": "e1"}])
+        self.assertEqual(reopened.get_queue_state()["leased_count"], 1)
+
+    def test_on_disk_by_default(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmp)
+        self.addCleanup(os.chdir, cwd)
+        queue = ReviewQueue()
+        queue.add_many([("e1", 1.0)])
+        queue.close()
+        self.assertTrue(os.path.exists(REVIEW_DB))
+        reopened = ReviewQueue()
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.queued_ids(), ["e1"])
+
+    def test_in_memory_queue(self):
+        queue = ReviewQueue(db_path=":memory:")
+        self.addCleanup(queue.close)
+        queue.add_many([("e1", 1.0)])
+        other = ReviewQueue(db_path=":memory:")
+        self.addCleanup(other.close)
+        self.assertEqual(len(other), 0)
+
+    def test_concurrent_reviewers_never_double_claim(self):
+        producer = self.make_queue()
+        producer.add_many((f"e{i}", i % 7) for i in range(2000))
+        claimed = []
+        lock = threading.Lock()
+
+        def reviewer(name):
+            queue = ReviewQueue(db_path=self.db_path)  # own connection, as a separate process would have
+            try:
+                while True:
+                    batch = queue.claim(name, limit=25, with_evidence=False)
+                    if not batch:
+                        return
+                    for item in batch:
+                        queue.ack(item["evidence_id"], item["lease_token"])
+                    with lock:
+                        claimed.extend(item["evidence_id"] for item in batch)
+            finally:
+                queue.close()
+
+        threads = [threading.Thread(target=reviewer, args=(f"r{i}",)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(claimed), 2000)
+        self.assertEqual(len(set(claimed)), 2000)
+        self.assertEqual(len(producer), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
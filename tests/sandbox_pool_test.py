@@ -0,0 +1,115 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from core.sandbox import Sandbox
+
+
+def add(a, b):
+    return a + b
+
+
+def worker_pid():
+    return os.getpid()
+
+
+def spin_forever():
+    while True:
+        pass
+
+
+def fail():
+    raise ValueError("bad input")
+
+
+class SandboxPoolTest(unittest.TestCase):
+
+    def test_thread_pool_reuses_workers(self):
+        sandbox = Sandbox(max_runtime_sec=1, max_workers=2)
+        self.assertEqual([sandbox.run(add, i, 1) for i in range(10)], list(range(1, 11)))
+        metrics = sandbox.get_metrics()
+        self.assertEqual(metrics["completed"], 10)
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertIsNotNone(metrics["latency_p99"])
+        sandbox.shutdown()
+
+    def test_thread_timeout_is_reported_honestly(self):
+        sandbox = Sandbox(max_runtime_sec=0.05, max_workers=1)
+        with self.assertRaises(TimeoutError):
+            sandbox.run(time.sleep, 0.3)
+        metrics = sandbox.get_metrics()
+        self.assertEqual(metrics["timeouts"], 1)
+        self.assertEqual(metrics["abandoned_threads"], 1)
+        sandbox.shutdown()
+
+    def test_abandoned_threads_do_not_starve_the_pool(self):
+        sandbox = Sandbox(max_runtime_sec=0.2, max_workers=2)
+        for _ in range(2):
+            with self.assertRaises(TimeoutError):
+                sandbox.run(time.sleep, 2)
+        self.assertEqual(sandbox.run(lambda: 1), 1)
+        self.assertEqual(sandbox.get_metrics()["abandoned_threads"], 2)
+        sandbox.shutdown()
+        self.assertEqual(sandbox.run(add, 1, 1), 2, "Sandbox should be usable again after shutdown")
+        sandbox.shutdown()
+
+    def test_deadline_starts_when_the_call_starts(self):
+        sandbox = Sandbox(max_runtime_sec=0.3, max_workers=1)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(sandbox.run(time.sleep, 0.2))) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(results), 3, "Queued calls should not time out while waiting for the worker")
+        self.assertEqual(sandbox.get_metrics()["timeouts"], 0)
+        sandbox.shutdown()
+
+    def test_process_timeout_kills_and_replaces_worker(self):
+        sandbox = Sandbox(max_runtime_sec=0.5, max_workers=1, use_processes=True)
+        first_pid = sandbox.run(worker_pid)
+        self.assertNotEqual(first_pid, os.getpid())
+        with self.assertRaises(TimeoutError):
+            sandbox.run(spin_forever)
+        second_pid = sandbox.run(worker_pid)
+        self.assertNotEqual(first_pid, second_pid, "Timed-out worker should have been replaced")
+        with self.assertRaises(ValueError):
+            sandbox.run(fail)
+        self.assertEqual(sandbox.run(add, 2, 3), 5)
+        metrics = sandbox.get_metrics()
+        self.assertEqual(metrics["workers_replaced"], 1)
+        self.assertEqual(metrics["failed"], 1)
+        sandbox.shutdown()
+
+    def test_shutdown_with_busy_workers_keeps_the_pool_bounded(self):
+        sandbox = Sandbox(max_runtime_sec=5, max_workers=1, use_processes=True)
+        started = threading.Event()
+        results = []
+
+        def busy():
+            started.set()
+            results.append(sandbox.run(time.sleep, 0.5))
+
+        thread = threading.Thread(target=busy)
+        thread.start()
+        started.wait()
+        time.sleep(0.2)  # the call is running in the only worker
+        sandbox.shutdown()
+        self.assertEqual(sandbox.run(add, 1, 2), 3)
+        thread.join()
+        self.assertEqual(results, [None])
+        self.assertEqual(sandbox._idle_workers.qsize(), 1, "The pre-shutdown worker must not be re-pooled")
+        sandbox.shutdown()
+
+    def test_child_exit_does_not_exit_the_caller(self):
+        for use_processes in (False, True):
+            sandbox = Sandbox(max_runtime_sec=5, max_workers=1, use_processes=use_processes)
+            with self.assertRaisesRegex(RuntimeError, "SystemExit"):
+                sandbox.run(sys.exit, 3)
+            self.assertEqual(sandbox.run(add, 2, 2), 4)
+            sandbox.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import pickle
+import random
+import unittest
+from core.evidence import Evidence
+from core.ingest import IngestPipeline
+from core.sharded_engine import ShardedTruthEngine, shard_for
+from core.triage import Triage
+from core.truth_engine import TruthEngine
+
+
+def evidence_items(n, seed=0):
+    rng = random.Random(seed)
+    items = []
+    for i in range(n):
+        ev = {"id": f"ev-{i}", "description": f"claim {i % 13}", "affected_agents": rng.randint(0, 2_000_000),
+              "source": f"src-{i % 4}", "metadata": {"lang": "en"}}
+        if i % 5 == 0:
+            ev["branch_outputs"] = [{"name": "b0", "weight": 1.0}, {"name": "b1", "weight": 0.5}]
+        items.append(ev)
+    return items
+
+
+class ShardedTruthEngineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = ShardedTruthEngine(shards=3, flush_every=16)
+        self.addCleanup(self.engine.close)
+        self.single = TruthEngine()
+        for item in evidence_items(150):
+            self.engine.add_evidence(item["id"], item)
+            self.single.add_evidence(item["id"], item)
+
+    def test_state_matches_a_single_engine(self):
+        state = self.engine.get_system_state()
+        expected = self.single.get_system_state()
+        self.assertEqual(state["material_evidence_count"], expected["material_evidence_count"])
+        self.assertAlmostEqual(state["truth_capacity"], expected["truth_capacity"])
+        self.assertEqual(state["truth_quality"], expected["truth_quality"])
+        self.assertEqual(len(state["shard_counts"]), 3)
+        self.assertTrue(all(state["shard_counts"]))
+
+        self.engine.add_evidence("ev-0", {"content": "replaced"})
+        self.assertEqual(len(self.engine.material_evidence_store), 150)
+
+    def test_lookups_route_to_the_owning_shard(self):
+        record = self.engine.material_evidence_store["ev-42"]
+        self.assertIsInstance(record, Evidence)
+        self.assertEqual(record, self.single.material_evidence_store["ev-42"])
+        self.assertIsNone(self.engine.material_evidence_store.get("missing"))
+        with self.assertRaises(KeyError):
+            self.engine.material_evidence_store["missing"]
+        self.assertEqual(sorted(self.engine.material_evidence_store), sorted(self.single.material_evidence_store))
+        self.assertEqual(shard_for("ev-42", 3), shard_for("ev-42", 3))
+
+    def test_find_evidence_merges_in_insertion_order(self):
+        queries = [{}, {"offset": 20, "limit": 15}, {"text": "claim 3", "newest_first": False},
+                   {"source": "src-1", "min_affected_agents": 500_000, "offset": 3, "limit": 5}]
+        for query in queries:
+            total, page = self.engine.find_evidence(**query)
+            expected_total, expected_page = self.single.find_evidence(**query)
+            self.assertEqual(total, expected_total, query)
+            self.assertEqual([eid for eid, _ in page], [eid for eid, _ in expected_page], query)
+
+    def test_ingest_pipeline_runs_on_shards(self):
+        with ShardedTruthEngine(shards=2) as engine:
+            stats = IngestPipeline(engine, Triage(max_concurrent=8)).run(
+                {k: v for k, v in item.items() if k != "id"} for item in evidence_items(40))
+            self.assertEqual(stats["stored"], 40)
+            self.assertEqual(engine.get_system_state()["material_evidence_count"], 40)
+            self.assertIn("approval_required", stats["statuses"])
+
+    def test_failed_add_is_reported(self):
+        self.engine.add_evidence("bad", {"branch_outputs": [{"name": "no weight"}]})
+        with self.assertRaises(RuntimeError):
+            self.engine.get_system_state()
+        self.assertEqual(self.engine.get_system_state()["material_evidence_count"], 151)
+
+    def test_failing_item_does_not_drop_the_rest_of_its_batch(self):
+        with ShardedTruthEngine(shards=1) as engine:
+            engine.add_evidence("a", {"content": "first"})
+            engine.add_evidence("bad", {"branch_outputs": [{"name": "b0", "weight": 0}]})
+            engine.add_evidence("worse", {"branch_outputs": [{"name": "no weight"}]})
+            for i in range(5):
+                engine.add_evidence(f"ev-{i}", {"content": f"after {i}"})
+            with self.assertRaisesRegex(RuntimeError, "2 add\\(s\\) failed, first: ZeroDivisionError"):
+                engine.get_system_state()
+            self.assertEqual(engine.get_system_state()["material_evidence_count"], 8)
+            self.assertEqual([eid for eid, _ in engine.find_evidence(limit=3)[1]], ["ev-4", "ev-3", "ev-2"])
+
+    def test_records_pickle_with_shared_metadata(self):
+        record = Evidence.from_dict({"id": "p", "metadata": {"lang": "en"}, "custom": 1})
+        restored = pickle.loads(pickle.dumps(record))
+        self.assertEqual(restored, record)
+        self.assertIs(restored.metadata, record.metadata)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import threading
+import time
+import unittest
+from agents.aggregator import Branch
+from core.oracle import OpenAIOracle
+from core.single_flight import SingleFlight
+
+
+class SlowCompletion:
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, model=None, messages=None, **params):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return {"choices": [{"message": {"content": messages[-1]["content"]}}]}
+
+
+def run_concurrently(fn, n):
+    results, errors = [], []
+    barrier = threading.Barrier(n)
+
+    def call():
+        barrier.wait()
+        try:
+            results.append(fn())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def test_identical_branch_queries_share_one_call(self):
+        completion = SlowCompletion()
+        flight = SingleFlight()
+        branch = Branch("a", 1.0, "analyse", completion_fn=completion, single_flight=flight)
+        results, errors = run_concurrently(lambda: branch.query("claim"), 8)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(completion.calls, 1)
+        self.assertEqual(flight.stats()["coalesced"], 7)
+        self.assertEqual(flight.stats()["in_flight"], 0)
+
+    def test_oracle_queries_for_same_evidence_coalesce(self):
+        completion = SlowCompletion()
+        flight = SingleFlight()
+        oracle = OpenAIOracle(completion_fn=completion, single_flight=flight)
+        evidence = {"id": "e1", "claim": "x"}
+        results, _ = run_concurrently(lambda: oracle.query("Approve?", evidence), 5)
+        self.assertEqual(completion.calls, 1)
+        self.assertEqual(len(results), 5)
+
+    def test_different_requests_are_not_merged(self):
+        completion = SlowCompletion(delay=0.02)
+        flight = SingleFlight()
+        branches = [Branch(str(i), 1.0, f"modifier {i}", completion_fn=completion, single_flight=flight)
+                    for i in range(3)]
+        for b in branches:
+            b.query("claim")
+        self.assertEqual(completion.calls, 3)
+        self.assertEqual(flight.stats()["coalesced"], 0)
+
+    def test_error_reaches_every_waiter_and_is_not_kept(self):
+        flight = SingleFlight()
+        calls = []
+
+        def failing():
+            calls.append(1)
+            time.sleep(0.05)
+            raise ValueError("upstream down")
+
+        _, errors = run_concurrently(lambda: flight.do("k", failing), 4)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(errors), 4)
+        self.assertTrue(all(isinstance(e, ValueError) for e in errors))
+        self.assertEqual(flight.do("k", lambda: "recovered"), "recovered")
+
+    def test_sampled_requests_always_run(self):
+        flight = SingleFlight()
+        params = {"model": "gpt-4", "messages": [], "temperature": 0.7}
+        counter = []
+        run_concurrently(lambda: flight.do_request(params, lambda: counter.append(1) or time.sleep(0.02)), 3)
+        self.assertEqual(len(counter), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from core.snapshot_store import SnapshotStore
+
+
+def verifier_state(n, version=0):
+    return {
+        "branches": {f"branch_{i}": {"weight": 1.0 + i / 100, "agreement": [0.9, 0.8, 0.95]} for i in range(n)},
+        "history": [{"step": i, "quality": 1.0} for i in range(n)],
+        "config": {"seed": 7, "version": version},
+    }
+
+
+def disk_usage(root):
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(os.path.join(root, "chunks"))
+               for f in files)
+
+
+class SnapshotStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.store = SnapshotStore(self.root, target_chunk_records=32)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_round_trip(self):
+        state = verifier_state(500)
+        self.store.save("s1", state)
+        self.assertEqual(self.store.load("s1").to_dict(), state)
+        self.assertEqual(self.store.list_snapshots(), ["s1"])
+
+    def test_values_keep_their_types(self):
+        state = {"by_id": {1: "int key", (2, "b"): {"nested": {3, 4}}}, "raw": [b"\x00\n", 2.5, None]}
+        self.store.save("typed", state)
+        self.assertEqual(self.store.load("typed").to_dict(), state)
+
+    def test_unencodable_values_fail_at_save(self):
+        with self.assertRaises(TypeError):
+            self.store.save("bad", {"config": {"clock": object()}})
+        self.assertFalse(self.store.exists("bad"))
+
+    def test_concurrent_saves_of_one_name(self):
+        errors = []
+
+        def save(version):
+            try:
+                for _ in range(20):
+                    self.store.save("shared", verifier_state(20, version))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=save, args=(v,)) for v in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertIn(self.store.load("shared")["config"]["version"], range(4))
+        manifest_dir = os.path.join(self.root, "manifests")
+        self.assertEqual(os.listdir(manifest_dir), ["shared.json"])
+
+    def test_unchanged_content_is_stored_once(self):
+        state = verifier_state(5000)
+        self.store.save("s1", state)
+        first = disk_usage(self.root)
+        state["branches"]["branch_2500"]["weight"] = 42.0
+        state["config"]["version"] = 1
+        self.store.save("s2", state)
+        grown = disk_usage(self.root) - first
+        self.assertLess(grown, first * 0.05)
+        self.assertEqual(self.store.load("s2")["branches"]["branch_2500"]["weight"], 42.0)
+        self.assertEqual(self.store.load("s1")["branches"]["branch_2500"]["weight"], 1.0 + 2500 / 100)
+
+    def test_insertion_only_touches_nearby_chunks(self):
+        state = verifier_state(5000)
+        self.store.save("s1", state)
+        written = self.store.stats["chunks_written"]
+        state["history"].insert(10, {"step": -1, "quality": 0.5})
+        self.store.save("s2", state)
+        self.assertLessEqual(self.store.stats["chunks_written"] - written, 3)
+
+    def test_delta_snapshot_shares_untouched_sections(self):
+        self.store.save("base", verifier_state(200))
+        self.store.save_delta("next", "base", {"config": {"seed": 7, "version": 2}}, removed=["history"])
+        snapshot = self.store.load("next")
+        self.assertEqual(sorted(snapshot), ["branches", "config"])
+        self.assertEqual(snapshot["config"]["version"], 2)
+        self.assertEqual(snapshot["branches"], verifier_state(200)["branches"])
+
+    def test_sections_load_lazily(self):
+        self.store.save("s1", verifier_state(100))
+        snapshot = self.store.load("s1")
+        self.assertEqual(snapshot.loaded_sections(), [])
+        snapshot["config"]
+        self.assertEqual(snapshot.loaded_sections(), ["config"])
+
+    def test_gc_drops_unreferenced_chunks(self):
+        self.store.save("s1", verifier_state(300))
+        self.store.save("s2", verifier_state(300, version=1))
+        self.store.delete("s1")
+        self.assertGreater(self.store.gc(), 0)
+        self.assertEqual(self.store.load("s2").to_dict(), verifier_state(300, version=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
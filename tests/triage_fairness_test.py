@@ -0,0 +1,85 @@
+import unittest
+from core.triage import Triage
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class NullEngine:
+    def add_evidence(self, evidence_id, evidence):
+        pass
+
+
+class TriageFairnessTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_flooding_source_cannot_starve_others(self):
+        triage = Triage(max_concurrent=4, clock=self.clock)
+        engine = NullEngine()
+        for step in range(200):
+            for i in range(50):
+                triage.add_to_queue({"id": f"flood-{step}-{i}", "source": "flood", "irreversibility": 1.0, "scope": 1.0})
+            triage.add_to_queue({"id": f"quiet-{step}", "source": "quiet", "irreversibility": 0.1, "scope": 0.1})
+            triage.process_batch(engine)
+            self.clock.now += 1.0
+
+        stats = triage.get_source_stats()
+        self.assertEqual(stats["quiet"]["processed"], 200)
+        self.assertLessEqual(stats["quiet"]["wait_p99"], 1.0)
+        self.assertGreater(stats["flood"]["queued"], 9000, "The flood backs up in its own queue")
+
+    def test_weights_split_batches(self):
+        triage = Triage(max_concurrent=4, source_weights={"a": 3.0, "b": 1.0}, clock=self.clock)
+        for i in range(20):
+            triage.add_to_queue({"id": f"a{i}", "source": "a"})
+            triage.add_to_queue({"id": f"b{i}", "source": "b"})
+        batch = triage.prioritize()
+        self.assertEqual(sorted(e["source"] for e in batch), ["a", "a", "a", "b"])
+        self.assertEqual(len(triage), 40, "prioritize() must leave the queue untouched")
+        self.assertEqual(triage.prioritize(), batch)
+
+    def test_non_positive_weights_are_rejected(self):
+        for weight in (0, -1.0, float("nan")):
+            with self.assertRaises(ValueError):
+                Triage(source_weights={"a": weight})
+        triage = Triage(max_concurrent=4, source_weights={"a": 3.0}, clock=self.clock)
+        with self.assertRaises(ValueError):
+            triage.set_source_weight("a", 0)
+        with self.assertRaises(ValueError):
+            triage.source_weights = {"b": -2}
+        with self.assertRaises(TypeError):
+            triage.source_weights["a"] = 0
+        self.assertEqual(dict(triage.source_weights), {"a": 3.0})
+
+        triage.set_source_weight("b", 3.0)
+        for i in range(20):
+            triage.add_to_queue({"id": f"a{i}", "source": "a"})
+            triage.add_to_queue({"id": f"b{i}", "source": "b"})
+        self.assertEqual(sorted(e["source"] for e in triage.prioritize()), ["a", "a", "b", "b"])
+
+    def test_token_bucket_admission(self):
+        triage = Triage(source_rate=2.0, source_burst=5, clock=self.clock)
+        admitted = [triage.add_to_queue({"source": "chatty"}) for _ in range(10)]
+        self.assertEqual(sum(1 for a in admitted if a), 5)
+        self.clock.now += 1.0
+        self.assertIsNotNone(triage.add_to_queue({"source": "chatty"}))
+        self.assertIsNotNone(triage.add_to_queue({"source": "other"}), "Buckets are per source")
+        self.assertEqual(triage.get_source_stats()["chatty"]["rejected"], 5)
+
+    def test_aging_lets_old_low_priority_evidence_through(self):
+        triage = Triage(max_concurrent=1, aging_rate=0.01, clock=self.clock)
+        triage.add_to_queue({"id": "old", "irreversibility": 0.1, "scope": 0.1})
+        self.clock.now += 100.0
+        triage.add_to_queue({"id": "new", "irreversibility": 0.9, "scope": 0.9})
+        self.assertEqual(triage.prioritize()[0]["id"], "old")
+
+
+if __name__ == "__main__":
+    unittest.main()
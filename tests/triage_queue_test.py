@@ -0,0 +1,53 @@
+import unittest
+from core.triage import EvidencePriorityQueue, Triage
+
+
+class RecordingEngine:
+    def __init__(self):
+        self.added = []
+
+    def add_evidence(self, evidence_id, evidence):
+        self.added.append(evidence_id)
+
+
+class TriageQueueTest(unittest.TestCase):
+
+    def test_priority_order_with_stable_ties(self):
+        pq = EvidencePriorityQueue()
+        pq.push("low", {}, 0.1)
+        pq.push("tie_a", {}, 0.5)
+        pq.push("high", {}, 0.9)
+        pq.push("tie_b", {}, 0.5)
+        self.assertEqual([i for i, _ in pq.pop_top_k(4)], ["high", "tie_a", "tie_b", "low"])
+
+    def test_update_and_cancel(self):
+        pq = EvidencePriorityQueue()
+        for i in range(100):
+            pq.push(f"e{i}", {"n": i}, i / 100)
+        self.assertTrue(pq.update_priority("e3", 5.0))
+        self.assertTrue(pq.update_priority("e3", 5.0), "Re-setting the same score must not break heap ordering")
+        self.assertTrue(pq.cancel("e99"))
+        self.assertFalse(pq.cancel("e99"))
+        self.assertEqual(len(pq), 99)
+        self.assertEqual([i for i, _ in pq.pop_top_k(2)], ["e3", "e98"])
+        self.assertEqual(len(pq), 97)
+
+    def test_process_batch_removes_only_processed(self):
+        triage = Triage(max_concurrent=2)
+        triage.add_to_queue({"id": "a", "irreversibility": 0.9, "scope": 0.9})
+        triage.add_to_queue({"id": "b", "irreversibility": 0.1, "scope": 0.1})
+        triage.add_to_queue({"id": "c", "irreversibility": 0.8, "scope": 0.8})
+        triage.add_to_queue({"content": "no id"})
+        self.assertEqual([e["id"] for e in triage.prioritize()], ["a", "c"])
+        self.assertEqual(len(triage), 4, "prioritize() must not consume the queue")
+
+        engine = RecordingEngine()
+        triage.process_batch(engine)
+        self.assertEqual(engine.added, ["a", "c"])
+        triage.process_batch(engine)
+        self.assertEqual(engine.added[2:], ["evidence_0", "b"])
+        self.assertEqual(triage.queue, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,7 +10,7 @@ class TriageTest(unittest.TestCase):
         self.verifier = MultiAgentVerification()
         self.oracle = OracleSandbox()
         self.engine = TruthEngine(verifier=self.verifier, oracle=self.oracle)
-        self.review_queue = ReviewQueue(truth_engine=self.engine)
+        self.review_queue = ReviewQueue(truth_engine=self.engine, db_path=":memory:")
 
     def test_queue_addition(self):
         evidence = {"id": "e3", "affected_agents": 2_000_000, "content": "disputed"}
@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+from core.verification import MultiAgentVerification
+
+
+class VerificationBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.evidence = [
+            {"id": "none"},
+            {"id": "one", "branch_outputs": [{"weight": 2.0}]},
+            {"id": "many", "branch_outputs": [{"weight": 1.0}, {"weight": 0.5}, {}]},
+        ]
+
+    def test_batch_matches_single_item_path(self):
+        single = MultiAgentVerification(seed=7)
+        expected = [single.evaluate_evidence(e, high_impact=True) for e in self.evidence]
+        batch = MultiAgentVerification(seed=7).evaluate_batch(self.evidence, high_impact=True)
+        np.testing.assert_allclose(batch["quality_delta"], [r["quality_delta"] for r in expected])
+        np.testing.assert_allclose(batch["capacity_delta"], [r["capacity_delta"] for r in expected])
+
+    def test_seed_makes_runs_reproducible(self):
+        first = MultiAgentVerification(seed=3).evaluate_batch(self.evidence)
+        second = MultiAgentVerification(seed=3).evaluate_batch(self.evidence)
+        np.testing.assert_array_equal(first["quality_delta"], second["quality_delta"])
+
+    def test_per_item_high_impact_flags(self):
+        result = MultiAgentVerification(seed=0).evaluate_batch(self.evidence, high_impact=[True, False, True])
+        np.testing.assert_array_equal(result["capacity_delta"], [0.0, 0.0, -0.01])
+
+    def test_zero_total_weight_raises_in_both(self):
+        zero = {"branch_outputs": [{"weight": 1.0}, {"weight": -1.0}]}
+        single, batch = MultiAgentVerification(seed=5), MultiAgentVerification(seed=5)
+        with self.assertRaises(ValueError):
+            single.evaluate_evidence(zero)
+        with self.assertRaisesRegex(ValueError, "item 1"):
+            batch.evaluate_batch([{"branch_outputs": [{"weight": 2.0}]}, zero])
+        # nothing was drawn, so both generators are still in step
+        item = {"branch_outputs": [{"weight": 1.0}]}
+        self.assertEqual(single.evaluate_evidence(item)["quality_delta"],
+                         batch.evaluate_batch([item])["quality_delta"][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,67 @@
+import threading
+
 import streamlit as st
 from core.truth_engine import TruthEngine
-from core.oracle import OracleSandbox
+from core.oracle import OpenAIOracle
+from core.evidence import Evidence
+from core.ingest import default_disseminate
 from agents.openai_agent import OpenAIAgent
 from human_interface.chat_interface import ChatInterface
-from agents.openai_agent import OpenAIAgent
-from core.oracle import OracleSandbox
 
-# Init
-agent = OpenAIAgent(api_key="YOUR_OPENAI_KEY")
-oracle = OracleSandbox()
-chat = ChatInterface(agent, oracle)
+PAGE_SIZES = (25, 50, 100, 250)
+
+
+# Long-lived components: built once per server process and shared by every
+# rerun and session, so the evidence store survives clicks
+@st.cache_resource
+def get_truth_engine() -> TruthEngine:
+    return TruthEngine()
+
+
+@st.cache_resource
+def get_engine_lock() -> threading.RLock:
+    # The cached engine is shared by every session's script thread; hold this
+    # around each use so listing never iterates the store while another adds
+    return threading.RLock()
+
+
+@st.cache_resource
+def get_oracle() -> OpenAIOracle:
+    return OpenAIOracle()
+
+
+@st.cache_resource
+def get_agent() -> OpenAIAgent:
+    return OpenAIAgent()  # reads its key from the environment
+
+
+@st.cache_resource
+def get_chat() -> ChatInterface:
+    return ChatInterface(get_agent(), get_oracle())
+
 
+# Only the system state panel refreshes on a timer; the rest of the page is untouched
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+
+def _render_system_state():
+    with get_engine_lock():
+        state = get_truth_engine().get_system_state()
+    cols = st.columns(3)
+    cols[0].metric("Truth capacity", f"{state['truth_capacity']:.2f}")
+    cols[1].metric("Truth quality", f"{state['truth_quality']:.2f}")
+    cols[2].metric("Material evidence", f"{state['material_evidence_count']:,}")
+
+
+render_system_state = _fragment(run_every=5)(_render_system_state) if _fragment else _render_system_state
+
+truth_engine = get_truth_engine()
+engine_lock = get_engine_lock()
+chat = get_chat()
+
+# ----------------------------
+# Chat
+# ----------------------------
 st.header("Chat with TRUTHAL")
 
 if "chat_log" not in st.session_state:
@@ -26,42 +77,78 @@ for u, a in st.session_state.chat_log:
     st.markdown(f"**You:** {u}")
     st.markdown(f"**TRUTHAL:** {a}")
 
-# Initialize components
-oracle = OracleSandbox()
-truth_engine = TruthEngine(oracle=oracle)
-agent = OpenAIAgent(api_key="YOUR_OPENAI_KEY")  # replace with your OpenAI key
-
 st.title("TRUTHAL AI Interface")
 
+# ----------------------------
 # Sidebar: add new evidence
+# ----------------------------
 st.sidebar.header("Add Evidence")
 evidence_id = st.sidebar.text_input("Evidence ID")
 description = st.sidebar.text_area("Description")
 affected_agents = st.sidebar.number_input("Affected Agents", min_value=0, value=0)
 
 if st.sidebar.button("Submit Evidence"):
-    evidence = {
-        "id": evidence_id,
-        "description": description,
-        "affected_agents": affected_agents,
-        "source": "user"
-    }
-    truth_engine.add_evidence(evidence_id, evidence)
+    evidence = Evidence(
+        id=evidence_id,
+        description=description,
+        affected_agents=int(affected_agents),
+        source="user"
+    )
+    with engine_lock:
+        truth_engine.add_evidence(evidence_id, evidence)
     st.sidebar.success(f"Evidence '{evidence_id}' added.")
 
-# Main panel: list stored evidence
+# ----------------------------
+# Main panel: filtered, paginated evidence
+# ----------------------------
 st.header("Material Evidence")
-for eid, ev in truth_engine.material_evidence_store.items():
-    st.write(f"ID: {eid}, Desc: {ev['description']}, Agents: {ev['affected_agents']}")
+filter_cols = st.columns([3, 2, 1])
+text_filter = filter_cols[0].text_input("Filter by ID or description")
+min_agents = filter_cols[1].number_input("Min. affected agents", min_value=0, value=0)
+page_size = filter_cols[2].selectbox("Per page", PAGE_SIZES, index=1)
+
+if "evidence_page" not in st.session_state:
+    st.session_state.evidence_page = 1
+filters = (text_filter, min_agents, page_size)
+if st.session_state.get("evidence_filters") != filters:
+    st.session_state.evidence_filters = filters
+    st.session_state.evidence_page = 1  # new filter: back to the first page
+
+
+def load_page(page_number: int):
+    # filtering and slicing happen server-side; only one page reaches the browser
+    with engine_lock:
+        return truth_engine.find_evidence(text=text_filter or None, min_affected_agents=min_agents,
+                                          offset=(page_number - 1) * page_size, limit=page_size)
+
+
+total, page = load_page(st.session_state.evidence_page)
+page_count = max(1, -(-total // page_size))
+if st.session_state.evidence_page > page_count:
+    st.session_state.evidence_page = page_count
+    total, page = load_page(page_count)
+st.number_input("Page", min_value=1, max_value=page_count, step=1, key="evidence_page")  # stable label keeps widget state
+
+st.caption(f"{total:,} matching items · page {st.session_state.evidence_page:,} of {page_count:,}")
+st.dataframe(
+    [{"ID": eid, "Description": ev.get("description", ""), "Agents": ev.get("affected_agents", 0),
+      "Source": ev.get("source", "")} for eid, ev in page],
+    use_container_width=True, hide_index=True
+)
 
-# Disseminate evidence
+# ----------------------------
+# Disseminate evidence (from the visible page)
+# ----------------------------
 st.header("Disseminate Evidence")
-eid_to_disseminate = st.selectbox("Select evidence to disseminate", list(truth_engine.material_evidence_store.keys()))
-if st.button("Disseminate"):
-    result = truth_engine.disseminate(eid_to_disseminate)
+eid_to_disseminate = st.selectbox("Select evidence to disseminate", [eid for eid, _ in page])
+if st.button("Disseminate") and eid_to_disseminate is not None:
+    with engine_lock:
+        evidence = truth_engine.material_evidence_store[eid_to_disseminate]
+        result = default_disseminate(truth_engine, eid_to_disseminate, evidence)
     st.success(f"Dissemination result: {result}")
 
-# Show system state
+# ----------------------------
+# System state
+# ----------------------------
 st.header("System State")
-state = truth_engine.get_system_state()
-st.json(state)
+render_system_state()